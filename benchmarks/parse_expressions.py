@@ -0,0 +1,54 @@
+"""
+Compile time of expression heavy code, mostly spent in the expression parser.
+
+	$ python benchmarks/parse_expressions.py [statements] [repeats]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from w import Compiler
+
+
+def generate(statements):
+	lines = [
+		'int main():',
+		'\tint a = 1',
+		'\tint b = 2',
+		'\tint c = 3',
+		'\tint[8] v',
+	]
+	for i in range(statements):
+		lines.append(f'\ta = (a + {i}) * b - c / 3 + v[{i % 8}] % 7')
+		lines.append(f'\tb = a < b + 4 == c * 2 + 1 - (b - a) * 3')
+		lines.append(f'\tv[{i % 8}] = a - b + c - {i} + a * b')
+	lines.append('\treturn a')
+	return '\n'.join(lines) + '\n'
+
+
+def main(argv):
+	statements = int(argv[1]) if len(argv) > 1 else 2000
+	repeats = int(argv[2]) if len(argv) > 2 else 5
+	source = tempfile.NamedTemporaryFile('w', suffix='.w', delete=False)
+	source.write(generate(statements))
+	source.close()
+	best = None
+	for i in range(repeats):
+		compiler = Compiler(source.name, runtime=False)
+		start = time.perf_counter()
+		with contextlib.redirect_stdout(io.StringIO()):
+			compiler.compile()
+		elapsed = time.perf_counter() - start
+		if best is None or elapsed < best:
+			best = elapsed
+	os.unlink(source.name)
+	lines = statements * 3
+	print(f'{lines} lines in {best * 1000:.1f} ms, {lines / best:.0f} lines/s (best of {repeats})')
+
+
+if __name__ == '__main__':
+	main(sys.argv)
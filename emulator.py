@@ -0,0 +1,1138 @@
+"""
+Emulator for the x86 and x86_64 instruction subset that w.py emits. It runs
+the asm output directly, without fasm or support for 32 bit executables.
+
+	$ python w.py tests/hello.w
+	$ python emulator.py tests/bin/hello.asm
+
+The program's output is passed through and its exit code returned. A report
+of executed instructions, memory traffic and stack usage is written to stderr.
+The numbers only depend on the generated code, so they can be compared
+between code generation changes on any machine.
+"""
+import bisect
+import re
+import sys
+from collections import Counter
+
+
+# Address of the first segment, the same as Compiler.code_position
+base_address = 0x00401000
+
+stack_size = 8 * 1024 * 1024
+stack_tops = {
+	4: 0xc0000000,
+	8: 0x7ffffffff000,
+}
+
+masks = {
+	1: 0xff,
+	2: 0xffff,
+	4: 0xffffffff,
+	8: 0xffffffffffffffff,
+	16: (1 << 128) - 1,
+}
+
+size_names = {
+	'byte': 1,
+	'word': 2,
+	'dword': 4,
+	'qword': 8,
+}
+
+data_sizes = {
+	'db': 1,
+	'dw': 2,
+	'dd': 4,
+	'dq': 8,
+}
+
+# name: (index, size)
+registers = {}
+for index, name in enumerate(['ax', 'cx', 'dx', 'bx', 'sp', 'bp', 'si', 'di']):
+	registers['r' + name] = (index, 8)
+	registers['e' + name] = (index, 4)
+	registers[name] = (index, 2)
+for index, name in enumerate(['al', 'cl', 'dl', 'bl', 'spl', 'bpl', 'sil', 'dil']):
+	registers[name] = (index, 1)
+for index in range(8, 16):
+	registers[f'r{index}'] = (index, 8)
+	registers[f'r{index}d'] = (index, 4)
+	registers[f'r{index}w'] = (index, 2)
+	registers[f'r{index}b'] = (index, 1)
+
+# SSE2 registers, 128 bits each
+vector_registers = {f'xmm{index}': index for index in range(16)}
+
+# Lane size in bytes by the suffix of packed integer instructions
+lane_sizes = {'b': 1, 'w': 2, 'd': 4, 'q': 8}
+
+# Linux syscalls by word size: number: name
+syscalls = {
+	4: {1: 'exit', 2: 'fork', 4: 'write', 45: 'brk', 252: 'exit'},
+	8: {60: 'exit', 57: 'fork', 1: 'write', 12: 'brk', 231: 'exit'},
+}
+
+ENOSYS = 38
+EBADF = 9
+
+# Exit codes of programs killed by a signal, as reported by the shell
+SIGFPE = 128 + 8
+SIGSEGV = 128 + 11
+
+
+class Fault(Exception):
+	"""The program was killed, e.g. by a segmentation fault."""
+	def __init__(self, message, exit_code=SIGSEGV):
+		super().__init__(message)
+		self.exit_code = exit_code
+
+
+class Exit(Exception):
+	def __init__(self, exit_code):
+		super().__init__(exit_code)
+		self.exit_code = exit_code
+
+
+class Memory:
+	"""The loaded image followed by the heap, and the stack."""
+	def __init__(self, image_base, stack_base, stack_size):
+		self.image_base = image_base
+		self.image = bytearray()
+		self.stack_base = stack_base
+		self.stack_size = stack_size
+		self.stack = bytearray(stack_size)
+
+	def region(self, address, size):
+		offset = address - self.stack_base
+		if 0 <= offset and offset + size <= self.stack_size:
+			return self.stack, offset
+		offset = address - self.image_base
+		if 0 <= offset and offset + size <= len(self.image):
+			return self.image, offset
+		raise Fault(f'Segmentation fault accessing {size} bytes at {address:#x}')
+
+	def read(self, address, size):
+		offset = address - self.stack_base
+		if 0 <= offset and offset + size <= self.stack_size:
+			return int.from_bytes(self.stack[offset:offset + size], 'little')
+		memory, offset = self.region(address, size)
+		return int.from_bytes(memory[offset:offset + size], 'little')
+
+	def write(self, address, size, value):
+		memory, offset = self.region(address, size)
+		memory[offset:offset + size] = (value & masks[size]).to_bytes(size, 'little')
+
+	def read_bytes(self, address, size):
+		memory, offset = self.region(address, size)
+		return bytes(memory[offset:offset + size])
+
+	def write_bytes(self, address, data):
+		offset = address - self.stack_base
+		if 0 <= offset and offset + len(data) <= self.stack_size:
+			self.stack[offset:offset + len(data)] = data
+			return
+		memory, offset = self.region(address, len(data))
+		memory[offset:offset + len(data)] = data
+
+
+class Result:
+	def __init__(self, exit_code, stdout, stderr, instructions, mnemonics, memory_reads, memory_writes, stack_high_water, string_iterations):
+		self.exit_code = exit_code
+		self.stdout = stdout
+		self.stderr = stderr
+		# Executed instructions, in total and by mnemonic
+		self.instructions = instructions
+		self.mnemonics = mnemonics
+		# Bytes read from and written to memory, including the stack
+		self.memory_reads = memory_reads
+		self.memory_writes = memory_writes
+		# Largest number of stack bytes in use
+		self.stack_high_water = stack_high_water
+		# Elements moved or stored by rep prefixed string instructions
+		self.string_iterations = string_iterations
+
+	def report(self, top=10):
+		lines = [
+			f'exit code         {self.exit_code}',
+			f'instructions      {self.instructions}',
+			f'memory reads      {self.memory_reads} bytes',
+			f'memory writes     {self.memory_writes} bytes',
+			f'stack high water  {self.stack_high_water} bytes',
+			f'string iterations {self.string_iterations}',
+		]
+		for mnemonic, count in self.mnemonics.most_common(top):
+			lines.append(f'  {mnemonic:8} {count:12} {100 * count / max(self.instructions, 1):6.2f}%')
+		return '\n'.join(lines)
+
+
+def split_operands(text):
+	"""Splits at commas outside of quotes and brackets."""
+	operands = []
+	current = []
+	quote = None
+	depth = 0
+	for c in text:
+		if quote:
+			if c == quote:
+				quote = None
+		elif c in '"\'':
+			quote = c
+		elif c == '[':
+			depth += 1
+		elif c == ']':
+			depth -= 1
+		elif c == ',' and depth == 0:
+			operands.append(''.join(current).strip())
+			current = []
+			continue
+		current.append(c)
+	if current or operands:
+		operands.append(''.join(current).strip())
+	return operands
+
+
+def parse_number(token):
+	if token.startswith('0x'):
+		return int(token, 16)
+	if token.endswith('h') and re.fullmatch(r'[0-9][0-9a-fA-F]*h', token):
+		return int(token[:-1], 16)
+	return int(token)
+
+
+class Emulator:
+	def __init__(self, source, word_size=None, stack_size=stack_size):
+		"""word_size is taken from the format line when not given."""
+		if word_size is None:
+			word_size = 8 if re.search(r'^format ELF64', source, re.MULTILINE) else 4
+		self.word_size = word_size
+		self.word_mask = masks[self.word_size]
+		self.stack_top = stack_tops[self.word_size] - 16
+		self.memory = Memory(base_address, stack_tops[self.word_size] - stack_size, stack_size)
+
+		# Register values, unsigned and word sized
+		self.registers = [0] * 16
+		self.registers[4] = self.stack_top
+		self.stack_low = self.stack_top
+		self.vectors = [0] * 16
+
+		# Last flag setting operation: kind, a, b, result, bits
+		self.flags = [('logic', 0, 0, 0, 32)]
+
+		# Instructions as closures that return the index of the next one
+		self.program = []
+		self.mnemonics = []
+		# Bytes read and written by one execution of each instruction
+		self.traffic = []
+		self.addresses = []
+		self.instruction_at = {}
+		self.labels = {}
+		self.entry = None
+
+		self.stdout = bytearray()
+		self.stderr = bytearray()
+		self.string_reads = 0
+		self.string_writes = 0
+		self.string_iterations = 0
+		self.counts = None
+
+		self.load(source)
+
+	# Loading
+
+	def load(self, source):
+		instructions, data = self.layout(source)
+		for address, directive, values, line_number in data:
+			self.data(address, directive, values, line_number)
+		for index, (address, mnemonic, operands, line_number) in enumerate(instructions):
+			self.compile(index, mnemonic, operands, line_number)
+		# Running past the last instruction is a fault, not a crash of the emulator
+		self.mnemonics.append('(end)')
+		self.traffic.append((0, 0))
+		self.program.append(self.fall_off)
+		self.counts = [0] * len(self.program)
+
+	def layout(self, source):
+		"""Assigns addresses, instructions take one byte."""
+		instructions = []
+		data = []
+		address = base_address
+		self.call_over = set()
+		previous_call = None
+		for line_number, line in enumerate(source.split('\n'), 1):
+			line = line.strip()
+			if not line or line.startswith(';'):
+				continue
+			words = line.split(None, 1)
+			keyword = words[0]
+			rest = words[1] if len(words) > 1 else ''
+			if keyword == 'format':
+				continue
+			if keyword == 'entry':
+				self.entry = rest.strip()
+				continue
+			if keyword == 'segment':
+				address = (address + 4095) // 4096 * 4096
+				continue
+			if keyword == 'align':
+				alignment = parse_number(rest)
+				address = (address + alignment - 1) // alignment * alignment
+				continue
+			if re.fullmatch(r'[A-Za-z_]\w*:', line):
+				self.labels[line[:-1]] = address
+				continue
+			match = re.fullmatch(r'(?:([A-Za-z_]\w*)\s+)?(db|dw|dd|dq|rb)\s+(.*)', line)
+			if match:
+				label, directive, values = match.groups()
+				if label:
+					self.labels[label] = address
+				if previous_call is not None:
+					# "call $ + n" jumps over inline data and pushes its address
+					self.call_over.add(previous_call)
+				previous_call = None
+				if directive == 'rb':
+					size = self.evaluate(values, line_number)
+				elif directive == 'db':
+					size = len(self.db_bytes(values, line_number))
+				else:
+					size = data_sizes[directive] * len(split_operands(values))
+				data.append((address, directive, values, line_number))
+				address += size
+				continue
+			previous_call = None
+			if keyword == 'call' and rest.startswith('$'):
+				previous_call = len(instructions)
+			instructions.append((address, keyword, rest, line_number))
+			address += 1
+		self.memory.image = bytearray(address - base_address)
+		# The heap starts on the page after the image
+		self.heap_start = (address + 4095) // 4096 * 4096
+		self.memory.image.extend(bytes(self.heap_start - address))
+		self.brk = self.heap_start
+		for index, instruction in enumerate(instructions):
+			self.instruction_at[instruction[0]] = index
+			self.addresses.append(instruction[0])
+		self.addresses.append(address)
+		self.instruction_at[address] = len(instructions)
+		return instructions, data
+
+	def evaluate(self, expression, line_number):
+		"""Value of a constant expression of numbers, labels, +, - and *."""
+		terms = []
+		for token in re.findall(r'[A-Za-z_]\w*|\d\w*|[-+*()]|\S', expression):
+			if token in '+-*()':
+				terms.append(token)
+			elif token[0].isdigit():
+				terms.append(str(parse_number(token)))
+			elif token in self.labels:
+				terms.append(str(self.labels[token]))
+			else:
+				raise Fault(f'line {line_number}: unknown symbol "{token}"')
+		return eval(''.join(terms), {'__builtins__': {}})
+
+	def db_bytes(self, values, line_number):
+		result = bytearray()
+		for value in split_operands(values):
+			if value[0] in '"\'':
+				result.extend(value[1:-1].encode('utf8'))
+			else:
+				result.append(self.evaluate(value, line_number) & 0xff)
+		return result
+
+	def data(self, address, directive, values, line_number):
+		if directive == 'rb':
+			return
+		if directive == 'db':
+			self.memory.write_bytes(address, self.db_bytes(values, line_number))
+			return
+		size = data_sizes[directive]
+		for value in split_operands(values):
+			self.memory.write(address, size, self.evaluate(value, line_number))
+			address += size
+
+	# Operands
+
+	def operand(self, text, line_number):
+		"""('reg', index, size), ('xmm', index, 16), ('mem', address function, size) or ('imm', value, size)."""
+		text = text.strip()
+		size = None
+		match = re.fullmatch(r'(byte|word|dword|qword)\s+(.*)', text)
+		if match:
+			size = size_names[match.group(1)]
+			text = match.group(2).strip()
+		if text in registers:
+			index, register_size = registers[text]
+			return ('reg', index, register_size)
+		if text in vector_registers:
+			return ('xmm', vector_registers[text], 16)
+		if text.startswith('['):
+			return ('mem', self.address_function(text[1:-1], line_number), size)
+		return ('imm', self.evaluate(text, line_number), size)
+
+	def address_function(self, expression, line_number):
+		base = None
+		index = None
+		scale = 1
+		displacement = 0
+		for sign, term in re.findall(r'([+-]?)\s*([^+-]+)', expression):
+			term = term.strip()
+			if '*' in term:
+				register, factor = [part.strip() for part in term.split('*')]
+				if register not in registers:
+					register, factor = factor, register
+				index = registers[register][0]
+				scale = parse_number(factor)
+			elif term in registers:
+				if base is None:
+					base = registers[term][0]
+				else:
+					index = registers[term][0]
+			else:
+				value = self.evaluate(term, line_number)
+				displacement += -value if sign == '-' else value
+		R = self.registers
+		mask = self.word_mask
+		if base is not None and index is not None:
+			return lambda: (R[base] + R[index] * scale + displacement) & mask
+		if base is not None:
+			return lambda: (R[base] + displacement) & mask
+		if index is not None:
+			return lambda: (R[index] * scale + displacement) & mask
+		return lambda: displacement
+
+	def getter(self, operand, size):
+		kind = operand[0]
+		if kind == 'imm':
+			value = operand[1] & masks[size]
+			return lambda: value
+		if kind == 'reg':
+			R = self.registers
+			index = operand[1]
+			mask = masks[operand[2]]
+			return lambda: R[index] & mask
+		if kind == 'xmm':
+			V = self.vectors
+			index = operand[1]
+			mask = masks[size]
+			return lambda: V[index] & mask
+		address = operand[1]
+		read = self.memory.read
+		stack = self.memory.stack
+		stack_base = self.memory.stack_base
+		end = self.memory.stack_size - size
+		from_bytes = int.from_bytes
+		def get():
+			# Most accesses are to the stack, the other regions take the slow path
+			offset = address() - stack_base
+			if 0 <= offset <= end:
+				return from_bytes(stack[offset:offset + size], 'little')
+			return read(offset + stack_base, size)
+		return get
+
+	def setter(self, operand, size):
+		kind = operand[0]
+		if kind == 'reg':
+			R = self.registers
+			index, register_size = operand[1], operand[2]
+			if register_size >= 4:
+				# Writing a 32 bit register clears the upper half
+				mask = masks[register_size]
+				def set_register(value):
+					R[index] = value & mask
+				return set_register
+			mask = masks[register_size]
+			keep = self.word_mask ^ mask
+			def set_part(value):
+				R[index] = (R[index] & keep) | (value & mask)
+			return set_part
+		if kind == 'xmm':
+			# movd and movq clear the rest of the register
+			V = self.vectors
+			index = operand[1]
+			mask = masks[size]
+			def set_vector(value):
+				V[index] = value & mask
+			return set_vector
+		if kind == 'mem':
+			address = operand[1]
+			write = self.memory.write
+			stack = self.memory.stack
+			stack_base = self.memory.stack_base
+			end = self.memory.stack_size - size
+			mask = masks[size]
+			def set_memory(value):
+				offset = address() - stack_base
+				if 0 <= offset <= end:
+					stack[offset:offset + size] = (value & mask).to_bytes(size, 'little')
+				else:
+					write(offset + stack_base, size, value)
+			return set_memory
+		raise Fault('Can not write to an immediate')
+
+	def operand_size(self, *operands):
+		for operand in operands:
+			if operand[0] != 'imm' and operand[2]:
+				return operand[2]
+		return self.word_size
+
+	def memory_bytes(self, operand, size):
+		return size if operand[0] == 'mem' else 0
+
+	def jump_target(self, text, line_number):
+		"""Instruction index of a label, or a function returning it for indirect jumps."""
+		operand = self.operand(text, line_number)
+		if operand[0] == 'imm':
+			# A label after the last instruction of a segment, e.g. an
+			# unreachable end_if label, resolves to the next instruction
+			return bisect.bisect_left(self.addresses, operand[1]), 0
+		size = self.word_size
+		get = self.getter(operand, size)
+		instruction_at = self.instruction_at
+		def target():
+			address = get()
+			if address not in instruction_at:
+				raise Fault(f'Segmentation fault jumping to {address:#x}')
+			return instruction_at[address]
+		return target, self.memory_bytes(operand, size)
+
+	# Flags
+
+	def flag_values(self):
+		kind, a, b, result, bits = self.flags[0]
+		zero = result == 0
+		sign = (result >> (bits - 1)) & 1
+		if kind == 'sub':
+			carry = a < b
+			overflow = ((a ^ b) & (a ^ result)) >> (bits - 1) & 1
+		elif kind == 'add':
+			carry = (a + b) >> bits != 0
+			overflow = (~(a ^ b) & (a ^ result)) >> (bits - 1) & 1
+		else:
+			carry = False
+			overflow = 0
+		return zero, sign, carry, overflow
+
+	def condition(self, name):
+		flag_values = self.flag_values
+		conditions = {
+			'e': lambda z, s, c, o: z,
+			'z': lambda z, s, c, o: z,
+			'ne': lambda z, s, c, o: not z,
+			'nz': lambda z, s, c, o: not z,
+			'l': lambda z, s, c, o: s != o,
+			'le': lambda z, s, c, o: z or s != o,
+			'g': lambda z, s, c, o: not z and s == o,
+			'ge': lambda z, s, c, o: s == o,
+			'b': lambda z, s, c, o: c,
+			'be': lambda z, s, c, o: c or z,
+			'a': lambda z, s, c, o: not c and not z,
+			'ae': lambda z, s, c, o: not c,
+			's': lambda z, s, c, o: s == 1,
+			'ns': lambda z, s, c, o: s == 0,
+		}
+		test = conditions[name]
+		return lambda: test(*flag_values())
+
+	# Instructions
+
+	def compile(self, index, mnemonic, text, line_number):
+		operands = split_operands(text)
+		method = getattr(self, 'op_' + mnemonic, None)
+		if method is None:
+			if mnemonic.startswith('set') and mnemonic[3:] in ['e', 'z', 'ne', 'nz', 'l', 'le', 'g', 'ge', 'b', 'be', 'a', 'ae', 's', 'ns']:
+				method = self.op_set
+			elif mnemonic.startswith('j') and mnemonic != 'jmp':
+				method = self.op_jump_if
+			else:
+				raise Fault(f'line {line_number}: unsupported instruction "{mnemonic} {text}"')
+		step, reads, writes = method(index, mnemonic, operands, line_number)
+		self.program.append(step)
+		self.mnemonics.append(mnemonic if mnemonic != 'rep' else 'rep ' + text)
+		self.traffic.append((reads, writes))
+
+	def op_mov(self, index, mnemonic, operands, line_number):
+		destination = self.operand(operands[0], line_number)
+		source = self.operand(operands[1], line_number)
+		size = self.operand_size(destination, source)
+		get = self.getter(source, size)
+		set_ = self.setter(destination, size)
+		following = index + 1
+		def step():
+			set_(get())
+			return following
+		return step, self.memory_bytes(source, size), self.memory_bytes(destination, size)
+
+	def op_movzx(self, index, mnemonic, operands, line_number):
+		destination = self.operand(operands[0], line_number)
+		source = self.operand(operands[1], line_number)
+		source_size = source[2]
+		size = destination[2]
+		get = self.getter(source, source_size)
+		set_ = self.setter(destination, size)
+		following = index + 1
+		if mnemonic == 'movzx':
+			def step():
+				set_(get())
+				return following
+		else:
+			sign = 1 << (source_size * 8 - 1)
+			def step():
+				value = get()
+				set_(value - (sign << 1) if value & sign else value)
+				return following
+		return step, self.memory_bytes(source, source_size), 0
+
+	op_movsx = op_movzx
+	op_movsxd = op_movzx
+
+	def op_lea(self, index, mnemonic, operands, line_number):
+		destination = self.operand(operands[0], line_number)
+		source = self.operand(operands[1], line_number)
+		address = source[1]
+		set_ = self.setter(destination, destination[2])
+		following = index + 1
+		def step():
+			set_(address())
+			return following
+		return step, 0, 0
+
+	def op_push(self, index, mnemonic, operands, line_number):
+		source = self.operand(operands[0], line_number)
+		size = self.word_size
+		get = self.getter(source, size)
+		R = self.registers
+		write = self.memory.write_bytes
+		mask = self.word_mask
+		following = index + 1
+		def step():
+			value = get()
+			sp = (R[4] - size) & mask
+			R[4] = sp
+			write(sp, value.to_bytes(size, 'little'))
+			if sp < self.stack_low:
+				self.stack_low = sp
+			return following
+		return step, self.memory_bytes(source, size), size
+
+	def op_pop(self, index, mnemonic, operands, line_number):
+		destination = self.operand(operands[0], line_number)
+		size = self.word_size
+		set_ = self.setter(destination, size)
+		R = self.registers
+		read = self.memory.read
+		following = index + 1
+		def step():
+			sp = R[4]
+			R[4] = sp + size
+			set_(read(sp, size))
+			return following
+		return step, size, self.memory_bytes(destination, size)
+
+	def binary(self, index, operands, line_number, operation, kind, store=True, carry_in=False):
+		destination = self.operand(operands[0], line_number)
+		source = self.operand(operands[1], line_number)
+		size = self.operand_size(destination, source)
+		bits = size * 8
+		mask = masks[size]
+		get_destination = self.getter(destination, size)
+		get_source = self.getter(source, size)
+		set_ = self.setter(destination, size) if store else None
+		flags = self.flags
+		flag_values = self.flag_values
+		following = index + 1
+		if carry_in:
+			def step():
+				a = get_destination()
+				b = get_source() + (1 if flag_values()[2] else 0)
+				result = operation(a, b) & mask
+				flags[0] = (kind, a, b, result, bits)
+				set_(result)
+				return following
+		elif store:
+			def step():
+				a = get_destination()
+				b = get_source()
+				result = operation(a, b) & mask
+				flags[0] = (kind, a, b, result, bits)
+				set_(result)
+				return following
+		else:
+			def step():
+				a = get_destination()
+				b = get_source()
+				flags[0] = (kind, a, b, operation(a, b) & mask, bits)
+				return following
+		reads = self.memory_bytes(destination, size) + self.memory_bytes(source, size)
+		writes = self.memory_bytes(destination, size) if store else 0
+		return step, reads, writes
+
+	def op_add(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a + b, 'add')
+
+	def op_adc(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a + b, 'add', carry_in=True)
+
+	def op_sub(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a - b, 'sub')
+
+	def op_sbb(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a - b, 'sub', carry_in=True)
+
+	def op_cmp(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a - b, 'sub', store=False)
+
+	def op_and(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a & b, 'logic')
+
+	def op_or(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a | b, 'logic')
+
+	def op_xor(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a ^ b, 'logic')
+
+	def op_test(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a & b, 'logic', store=False)
+
+	def op_shl(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a << (b & 63), 'logic')
+
+	def op_shr(self, index, mnemonic, operands, line_number):
+		return self.binary(index, operands, line_number, lambda a, b: a >> (b & 63), 'logic')
+
+	def op_inc(self, index, mnemonic, operands, line_number):
+		return self.binary(index, [operands[0], '1'], line_number, lambda a, b: a + b, 'add')
+
+	def op_dec(self, index, mnemonic, operands, line_number):
+		return self.binary(index, [operands[0], '1'], line_number, lambda a, b: a - b, 'sub')
+
+	def op_imul(self, index, mnemonic, operands, line_number):
+		if len(operands) == 2:
+			operands = [operands[0], operands[0], operands[1]]
+		destination = self.operand(operands[0], line_number)
+		left = self.operand(operands[1], line_number)
+		right = self.operand(operands[2], line_number)
+		size = self.operand_size(destination)
+		get_left = self.getter(left, size)
+		get_right = self.getter(right, size)
+		set_ = self.setter(destination, size)
+		following = index + 1
+		def step():
+			# The low half of the product is the same for signed operands
+			set_(get_left() * get_right())
+			return following
+		return step, self.memory_bytes(left, size) + self.memory_bytes(right, size), 0
+
+	def op_not(self, index, mnemonic, operands, line_number):
+		operand = self.operand(operands[0], line_number)
+		size = self.operand_size(operand)
+		get = self.getter(operand, size)
+		set_ = self.setter(operand, size)
+		following = index + 1
+		if mnemonic == 'not':
+			def step():
+				set_(~get())
+				return following
+		else:
+			def step():
+				set_(-get())
+				return following
+		return step, self.memory_bytes(operand, size), self.memory_bytes(operand, size)
+
+	op_neg = op_not
+
+	def op_xchg(self, index, mnemonic, operands, line_number):
+		first = self.operand(operands[0], line_number)
+		second = self.operand(operands[1], line_number)
+		size = self.operand_size(first, second)
+		get_first = self.getter(first, size)
+		get_second = self.getter(second, size)
+		set_first = self.setter(first, size)
+		set_second = self.setter(second, size)
+		following = index + 1
+		def step():
+			a = get_first()
+			set_first(get_second())
+			set_second(a)
+			return following
+		traffic = self.memory_bytes(first, size) + self.memory_bytes(second, size)
+		return step, traffic, traffic
+
+	def op_div(self, index, mnemonic, operands, line_number):
+		divisor_operand = self.operand(operands[0], line_number)
+		size = self.operand_size(divisor_operand)
+		bits = size * 8
+		mask = masks[size]
+		get_divisor = self.getter(divisor_operand, size)
+		R = self.registers
+		signed = mnemonic == 'idiv'
+		sign = 1 << (bits - 1)
+		following = index + 1
+		def step():
+			dividend = (R[2] & mask) << bits | (R[0] & mask)
+			divisor = get_divisor()
+			if divisor == 0:
+				raise Fault('Floating point exception: division by zero', SIGFPE)
+			if signed:
+				if dividend >> (2 * bits - 1):
+					dividend -= 1 << (2 * bits)
+				if divisor & sign:
+					divisor -= 1 << bits
+				quotient = abs(dividend) // abs(divisor)
+				if (dividend < 0) != (divisor < 0):
+					quotient = -quotient
+				remainder = dividend - quotient * divisor
+				if not -sign <= quotient < sign:
+					raise Fault('Floating point exception: quotient overflow', SIGFPE)
+			else:
+				quotient, remainder = divmod(dividend, divisor)
+				if quotient > mask:
+					raise Fault('Floating point exception: quotient overflow', SIGFPE)
+			R[0] = quotient & mask
+			R[2] = remainder & mask
+			return following
+		return step, self.memory_bytes(divisor_operand, size), 0
+
+	op_idiv = op_div
+
+	def op_cdq(self, index, mnemonic, operands, line_number):
+		size = {'cdq': 4, 'cqo': 8}[mnemonic]
+		sign = 1 << (size * 8 - 1)
+		mask = masks[size]
+		R = self.registers
+		following = index + 1
+		def step():
+			R[2] = mask if R[0] & sign else 0
+			return following
+		return step, 0, 0
+
+	op_cqo = op_cdq
+
+	def op_set(self, index, mnemonic, operands, line_number):
+		destination = self.operand(operands[0], line_number)
+		set_ = self.setter(destination, 1)
+		test = self.condition(mnemonic[3:])
+		following = index + 1
+		def step():
+			set_(1 if test() else 0)
+			return following
+		return step, 0, self.memory_bytes(destination, 1)
+
+	# SSE2
+
+	def op_movdqu(self, index, mnemonic, operands, line_number):
+		"""movdqu, movd and movq, moves of a fixed size."""
+		size = {'movdqu': 16, 'movdqa': 16, 'movd': 4, 'movq': 8}[mnemonic]
+		destination = self.operand(operands[0], line_number)
+		source = self.operand(operands[1], line_number)
+		get = self.getter(source, size)
+		set_ = self.setter(destination, size)
+		following = index + 1
+		def step():
+			set_(get())
+			return following
+		return step, self.memory_bytes(source, size), self.memory_bytes(destination, size)
+
+	op_movdqa = op_movd = op_movq = op_movdqu
+
+	def vector_binary(self, index, operands, line_number, operation):
+		destination = self.operand(operands[0], line_number)
+		source = self.operand(operands[1], line_number)
+		get_destination = self.getter(destination, 16)
+		get_source = self.getter(source, 16)
+		set_ = self.setter(destination, 16)
+		following = index + 1
+		def step():
+			set_(operation(get_destination(), get_source()))
+			return following
+		return step, self.memory_bytes(source, 16), 0
+
+	def op_padd(self, index, mnemonic, operands, line_number):
+		"""Packed integer add, subtract and multiply, lane by lane."""
+		bits = lane_sizes[mnemonic[-1]] * 8
+		mask = masks[bits // 8]
+		shifts = range(0, 128, bits)
+		lane = {'padd': lambda a, b: a + b, 'psub': lambda a, b: a - b, 'pmul': lambda a, b: a * b}[mnemonic[:4]]
+		def operation(a, b):
+			result = 0
+			for shift in shifts:
+				result |= (lane(a >> shift & mask, b >> shift & mask) & mask) << shift
+			return result
+		return self.vector_binary(index, operands, line_number, operation)
+
+	op_paddb = op_paddw = op_paddd = op_paddq = op_padd
+	op_psubb = op_psubw = op_psubd = op_psubq = op_padd
+	op_pmullw = op_padd
+
+	def op_pxor(self, index, mnemonic, operands, line_number):
+		return self.vector_binary(index, operands, line_number, lambda a, b: a ^ b)
+
+	def op_pshufd(self, index, mnemonic, operands, line_number):
+		destination = self.operand(operands[0], line_number)
+		source = self.operand(operands[1], line_number)
+		order = self.evaluate(operands[2], line_number)
+		get = self.getter(source, 16)
+		set_ = self.setter(destination, 16)
+		# Source bit offset of each dword of the result
+		shifts = [(order >> (lane * 2) & 3) * 32 for lane in range(4)]
+		following = index + 1
+		def step():
+			value = get()
+			result = 0
+			for lane, shift in enumerate(shifts):
+				result |= (value >> shift & 0xffffffff) << (lane * 32)
+			set_(result)
+			return following
+		return step, self.memory_bytes(source, 16), 0
+
+	def op_jmp(self, index, mnemonic, operands, line_number):
+		target, reads = self.jump_target(operands[0], line_number)
+		if callable(target):
+			return target, reads, 0
+		return (lambda: target), 0, 0
+
+	def op_jump_if(self, index, mnemonic, operands, line_number):
+		target, reads = self.jump_target(operands[0], line_number)
+		test = self.condition(mnemonic[1:])
+		following = index + 1
+		def step():
+			return target if test() else following
+		return step, 0, 0
+
+	def op_call(self, index, mnemonic, operands, line_number):
+		R = self.registers
+		write = self.memory.write
+		size = self.word_size
+		following = index + 1
+		if index in self.call_over:
+			# The data right after the call is what its address is taken of
+			return_address = self.addresses[index] + 1
+			target = following
+			reads = 0
+		else:
+			return_address = self.addresses[index + 1]
+			target, reads = self.jump_target(operands[0], line_number)
+		def step():
+			sp = R[4] - size
+			R[4] = sp
+			write(sp, size, return_address)
+			if sp < self.stack_low:
+				self.stack_low = sp
+			return target() if callable(target) else target
+		return step, reads, size
+
+	def op_ret(self, index, mnemonic, operands, line_number):
+		R = self.registers
+		read = self.memory.read
+		size = self.word_size
+		instruction_at = self.instruction_at
+		def step():
+			sp = R[4]
+			R[4] = sp + size
+			address = read(sp, size)
+			if address not in instruction_at:
+				raise Fault(f'Segmentation fault returning to {address:#x}')
+			return instruction_at[address]
+		return step, size, 0
+
+	def op_rep(self, index, mnemonic, operands, line_number):
+		name = operands[0]
+		instruction = name[:4]
+		element_size = {'b': 1, 'w': 2, 'd': 4, 'q': 8}[name[4]]
+		R = self.registers
+		memory = self.memory
+		following = index + 1
+		if instruction == 'stos':
+			def step():
+				count = R[1]
+				value = (R[0] & masks[element_size]).to_bytes(element_size, 'little')
+				if count:
+					memory.write_bytes(R[7], value * count)
+				R[7] += count * element_size
+				R[1] = 0
+				self.string_writes += count * element_size
+				self.string_iterations += count
+				return following
+		elif instruction == 'movs':
+			def step():
+				count = R[1]
+				length = count * element_size
+				if count:
+					memory.write_bytes(R[7], memory.read_bytes(R[6], length))
+				R[6] += length
+				R[7] += length
+				R[1] = 0
+				self.string_reads += length
+				self.string_writes += length
+				self.string_iterations += count
+				return following
+		else:
+			raise Fault(f'line {line_number}: unsupported instruction "rep {name}"')
+		return step, 0, 0
+
+	def op_rdtsc(self, index, mnemonic, operands, line_number):
+		R = self.registers
+		following = index + 1
+		def step():
+			# Executed instructions stand in for cycles, which keeps runs reproducible
+			counter = sum(self.counts)
+			R[0] = counter & 0xffffffff
+			R[2] = (counter >> 32) & 0xffffffff
+			return following
+		return step, 0, 0
+
+	def op_int(self, index, mnemonic, operands, line_number):
+		if operands[0] != '0x80':
+			raise Fault(f'line {line_number}: unsupported interrupt {operands[0]}')
+		# eax, then ebx, ecx, edx, esi, edi
+		return self.system_call(index, [3, 1, 2, 6, 7])
+
+	def op_syscall(self, index, mnemonic, operands, line_number):
+		# rax, then rdi, rsi, rdx, r10, r8
+		return self.system_call(index, [7, 6, 2, 10, 8])
+
+	def system_call(self, index, argument_registers):
+		R = self.registers
+		mask = self.word_mask
+		names = syscalls[self.word_size]
+		following = index + 1
+		def step():
+			name = names.get(R[0])
+			arguments = [R[register] for register in argument_registers]
+			if name is None:
+				result = -ENOSYS
+			else:
+				result = getattr(self, 'sys_' + name)(*arguments)
+			R[0] = result & mask
+			return following
+		return step, 0, 0
+
+	def fall_off(self):
+		raise Fault('Segmentation fault: ran past the last instruction')
+
+	# System calls
+
+	def sys_exit(self, code, *arguments):
+		raise Exit(code & 0xff)
+
+	def sys_write(self, fd, buffer, length, *arguments):
+		if fd not in [1, 2]:
+			return -EBADF
+		data = self.memory.read_bytes(buffer, length)
+		self.string_reads += length
+		if fd == 1:
+			self.stdout.extend(data)
+		else:
+			self.stderr.extend(data)
+		return length
+
+	def sys_brk(self, address, *arguments):
+		if address > self.brk:
+			# Like the kernel the heap is mapped in whole pages
+			end = base_address + len(self.memory.image)
+			if address > end:
+				self.memory.image.extend(bytes((address - end + 4095) // 4096 * 4096))
+			self.brk = address
+		return self.brk
+
+	def sys_fork(self, *arguments):
+		# There is only one emulated process
+		return -ENOSYS
+
+	# Running
+
+	def run(self):
+		if self.entry not in self.labels:
+			raise Fault('No entry point')
+		program = self.program
+		counts = self.counts
+		pc = self.instruction_at[self.labels[self.entry]]
+		try:
+			while True:
+				counts[pc] += 1
+				pc = program[pc]()
+		except Exit as exit:
+			exit_code = exit.exit_code
+		except Fault as fault:
+			self.stderr.extend((str(fault) + '\n').encode('utf8'))
+			exit_code = fault.exit_code
+		mnemonics = Counter()
+		reads = self.string_reads
+		writes = self.string_writes
+		for mnemonic, count, traffic in zip(self.mnemonics, counts, self.traffic):
+			if count:
+				mnemonics[mnemonic] += count
+				reads += count * traffic[0]
+				writes += count * traffic[1]
+		stack_high_water = self.stack_top - self.stack_low
+		return Result(exit_code, bytes(self.stdout), bytes(self.stderr), sum(counts), mnemonics,
+			reads, writes, stack_high_water, self.string_iterations)
+
+
+	def call(self, label, arguments, register_arguments=(), budget=100000):
+		"""
+		Calls the function at label and returns the accumulator. arguments are
+		pushed in order, register_arguments are (register, value) pairs. None
+		when it faults or does not return within budget instructions.
+		"""
+		R = self.registers
+		mask = self.word_mask
+		R[4] = self.stack_top
+		for value in arguments:
+			R[4] -= self.word_size
+			self.memory.write(R[4], self.word_size, value & mask)
+		for register, value in register_arguments:
+			R[registers[register][0]] = value & mask
+		# Returning to the end of the code stops the loop below
+		end = len(self.program) - 1
+		R[4] -= self.word_size
+		self.memory.write(R[4], self.word_size, self.addresses[end])
+		program = self.program
+		counts = self.counts
+		pc = self.instruction_at[self.labels[label]]
+		try:
+			for _ in range(budget):
+				if pc == end:
+					return R[0]
+				counts[pc] += 1
+				pc = program[pc]()
+		except (Exit, Fault):
+			return None
+		return None
+
+
+def run_file(filename):
+	"""Runs the asm output of w.py and returns a Result."""
+	f = open(filename, 'r', encoding='utf8')
+	source = f.read()
+	f.close()
+	return Emulator(source).run()
+
+
+def main(argv):
+	report = True
+	i = 1
+	while i < len(argv) and argv[i].startswith('--'):
+		if argv[i] == '--quiet':
+			report = False
+		i += 1
+	if i >= len(argv):
+		print('Please provide the asm output of w.py')
+		print('For example:')
+		print('  $ python emulator.py tests/bin/hello.asm')
+		print('  $ python emulator.py --quiet tests/bin/hello.asm  # without the report')
+		return 2
+	try:
+		result = run_file(argv[i])
+	except (Fault, OSError) as error:
+		print(error, file=sys.stderr)
+		return 1
+	sys.stdout.buffer.write(result.stdout)
+	sys.stdout.flush()
+	sys.stderr.buffer.write(result.stderr)
+	if report:
+		print(result.report(), file=sys.stderr)
+	return result.exit_code
+
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv))
@@ -0,0 +1,195 @@
+# Runtime prelude, compiled ahead of every program.
+#
+# memset(destination, value, count) and memcpy(destination, source, count)
+# are assembly primitives emitted by the compiler.
+#
+# Every heap block starts with an 8 byte header, the block size is stored in
+# the word right before the returned pointer. Free blocks store the next block
+# of their free list in their first word.
+#
+# Output to file descriptors 0 to 2 goes through page sized buffers that are
+# written with one syscall when full, by flush(), exit() and when main
+# returns. Exiting directly with syscall4(1, ...) loses buffered output.
+#
+# Programs can declare the names used here again, their declarations shadow
+# the ones of the runtime.
+
+# next unallocated byte and current program break, unsigned since
+# addresses at or above 2 GB are negative ints
+uint runtime_heap_top
+uint runtime_heap_end
+
+# free lists of size class i, blocks of 16 << i bytes
+int[8] runtime_free_lists
+
+# free list of blocks larger than 2048 bytes
+int runtime_large_blocks
+
+# bytes in the output buffer of file descriptors 0 to 2
+int[3] runtime_output_length
+char[12288] runtime_output
+
+# Grows the heap by at least size bytes, the break is moved in large chunks
+int runtime_grow(int size):
+	uint chunk = 65536
+	if chunk < size:
+		chunk = size
+	if runtime_heap_end == 0:
+		runtime_heap_end = syscall4(45, 0, 0, 0)
+		runtime_heap_top = runtime_heap_end
+	uint wanted = runtime_heap_end + chunk
+	if wanted < runtime_heap_end:
+		return 0
+	# brk returns the old break when it fails
+	uint end = syscall4(45, wanted, 0, 0)
+	if end < wanted:
+		return 0
+	runtime_heap_end = end
+	return 1
+
+# Takes the first block of at least size bytes from the large block list
+int runtime_large_block(int size):
+	int* previous = 0
+	int* block = runtime_large_blocks
+	while block:
+		if block[-1] >= size:
+			if previous:
+				previous[0] = block[0]
+			else:
+				runtime_large_blocks = block[0]
+			return block
+		previous = block
+		block = block[0]
+	return 0
+
+int malloc(int size):
+	# Negative sizes and ones that overflow with the header and rounding
+	if size < 0:
+		return 0
+	if size + 8 + 15 < 0:
+		return 0
+	int* block = 0
+	int size_class = 8
+	int block_size = 16
+	if size + 8 <= 2048:
+		size_class = 0
+		while block_size < size + 8:
+			block_size = block_size * 2
+			size_class = size_class + 1
+	if size_class < 8:
+		block = runtime_free_lists[size_class]
+		if block:
+			runtime_free_lists[size_class] = block[0]
+			return block
+	else:
+		block_size = (size + 8 + 15) / 16 * 16
+		block = runtime_large_block(block_size)
+		if block:
+			return block
+	if block_size > runtime_heap_end - runtime_heap_top:
+		if runtime_grow(block_size) == 0:
+			return 0
+	block = runtime_heap_top + 8
+	runtime_heap_top = runtime_heap_top + block_size
+	block[-1] = block_size
+	return block
+
+int free(int* block):
+	if block == 0:
+		return 0
+	int size_class = 0
+	int class_size = 16
+	while class_size < block[-1]:
+		class_size = class_size * 2
+		size_class = size_class + 1
+	if size_class < 8:
+		block[0] = runtime_free_lists[size_class]
+		runtime_free_lists[size_class] = block
+	else:
+		block[0] = runtime_large_blocks
+		runtime_large_blocks = block
+	return 0
+
+int flush(int fd):
+	int length = runtime_output_length[fd]
+	if length > 0:
+		syscall4(4, fd, &runtime_output[fd * 4096], length)
+		runtime_output_length[fd] = 0
+	return 0
+
+int runtime_flush():
+	flush(1)
+	flush(2)
+	flush(0)
+	return 0
+
+int write_char(int fd, int c):
+	if fd > 2:
+		return syscall4(4, fd, &c, 1)
+	if runtime_output_length[fd] == 4096:
+		flush(fd)
+	runtime_output[fd * 4096 + runtime_output_length[fd]] = c
+	runtime_output_length[fd] = runtime_output_length[fd] + 1
+	return 1
+
+int write_str(int fd, char* str):
+	int length = 0
+	while str[length]:
+		length = length + 1
+	if fd > 2:
+		return syscall4(4, fd, str, length)
+	if runtime_output_length[fd] + length > 4096:
+		flush(fd)
+	if length >= 4096:
+		return syscall4(4, fd, str, length)
+	memcpy(&runtime_output[fd * 4096 + runtime_output_length[fd]], str, length)
+	runtime_output_length[fd] = runtime_output_length[fd] + length
+	return length
+
+int write_int(int fd, int n):
+	char[24] digits
+	int negative = n < 0
+	# Digits are taken from the negative value, the smallest int has no
+	# positive counterpart
+	if n > 0:
+		n = 0 - n
+	digits[23] = 0
+	int i = 22
+	digits[i] = 48 - n % 10
+	n = n / 10
+	while n:
+		i = i - 1
+		digits[i] = 48 - n % 10
+		n = n / 10
+	if negative:
+		i = i - 1
+		digits[i] = 45
+	return write_str(fd, &digits[i])
+
+# Writes the counters of --instrument builds to stderr as tab separated
+# "function calls cycles self_cycles" lines
+int runtime_profile_dump():
+	char[24] digits
+	digits[23] = 0
+	write_str(2, "function\tcalls\tcycles\tself_cycles\n")
+	int* record = &runtime_profile[1]
+	for int i in range(runtime_profile[0]):
+		write_str(2, record[0])
+		write_char(2, 9)
+		write_str(2, runtime_counter_digits(&digits[23], &record[1]))
+		write_char(2, 9)
+		write_str(2, runtime_counter_digits(&digits[23], &record[3]))
+		write_char(2, 9)
+		write_str(2, runtime_counter_digits(&digits[23], &record[5]))
+		write_char(2, 10)
+		record = &record[8]
+	return 0
+
+# Ends the program with code after writing out buffered output and, in
+# --instrument builds, the counters. Calls that are still active have no
+# cycles yet.
+int exit(int code):
+	if runtime_profile[0]:
+		runtime_profile_dump()
+	runtime_flush()
+	return syscall4(1, code, 0, 0)
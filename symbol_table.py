@@ -1,3 +1,6 @@
+from collections import defaultdict
+
+
 class Symbol:
 	def __init__(self, name, symbol_type):
 		self.name = name
@@ -12,6 +15,12 @@ class Type(Symbol):
 		self.sub_type = sub_type
 		self.signed = signed
 		self.fields = []
+		# Fields and array elements of this type start at a multiple of it
+		self.alignment = max(size, 1)
+		# Format strings of the accumulator load and store instructions,
+		# None for types that do not fit in a register
+		self.load = None
+		self.store = None
 
 
 class Field():
@@ -22,17 +31,50 @@ class Field():
 
 
 class Function(Symbol):
-	def __init__(self, name, return_type, start_address):
+	def __init__(self, name, return_type, start_address, calling_convention='stack'):
 		super().__init__(name, 'Function')
+		# Assembly label, differs from the name when shadowing another function
+		self.label = name
 		self.return_type = return_type
 		self.start_address = start_address
 		# Size will be updated later once the full function size is calculated
 		self.size = 0
 		self.arguments = []
 
+		# 'stack': all arguments are pushed by the caller
+		# 'fastcall': the first arguments are passed in registers
+		self.calling_convention = calling_convention
+
+		# Bytes of arguments passed on the stack, removed by the caller
+		self.stack_argument_size = 0
+
+		# Bytes of stack taken by its locals and loop counters at the deepest point
+		self.frame_size = 0
+
+		# Index of the function label in the compiler output
+		self.code_index = 0
+
+		# Label of the call and cycle counters in --instrument builds
+		self.profile_label = None
+
+		# Functions it calls, in order of their first call
+		self.callees = []
+
+		# Code of pure functions and the pure functions they call, by
+		# label, None for functions with side effects
+		self.pure_code = None
+
 		# Scope is added once the function is declared
 		self.scope = None
 
+	def register_arguments(self, registers):
+		if self.calling_convention != 'fastcall':
+			return []
+		return self.arguments[0:len(registers)]
+
+	def stack_arguments(self, registers):
+		return self.arguments[len(self.register_arguments(registers)):]
+
 
 class Variable(Symbol):
 	def __init__(self, name, variable_type, sub_type, pointer_level=0, array_count=0):
@@ -42,6 +84,10 @@ class Variable(Symbol):
 		self.pointer_level = pointer_level
 		self.array_count = array_count
 
+		# Assembly label of global variables, prefixed so that names of
+		# registers or of the runtime's own labels can be used
+		self.label = 'g_' + name
+
 	def __str__(self):
 		return f'Variable("{self.name}" [{self.variable_type.name}{"*" * self.pointer_level}] stack:{self.stack_position})'  
 
@@ -58,6 +104,10 @@ class SymbolTable:
 	def __init__(self) -> None:
 		self.table = []
 
+		# Module level symbols by name as first looked up, None when
+		# not found, collected while a Unit is compiled
+		self.lookups = None
+
 		# Add the root scope
 		self.add_scope('global')
 
@@ -72,9 +122,181 @@ class SymbolTable:
 	def lookup(self, name):
 		for scope in reversed(self.table):
 			if name in scope:
+				if self.lookups is not None and scope.scope_type in ['global', 'Module']:
+					self.lookups.setdefault(name, scope[name])
 				return scope[name]
 			
+		if self.lookups is not None:
+			self.lookups.setdefault(name, None)
 		return None
 
 	def declare(self, symbol):
 		self.table[-1][symbol.name] = symbol
+
+
+class Lifetime:
+	"""Code indexes where a local variable is initialized and used."""
+	def __init__(self, variable, reusable) -> None:
+		self.variable = variable
+		# Word sized scalars can share a stack slot
+		self.reusable = reusable
+		# First instruction writing its slot
+		self.initialized = None
+		self.uses = []
+		# Its address was taken, it may be used through a pointer
+		self.pinned = False
+		# End of its scope, where its slot is popped
+		self.scope_end = None
+
+	def end(self, loops):
+		"""Index of the last instruction that needs its value."""
+		if self.pinned:
+			return self.scope_end
+		end = max(self.uses, default=self.initialized)
+		for start, loop_end in loops:
+			# Uses in a loop around it read it again on the next iteration
+			if self.initialized < start and any(start <= use <= loop_end for use in self.uses):
+				end = max(end, loop_end)
+		return end
+
+
+class Frame:
+	"""
+	Stack slots of the locals of a function. A first compilation records
+	their lifetimes, a local whose slot would only follow dead locals is
+	compiled again into the slot of one of them.
+	"""
+	def __init__(self, plan=None) -> None:
+		# Lifetimes in order of declaration
+		self.lifetimes = []
+		self.by_variable = {}
+
+		# Start and end code index of each loop
+		self.loops = []
+
+		# Declaration number: number of the local whose slot it takes
+		self.plan = plan or {}
+
+		self.size = 0
+
+		# The address of a local or argument was taken, calls can not
+		# reuse the frame as long as it may be in use
+		self.address_taken = False
+
+	def declare(self, variable, reusable):
+		"""Returns the variable whose slot to reuse, None to push a new one."""
+		host = self.plan.get(len(self.lifetimes))
+		lifetime = Lifetime(variable, reusable)
+		self.lifetimes.append(lifetime)
+		self.by_variable[variable] = lifetime
+		if host is None:
+			return None
+		return self.lifetimes[host].variable
+
+	def initialize(self, variable, code_index):
+		self.by_variable[variable].initialized = code_index
+
+	def use(self, variable, code_index):
+		if variable in self.by_variable:
+			self.by_variable[variable].uses.append(code_index)
+
+	def pin(self, variable):
+		if variable.sub_type != 'Global':
+			self.address_taken = True
+		if variable in self.by_variable:
+			self.by_variable[variable].pinned = True
+
+	def loop(self, start, end):
+		self.loops.append((start, end))
+
+	def allocate(self, stack_position):
+		self.size = max(self.size, stack_position)
+
+	def end_scope(self, first, code_index):
+		"""Ends the scope of the locals declared from number first on."""
+		for lifetime in self.lifetimes[first:]:
+			if lifetime.scope_end is None:
+				lifetime.scope_end = code_index
+
+	def reuse_plan(self):
+		"""Locals that can take the slot of a dead local, see plan."""
+		plan = {}
+		# Slot owner: local currently stored in it
+		occupants = {}
+		for number, lifetime in enumerate(self.lifetimes):
+			if not lifetime.reusable:
+				continue
+			for owner, occupant in occupants.items():
+				owner_lifetime = self.lifetimes[owner]
+				# The slot is popped at the end of its owner's scope
+				if owner_lifetime.scope_end < lifetime.initialized:
+					continue
+				if occupant.end(self.loops) < lifetime.initialized:
+					plan[number] = owner
+					occupants[owner] = lifetime
+					break
+			else:
+				occupants[number] = lifetime
+		return plan
+
+
+def signature(symbol):
+	"""The parts of a symbol that code referring to it depends on."""
+	if symbol is None:
+		return None
+	if symbol.symbol_type == 'Type':
+		fields = tuple((field.name, signature(field.field_type), field.offset) for field in symbol.fields)
+		return ('Type', symbol.name, symbol.size, symbol.alignment, symbol.signed, fields)
+	if symbol.symbol_type == 'Function':
+		return_type = symbol.return_type
+		if isinstance(return_type, Type):
+			return_type = signature(return_type)
+		arguments = tuple(signature(argument) for argument in symbol.arguments)
+		# Calls of pure functions may have been replaced by their result
+		pure_code = None
+		if symbol.pure_code is not None:
+			pure_code = tuple(symbol.pure_code.items())
+		return ('Function', symbol.label, symbol.calling_convention, return_type, arguments,
+			symbol.stack_argument_size, symbol.profile_label, pure_code)
+	if symbol.symbol_type == 'Variable':
+		return ('Variable', symbol.sub_type, symbol.label, signature(symbol.variable_type),
+			symbol.pointer_level, symbol.array_count)
+	return (symbol.symbol_type, symbol.name)
+
+
+class Unit:
+	"""Cached output of one top level struct, function or global declaration."""
+	def __init__(self, text, line_number) -> None:
+		# Source of the declaration and the line it starts on
+		self.text = text
+		self.line_number = line_number
+
+		# Signatures of the module level symbols it looked up by name
+		self.dependencies = {}
+
+		# Module level symbols it declared
+		self.symbols = []
+
+		# Its share of each output list of the compiler
+		self.outputs = {}
+
+	def valid(self, symbol_table):
+		"""True when the symbols it depends on are unchanged."""
+		for name, dependency in self.dependencies.items():
+			if signature(symbol_table.lookup(name)) != dependency:
+				return False
+		return True
+
+
+class UnitCache:
+	"""Compiled units kept between builds of a --watch session."""
+	def __init__(self) -> None:
+		# filename: {unit text: Unit}
+		self.files = {}
+
+		# Shared so labels of new code never clash with cached code
+		self.label_counters = defaultdict(int)
+
+		# Statistics of the last build
+		self.units = 0
+		self.recompiled = 0
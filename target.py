@@ -0,0 +1,369 @@
+class Target:
+	"""Machine specific parts of code generation."""
+	name = ''
+
+	# word size of the platform in bytes
+	word_size = 0
+
+	# fasm output format
+	format = ''
+
+	# General purpose registers sized to the word size
+	ax = ''
+	bx = ''
+	cx = ''
+	dx = ''
+	sp = ''
+	si = ''
+	di = ''
+
+	# Suffix of word sized string instructions, e.g. "rep stosd"
+	string_suffix = ''
+
+	# Size keyword of word sized memory operands, e.g. "mov dword [esp],0"
+	word_name = ''
+
+	# Sign extends the accumulator into dx before a signed division
+	sign_extend = ''
+
+	# Accumulator register by operand size in bytes
+	accumulators = {}
+
+	# Scratch register cx by operand size in bytes
+	scratch = {}
+
+	# Moves the low word of an xmm register to a general purpose register
+	vector_to_word = ''
+
+	# Registers used for the first arguments of "fastcall" functions
+	argument_registers = []
+
+	# Registers loaded by the syscallN stubs, syscall number first
+	syscall_registers = []
+	syscall_instruction = ''
+
+	# Linux syscall numbers are written using the i386 numbering,
+	# this maps them to the numbering of the target at compile time,
+	# so the numbers have to be constants when it is not empty and
+	# numbers missing from it are rejected
+	syscall_numbers = {}
+
+	def accumulator(self, size):
+		return self.accumulators[size]
+
+	def load(self, size, signed):
+		"""Format string of the instruction that loads size bytes from "{}" into the accumulator."""
+		if size == self.word_size:
+			return f'mov {self.ax},{{}}'
+		if size == 4:
+			if signed:
+				return f'movsxd {self.ax},dword {{}}'
+			# writing eax clears the upper half of rax
+			return 'mov eax,dword {}'
+		if size in [1, 2]:
+			extend = 'movsx' if signed else 'movzx'
+			width = {1: 'byte', 2: 'word'}[size]
+			return f'{extend} {self.ax},{width} {{}}'
+		return None
+
+	def store(self, size):
+		"""Format string of the instruction that stores size bytes of the accumulator to "{}"."""
+		if size not in self.accumulators:
+			return None
+		return f'mov {{}},{self.accumulator(size)}'
+
+	def syscall_number(self, number):
+		return self.syscall_numbers.get(number, number)
+
+	def syscall_stub(self, name, count):
+		"""Loads count arguments pushed by the caller into the syscall registers."""
+		code = [name + ':']
+		for i, register in enumerate(self.syscall_registers[0:count]):
+			code.append(f'mov {register},[{self.sp}+{(count - i) * self.word_size}]')
+		code.append(self.syscall_instruction)
+		code.append('ret')
+		return code
+
+	def argument(self, index, count, saved=0):
+		"""Operand of an argument pushed by the caller, after saving registers."""
+		return f'[{self.sp}+{(saved + count - index) * self.word_size}]'
+
+	def memset(self):
+		"""memset(destination, value, count) using word sized stores."""
+		code = [
+			'memset:',
+			f'push {self.di}',
+			f'mov {self.di},{self.argument(0, 3, 1)}',
+			f'movzx {self.ax},byte {self.argument(1, 3, 1)}',
+			f'mov {self.dx},{"0x" + "01" * self.word_size}',
+			f'imul {self.ax},{self.dx}',
+		]
+		code.extend(self.string_copy('stos', self.argument(2, 3, 1)))
+		code.extend([
+			f'pop {self.di}',
+			f'mov {self.ax},{self.argument(0, 3)}',
+			'ret',
+		])
+		return code
+
+	def memcpy(self):
+		"""memcpy(destination, source, count) using word sized moves."""
+		code = [
+			'memcpy:',
+			f'push {self.si}',
+			f'push {self.di}',
+			f'mov {self.di},{self.argument(0, 3, 2)}',
+			f'mov {self.si},{self.argument(1, 3, 2)}',
+		]
+		code.extend(self.string_copy('movs', self.argument(2, 3, 2)))
+		code.extend([
+			f'pop {self.di}',
+			f'pop {self.si}',
+			f'mov {self.ax},{self.argument(0, 3)}',
+			'ret',
+		])
+		return code
+
+	def string_copy(self, instruction, count):
+		"""Repeats a string instruction for count bytes, whole words first."""
+		shift = {4: 2, 8: 3}[self.word_size]
+		return [
+			f'mov {self.cx},{count}',
+			f'mov {self.dx},{self.cx}',
+			f'shr {self.cx},{shift}',
+			f'rep {instruction}{self.string_suffix}',
+			f'mov {self.cx},{self.dx}',
+			f'and {self.cx},{self.word_size - 1}',
+			f'rep {instruction}b',
+		]
+
+	def exit(self):
+		"""Exits the process with the value in the accumulator."""
+		return [
+			f'mov {self.syscall_registers[1]},{self.ax}',
+			f'mov {self.ax},{self.syscall_number(1)}',
+			self.syscall_instruction,
+		]
+
+
+class X86(Target):
+	name = 'x86'
+	word_size = 4
+	format = 'ELF executable 3'
+	ax = 'eax'
+	bx = 'ebx'
+	cx = 'ecx'
+	dx = 'edx'
+	sp = 'esp'
+	si = 'esi'
+	di = 'edi'
+	string_suffix = 'd'
+	word_name = 'dword'
+	sign_extend = 'cdq'
+	accumulators = {1: 'al', 2: 'ax', 4: 'eax'}
+	scratch = {1: 'cl', 2: 'cx', 4: 'ecx'}
+	vector_to_word = 'movd'
+	argument_registers = ['ecx', 'edx']
+	syscall_registers = ['eax', 'ebx', 'ecx', 'edx', 'esi', 'edi']
+	syscall_instruction = 'int 0x80'
+
+	# Counters are 64 bit, kept as a low and a high word
+
+	def profile_enter(self, counters, label):
+		"""Counts a call and pushes its start time and child cycles, unless the profiling stack is full."""
+		return [
+			f'add dword [{counters}],1',
+			f'adc dword [{counters}+4],0',
+			'mov ebx,[runtime_profile_top]',
+			'cmp ebx,[runtime_profile_end]',
+			f'jae {label}_full',
+			'rdtsc',
+			'mov [ebx],eax',
+			'mov [ebx+4],edx',
+			'mov dword [ebx+8],0',
+			'mov dword [ebx+12],0',
+			'add ebx,16',
+			'mov [runtime_profile_top],ebx',
+			f'add dword [{counters}+24],1',
+			f'jmp {label}_done',
+			f'{label}_full:',
+			'add dword [runtime_profile_overflow],1',
+			f'{label}_done:',
+		]
+
+	def profile_exit(self, counters, label):
+		"""Adds the elapsed cycles to the function, once per outermost call, and to its caller, keeps eax."""
+		return [
+			'cmp dword [runtime_profile_overflow],0',
+			f'jne {label}_full',
+			'mov ecx,eax',
+			'rdtsc',
+			'mov ebx,[runtime_profile_top]',
+			'sub ebx,16',
+			'mov [runtime_profile_top],ebx',
+			'sub eax,[ebx]',
+			'sbb edx,[ebx+4]',
+			'add [ebx-8],eax',
+			'adc [ebx-4],edx',
+			# Recursive calls are already part of the outermost one
+			f'sub dword [{counters}+24],1',
+			f'jnz {label}_nested',
+			f'add [{counters}+8],eax',
+			f'adc [{counters}+12],edx',
+			f'{label}_nested:',
+			'sub eax,[ebx+8]',
+			'sbb edx,[ebx+12]',
+			f'add [{counters}+16],eax',
+			f'adc [{counters}+20],edx',
+			'mov eax,ecx',
+			f'jmp {label}_done',
+			f'{label}_full:',
+			'sub dword [runtime_profile_overflow],1',
+			f'{label}_done:',
+		]
+
+	def counter_digits(self):
+		"""runtime_counter_digits(end, counter) writes decimal digits before end."""
+		return [
+			'runtime_counter_digits:',
+			'push esi',
+			f'mov ecx,{self.argument(0, 2, 1)}',
+			f'mov esi,{self.argument(1, 2, 1)}',
+			'mov eax,[esi]',
+			'mov edx,[esi+4]',
+			'mov ebx,10',
+			'runtime_counter_digits_loop:',
+			# Divide edx:eax by 10, the high word first
+			'mov esi,eax',
+			'mov eax,edx',
+			'xor edx,edx',
+			'div ebx',
+			'xchg eax,esi',
+			'div ebx',
+			'add dl,48',
+			'dec ecx',
+			'mov [ecx],dl',
+			'mov edx,esi',
+			'or esi,eax',
+			'jnz runtime_counter_digits_loop',
+			'mov eax,ecx',
+			'pop esi',
+			'ret',
+		]
+
+
+class X86_64(Target):
+	name = 'x86_64'
+	word_size = 8
+	format = 'ELF64 executable 3'
+	ax = 'rax'
+	bx = 'rbx'
+	cx = 'rcx'
+	dx = 'rdx'
+	sp = 'rsp'
+	si = 'rsi'
+	di = 'rdi'
+	string_suffix = 'q'
+	word_name = 'qword'
+	sign_extend = 'cqo'
+	accumulators = {1: 'al', 2: 'ax', 4: 'eax', 8: 'rax'}
+	scratch = {1: 'cl', 2: 'cx', 4: 'ecx', 8: 'rcx'}
+	vector_to_word = 'movq'
+	argument_registers = ['rcx', 'rdx', 'r8', 'r9']
+	syscall_registers = ['rax', 'rdi', 'rsi', 'rdx', 'r10', 'r8', 'r9']
+	syscall_instruction = 'syscall'
+	syscall_numbers = {
+		1: 60,  # exit
+		2: 57,  # fork
+		3: 0,  # read
+		4: 1,  # write
+		5: 2,  # open
+		6: 3,  # close
+		11: 59,  # execve
+		20: 39,  # getpid
+		26: 101,  # ptrace
+		37: 62,  # kill
+		45: 12,  # brk
+		91: 11,  # munmap
+		114: 61,  # wait4
+		162: 35,  # nanosleep
+	}
+	# mmap2 (192) has no counterpart, mmap (9) takes its offset in bytes
+	# instead of pages
+
+	# Counters take two words like on x86, only the low word is used
+
+	def profile_enter(self, counters, label):
+		"""Counts a call and pushes its start time and child cycles, unless the profiling stack is full."""
+		return [
+			f'add qword [{counters}],1',
+			'mov rbx,[runtime_profile_top]',
+			'cmp rbx,[runtime_profile_end]',
+			f'jae {label}_full',
+			'rdtsc',
+			'shl rdx,32',
+			'or rax,rdx',
+			'mov [rbx],rax',
+			'mov qword [rbx+8],0',
+			'add rbx,16',
+			'mov [runtime_profile_top],rbx',
+			f'add qword [{counters}+48],1',
+			f'jmp {label}_done',
+			f'{label}_full:',
+			'add qword [runtime_profile_overflow],1',
+			f'{label}_done:',
+		]
+
+	def profile_exit(self, counters, label):
+		"""Adds the elapsed cycles to the function, once per outermost call, and to its caller, keeps rax."""
+		return [
+			'cmp qword [runtime_profile_overflow],0',
+			f'jne {label}_full',
+			'mov rcx,rax',
+			'rdtsc',
+			'shl rdx,32',
+			'or rax,rdx',
+			'mov rbx,[runtime_profile_top]',
+			'sub rbx,16',
+			'mov [runtime_profile_top],rbx',
+			'sub rax,[rbx]',
+			'add [rbx-8],rax',
+			# Recursive calls are already part of the outermost one
+			f'sub qword [{counters}+48],1',
+			f'jnz {label}_nested',
+			f'add [{counters}+16],rax',
+			f'{label}_nested:',
+			'sub rax,[rbx+8]',
+			f'add [{counters}+32],rax',
+			'mov rax,rcx',
+			f'jmp {label}_done',
+			f'{label}_full:',
+			'sub qword [runtime_profile_overflow],1',
+			f'{label}_done:',
+		]
+
+	def counter_digits(self):
+		"""runtime_counter_digits(end, counter) writes decimal digits before end."""
+		return [
+			'runtime_counter_digits:',
+			f'mov rcx,{self.argument(0, 2)}',
+			f'mov rax,{self.argument(1, 2)}',
+			'mov rax,[rax]',
+			'mov rbx,10',
+			'runtime_counter_digits_loop:',
+			'xor rdx,rdx',
+			'div rbx',
+			'add dl,48',
+			'dec rcx',
+			'mov [rcx],dl',
+			'test rax,rax',
+			'jnz runtime_counter_digits_loop',
+			'mov rax,rcx',
+			'ret',
+		]
+
+
+targets = {
+	'x86': X86,
+	'x86_64': X86_64,
+}
@@ -0,0 +1,38 @@
+struct mixed:
+	char tag
+	int value
+	char flag
+
+packed struct header:
+	char kind
+	int length
+	char flags
+
+int main():
+	int[2] words
+	int word = &words[1] - &words[0]
+	mixed[3] items
+	header h
+	int errors = 0
+	# char, padding up to the int, int, char and tail padding
+	if &items[1] - &items[0] != 3 * word:
+		errors = errors + 1
+	if &items[1].value - &items[1] != word:
+		errors = errors + 1
+	if &items[2].flag - &items[2] != 2 * word:
+		errors = errors + 1
+	# packed fields follow each other
+	if &h.length - &h != 1:
+		errors = errors + 1
+	if &h.flags - &h != 1 + word:
+		errors = errors + 1
+	items[1].tag = 7
+	items[1].value = 1000
+	items[1].flag = 9
+	h.length = 123456
+	h.flags = 5
+	if items[1].tag + items[1].value + items[1].flag != 1016:
+		errors = errors + 1
+	if h.length + h.flags != 123461:
+		errors = errors + 1
+	return errors
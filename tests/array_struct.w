@@ -0,0 +1,16 @@
+struct pair:
+	int key
+	char tag
+	int value
+
+int main():
+	pair[4] pairs
+	int[4] arr
+	for int i in range(4):
+		pairs[i].key = i
+		pairs[i].value = i * 10
+		arr[i] = i + 1
+	int* p = &arr[1]
+	p[2] = 40
+	pairs[2].tag = 7
+	return pairs[3].value - pairs[3].key * 10 + pairs[2].value - 20 + arr[3] - p[2] + pairs[2].tag - 7
@@ -0,0 +1,1194 @@
+format ELF64 executable 3
+entry _main
+
+segment readable executable
+
+syscall1:
+mov rax,[rsp+8]
+syscall
+ret
+syscall4:
+mov rax,[rsp+32]
+mov rdi,[rsp+24]
+mov rsi,[rsp+16]
+mov rdx,[rsp+8]
+syscall
+ret
+syscall5:
+mov rax,[rsp+40]
+mov rdi,[rsp+32]
+mov rsi,[rsp+24]
+mov rdx,[rsp+16]
+mov r10,[rsp+8]
+syscall
+ret
+
+_main:
+call main
+push rax
+call runtime_flush
+pop rax
+mov rdi,rax
+mov rax,60
+syscall
+
+memset:
+push rdi
+mov rdi,[rsp+32]
+movzx rax,byte [rsp+24]
+mov rdx,0x0101010101010101
+imul rax,rdx
+mov rcx,[rsp+16]
+mov rdx,rcx
+shr rcx,3
+rep stosq
+mov rcx,rdx
+and rcx,7
+rep stosb
+pop rdi
+mov rax,[rsp+24]
+ret
+memcpy:
+push rsi
+push rdi
+mov rdi,[rsp+40]
+mov rsi,[rsp+32]
+mov rcx,[rsp+24]
+mov rdx,rcx
+shr rcx,3
+rep movsq
+mov rcx,rdx
+and rcx,7
+rep movsb
+pop rdi
+pop rsi
+mov rax,[rsp+24]
+ret
+runtime_counter_digits:
+mov rcx,[rsp+16]
+mov rax,[rsp+8]
+mov rax,[rax]
+mov rbx,10
+runtime_counter_digits_loop:
+xor rdx,rdx
+div rbx
+add dl,48
+dec rcx
+mov [rcx],dl
+test rax,rax
+jnz runtime_counter_digits_loop
+mov rax,rcx
+ret
+
+;uint runtime_heap_top
+;# free lists of size class i, blocks of 16 << i bytes
+;# free list of blocks larger than 2048 bytes
+;# bytes in the output buffer of file descriptors 0 to 2
+;int[3] runtime_output_length
+;# Grows the heap by at least size bytes, the break is moved in large chunks
+runtime_grow:
+;int runtime_grow(int size):
+mov rax,65536
+push rax
+;	uint chunk = 65536
+mov rax,[rsp+0]
+push rax
+mov rax,[rsp+24]
+pop rbx
+cmp rbx,rax
+setb al
+movzx rax,al
+test rax,rax
+jz else_label_1
+;	if chunk < size:
+mov rax,[rsp+0]
+mov rax,[rsp+16]
+mov [rsp+0],rax
+;		chunk = size
+jmp end_if_label_1
+else_label_1:
+end_if_label_1:
+mov rax,[runtime_heap_end]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+sete al
+movzx rax,al
+test rax,rax
+jz else_label_2
+;	if runtime_heap_end == 0:
+mov rax,[runtime_heap_end]
+mov rax,12
+push rax
+mov rax,0
+push rax
+mov rax,0
+push rax
+mov rax,0
+push rax
+call syscall4
+add rsp,32
+mov [runtime_heap_end],rax
+;		runtime_heap_end = syscall4(45, 0, 0, 0)
+mov rax,[runtime_heap_top]
+mov rax,[runtime_heap_end]
+mov [runtime_heap_top],rax
+;		runtime_heap_top = runtime_heap_end
+jmp end_if_label_2
+else_label_2:
+end_if_label_2:
+mov rax,[runtime_heap_end]
+push rax
+mov rax,[rsp+8]
+pop rbx
+add rax,rbx
+mov [rsp+0],rax
+;	uint wanted = runtime_heap_end + chunk
+mov rax,[rsp+0]
+push rax
+mov rax,[runtime_heap_end]
+pop rbx
+cmp rbx,rax
+setb al
+movzx rax,al
+test rax,rax
+jz else_label_3
+;	if wanted < runtime_heap_end:
+mov rax,0
+add rsp,8
+ret
+;	# brk returns the old break when it fails
+jmp end_if_label_3
+else_label_3:
+end_if_label_3:
+mov rax,12
+push rax
+mov rax,[rsp+8]
+push rax
+mov rax,0
+push rax
+mov rax,0
+push rax
+call syscall4
+add rsp,32
+push rax
+;	uint end = syscall4(45, wanted, 0, 0)
+mov rax,[rsp+0]
+push rax
+mov rax,[rsp+16]
+pop rbx
+cmp rbx,rax
+setb al
+movzx rax,al
+test rax,rax
+jz else_label_4
+;	if end < wanted:
+mov rax,0
+add rsp,16
+ret
+;		return 0
+jmp end_if_label_4
+else_label_4:
+end_if_label_4:
+mov rax,[runtime_heap_end]
+mov rax,[rsp+0]
+mov [runtime_heap_end],rax
+;	runtime_heap_end = end
+mov rax,1
+add rsp,16
+ret
+;# Takes the first block of at least size bytes from the large block list
+runtime_large_block:
+;int runtime_large_block(int size):
+mov rax,0
+push rax
+;	int* previous = 0
+mov rax,[runtime_large_blocks]
+push rax
+;	int* block = runtime_large_blocks
+while_start_1:
+mov rax,[rsp+0]
+test rax,rax
+jz while_end_1
+;	while block:
+mov rbx,[rsp+0]
+mov rax,[rbx+-8]
+push rax
+mov rax,[rsp+32]
+pop rbx
+cmp rbx,rax
+setge al
+movzx rax,al
+test rax,rax
+jz else_label_5
+;		if block[-1] >= size:
+mov rax,[rsp+8]
+test rax,rax
+jz else_label_6
+;			if previous:
+mov rbx,[rsp+0]
+mov rax,[rbx]
+mov rcx,[rsp+8]
+mov [rcx],rax
+;				previous[0] = block[0]
+jmp end_if_label_6
+else_label_6:
+;			else:
+mov rax,[runtime_large_blocks]
+mov rbx,[rsp+0]
+mov rax,[rbx]
+mov [runtime_large_blocks],rax
+;				runtime_large_blocks = block[0]
+end_if_label_6:
+mov rax,[rsp+0]
+add rsp,16
+ret
+;			return block
+jmp end_if_label_5
+else_label_5:
+end_if_label_5:
+mov rax,[rsp+8]
+mov rax,[rsp+0]
+mov [rsp+8],rax
+;		previous = block
+mov rax,[rsp+0]
+mov rbx,[rsp+0]
+mov rax,[rbx]
+mov [rsp+0],rax
+;		block = block[0]
+jmp while_start_1
+while_end_1:
+mov rax,0
+add rsp,16
+ret
+;
+malloc:
+;	# Negative sizes and ones that overflow with the header and rounding
+mov rax,[rsp+8]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz else_label_7
+;	if size < 0:
+mov rax,0
+ret
+;		return 0
+jmp end_if_label_7
+else_label_7:
+end_if_label_7:
+mov rax,[rsp+8]
+push rax
+mov rax,8
+pop rbx
+add rax,rbx
+push rax
+mov rax,15
+pop rbx
+add rax,rbx
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz else_label_8
+;	if size + 8 + 15 < 0:
+mov rax,0
+ret
+;		return 0
+jmp end_if_label_8
+else_label_8:
+end_if_label_8:
+mov rax,0
+push rax
+;	int* block = 0
+mov rax,8
+push rax
+;	int size_class = 8
+mov rax,16
+push rax
+;	int block_size = 16
+mov rax,[rsp+32]
+push rax
+mov rax,8
+pop rbx
+add rax,rbx
+push rax
+mov rax,2048
+pop rbx
+cmp rbx,rax
+setle al
+movzx rax,al
+test rax,rax
+jz else_label_9
+;	if size + 8 <= 2048:
+mov rax,[rsp+8]
+mov rax,0
+mov [rsp+8],rax
+;		size_class = 0
+while_start_2:
+mov rax,[rsp+0]
+push rax
+mov rax,[rsp+40]
+push rax
+mov rax,8
+pop rbx
+add rax,rbx
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz while_end_2
+;		while block_size < size + 8:
+mov rax,[rsp+0]
+mov rax,[rsp+0]
+push rax
+mov rax,2
+pop rbx
+imul rax,rbx
+mov [rsp+0],rax
+;			block_size = block_size * 2
+mov rax,[rsp+8]
+mov rax,[rsp+8]
+push rax
+mov rax,1
+pop rbx
+add rax,rbx
+mov [rsp+8],rax
+;			size_class = size_class + 1
+jmp while_start_2
+while_end_2:
+jmp end_if_label_9
+else_label_9:
+end_if_label_9:
+mov rax,[rsp+8]
+push rax
+mov rax,8
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz else_label_10
+;	if size_class < 8:
+mov rax,[rsp+16]
+mov rax,[rsp+8]
+mov rax,[runtime_free_lists+rax*8]
+mov [rsp+16],rax
+;		block = runtime_free_lists[size_class]
+mov rax,[rsp+16]
+test rax,rax
+jz else_label_11
+;		if block:
+mov rax,[rsp+8]
+push rax
+mov rbx,[rsp+24]
+mov rax,[rbx]
+pop rbx
+mov [runtime_free_lists+rbx*8],rax
+;			runtime_free_lists[size_class] = block[0]
+mov rax,[rsp+16]
+add rsp,24
+ret
+;			return block
+jmp end_if_label_11
+else_label_11:
+end_if_label_11:
+jmp end_if_label_10
+else_label_10:
+;	else:
+mov rax,[rsp+0]
+mov rax,[rsp+32]
+push rax
+mov rax,8
+pop rbx
+add rax,rbx
+push rax
+mov rax,15
+pop rbx
+add rax,rbx
+push rax
+mov rax,16
+mov rbx,rax
+pop rax
+cqo
+idiv rbx
+push rax
+mov rax,16
+pop rbx
+imul rax,rbx
+mov [rsp+0],rax
+;		block_size = (size + 8 + 15) / 16 * 16
+mov rax,[rsp+16]
+mov rax,[rsp+0]
+push rax
+call runtime_large_block
+add rsp,8
+mov [rsp+16],rax
+;		block = runtime_large_block(block_size)
+mov rax,[rsp+16]
+test rax,rax
+jz else_label_12
+;		if block:
+mov rax,[rsp+16]
+add rsp,24
+ret
+;			return block
+jmp end_if_label_12
+else_label_12:
+end_if_label_12:
+end_if_label_10:
+mov rax,[rsp+0]
+push rax
+mov rax,[runtime_heap_end]
+push rax
+mov rax,[runtime_heap_top]
+pop rbx
+sub rbx,rax
+mov rax,rbx
+pop rbx
+cmp rbx,rax
+seta al
+movzx rax,al
+test rax,rax
+jz else_label_13
+;	if block_size > runtime_heap_end - runtime_heap_top:
+mov rax,[rsp+0]
+push rax
+call runtime_grow
+add rsp,8
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+sete al
+movzx rax,al
+test rax,rax
+jz else_label_14
+;		if runtime_grow(block_size) == 0:
+mov rax,0
+add rsp,24
+ret
+;			return 0
+jmp end_if_label_14
+else_label_14:
+end_if_label_14:
+jmp end_if_label_13
+else_label_13:
+end_if_label_13:
+mov rax,[rsp+16]
+mov rax,[runtime_heap_top]
+push rax
+mov rax,8
+pop rbx
+add rax,rbx
+mov [rsp+16],rax
+;	block = runtime_heap_top + 8
+mov rax,[runtime_heap_top]
+mov rax,[runtime_heap_top]
+push rax
+mov rax,[rsp+8]
+pop rbx
+add rax,rbx
+mov [runtime_heap_top],rax
+;	runtime_heap_top = runtime_heap_top + block_size
+mov rax,[rsp+0]
+mov rcx,[rsp+16]
+mov [rcx+-8],rax
+;	block[-1] = block_size
+mov rax,[rsp+16]
+add rsp,24
+ret
+;
+free:
+;int free(int* block):
+mov rax,[rsp+8]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+sete al
+movzx rax,al
+test rax,rax
+jz else_label_15
+;	if block == 0:
+mov rax,0
+ret
+;		return 0
+jmp end_if_label_15
+else_label_15:
+end_if_label_15:
+mov rax,0
+push rax
+;	int size_class = 0
+mov rax,16
+push rax
+;	int class_size = 16
+while_start_3:
+mov rax,[rsp+0]
+push rax
+mov rbx,[rsp+32]
+mov rax,[rbx+-8]
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz while_end_3
+;	while class_size < block[-1]:
+mov rax,[rsp+0]
+mov rax,[rsp+0]
+push rax
+mov rax,2
+pop rbx
+imul rax,rbx
+mov [rsp+0],rax
+;		class_size = class_size * 2
+mov rax,[rsp+8]
+mov rax,[rsp+8]
+push rax
+mov rax,1
+pop rbx
+add rax,rbx
+mov [rsp+8],rax
+;		size_class = size_class + 1
+jmp while_start_3
+while_end_3:
+mov rax,[rsp+8]
+push rax
+mov rax,8
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz else_label_16
+;	if size_class < 8:
+mov rax,[rsp+8]
+mov rax,[runtime_free_lists+rax*8]
+mov rcx,[rsp+24]
+mov [rcx],rax
+;		block[0] = runtime_free_lists[size_class]
+mov rax,[rsp+8]
+push rax
+mov rax,[rsp+32]
+pop rbx
+mov [runtime_free_lists+rbx*8],rax
+;		runtime_free_lists[size_class] = block
+jmp end_if_label_16
+else_label_16:
+;	else:
+mov rax,[runtime_large_blocks]
+mov rcx,[rsp+24]
+mov [rcx],rax
+;		block[0] = runtime_large_blocks
+mov rax,[runtime_large_blocks]
+mov rax,[rsp+24]
+mov [runtime_large_blocks],rax
+;		runtime_large_blocks = block
+end_if_label_16:
+mov rax,0
+add rsp,16
+ret
+;
+flush:
+;int flush(int fd):
+mov rax,[rsp+8]
+mov rax,[runtime_output_length+rax*8]
+push rax
+;	int length = runtime_output_length[fd]
+mov rax,[rsp+0]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+setg al
+movzx rax,al
+test rax,rax
+jz else_label_17
+;	if length > 0:
+mov rax,1
+push rax
+mov rax,[rsp+24]
+push rax
+mov rax,[rsp+32]
+push rax
+mov rax,4096
+pop rbx
+imul rax,rbx
+lea rax,[runtime_output+rax*1]
+push rax
+mov rax,[rsp+24]
+push rax
+call syscall4
+add rsp,32
+;		syscall4(4, fd, &runtime_output[fd * 4096], length)
+mov rax,[rsp+16]
+push rax
+mov rax,0
+pop rbx
+mov [runtime_output_length+rbx*8],rax
+;		runtime_output_length[fd] = 0
+jmp end_if_label_17
+else_label_17:
+end_if_label_17:
+mov rax,0
+add rsp,8
+ret
+;
+runtime_flush:
+;int runtime_flush():
+mov rax,1
+push rax
+call flush
+add rsp,8
+;	flush(1)
+mov rax,2
+push rax
+call flush
+add rsp,8
+;	flush(2)
+mov rax,0
+push rax
+call flush
+add rsp,8
+;	flush(0)
+mov rax,0
+ret
+;# Ends the program with code after writing out buffered output
+exit:
+;int exit(int code):
+call runtime_flush
+;	runtime_flush()
+mov rax,60
+push rax
+mov rax,[rsp+16]
+push rax
+mov rax,0
+push rax
+mov rax,0
+push rax
+call syscall4
+add rsp,32
+ret
+;
+write_char:
+;int write_char(int fd, int c):
+mov rax,[rsp+16]
+push rax
+mov rax,2
+pop rbx
+cmp rbx,rax
+setg al
+movzx rax,al
+test rax,rax
+jz else_label_18
+;	if fd > 2:
+mov rax,1
+push rax
+mov rax,[rsp+24]
+push rax
+lea rax,[rsp+24]
+push rax
+mov rax,1
+push rax
+call syscall4
+add rsp,32
+ret
+;		return syscall4(4, fd, &c, 1)
+jmp end_if_label_18
+else_label_18:
+end_if_label_18:
+mov rax,[rsp+16]
+mov rax,[runtime_output_length+rax*8]
+push rax
+mov rax,4096
+pop rbx
+cmp rbx,rax
+sete al
+movzx rax,al
+test rax,rax
+jz else_label_19
+;	if runtime_output_length[fd] == 4096:
+mov rax,[rsp+16]
+push rax
+call flush
+add rsp,8
+;		flush(fd)
+jmp end_if_label_19
+else_label_19:
+end_if_label_19:
+mov rax,[rsp+16]
+push rax
+mov rax,4096
+pop rbx
+imul rax,rbx
+push rax
+mov rax,[rsp+24]
+mov rax,[runtime_output_length+rax*8]
+pop rbx
+add rax,rbx
+push rax
+mov rax,[rsp+16]
+pop rbx
+mov [runtime_output+rbx*1],al
+;	runtime_output[fd * 4096 + runtime_output_length[fd]] = c
+mov rax,[rsp+16]
+push rax
+mov rax,[rsp+24]
+mov rax,[runtime_output_length+rax*8]
+push rax
+mov rax,1
+pop rbx
+add rax,rbx
+pop rbx
+mov [runtime_output_length+rbx*8],rax
+;	runtime_output_length[fd] = runtime_output_length[fd] + 1
+mov rax,1
+ret
+;
+write_str:
+;int write_str(int fd, char* str):
+mov rax,0
+push rax
+;	int length = 0
+while_start_4:
+mov rax,[rsp+0]
+mov rbx,[rsp+16]
+movsx rax,byte [rbx+rax*1]
+test rax,rax
+jz while_end_4
+;	while str[length]:
+mov rax,[rsp+0]
+mov rax,[rsp+0]
+push rax
+mov rax,1
+pop rbx
+add rax,rbx
+mov [rsp+0],rax
+;		length = length + 1
+jmp while_start_4
+while_end_4:
+mov rax,[rsp+24]
+push rax
+mov rax,2
+pop rbx
+cmp rbx,rax
+setg al
+movzx rax,al
+test rax,rax
+jz else_label_20
+;	if fd > 2:
+mov rax,1
+push rax
+mov rax,[rsp+32]
+push rax
+mov rax,[rsp+32]
+push rax
+mov rax,[rsp+24]
+push rax
+call syscall4
+add rsp,32
+add rsp,8
+ret
+;		return syscall4(4, fd, str, length)
+jmp end_if_label_20
+else_label_20:
+end_if_label_20:
+mov rax,[rsp+24]
+mov rax,[runtime_output_length+rax*8]
+push rax
+mov rax,[rsp+8]
+pop rbx
+add rax,rbx
+push rax
+mov rax,4096
+pop rbx
+cmp rbx,rax
+setg al
+movzx rax,al
+test rax,rax
+jz else_label_21
+;	if runtime_output_length[fd] + length > 4096:
+mov rax,[rsp+24]
+push rax
+call flush
+add rsp,8
+;		flush(fd)
+jmp end_if_label_21
+else_label_21:
+end_if_label_21:
+mov rax,[rsp+0]
+push rax
+mov rax,4096
+pop rbx
+cmp rbx,rax
+setge al
+movzx rax,al
+test rax,rax
+jz else_label_22
+;	if length >= 4096:
+mov rax,1
+push rax
+mov rax,[rsp+32]
+push rax
+mov rax,[rsp+32]
+push rax
+mov rax,[rsp+24]
+push rax
+call syscall4
+add rsp,32
+add rsp,8
+ret
+;		return syscall4(4, fd, str, length)
+jmp end_if_label_22
+else_label_22:
+end_if_label_22:
+mov rax,[rsp+24]
+push rax
+mov rax,4096
+pop rbx
+imul rax,rbx
+push rax
+mov rax,[rsp+32]
+mov rax,[runtime_output_length+rax*8]
+pop rbx
+add rax,rbx
+lea rax,[runtime_output+rax*1]
+push rax
+mov rax,[rsp+24]
+push rax
+mov rax,[rsp+16]
+push rax
+call memcpy
+add rsp,24
+;	memcpy(&runtime_output[fd * 4096 + runtime_output_length[fd]], str, length)
+mov rax,[rsp+24]
+push rax
+mov rax,[rsp+32]
+mov rax,[runtime_output_length+rax*8]
+push rax
+mov rax,[rsp+16]
+pop rbx
+add rax,rbx
+pop rbx
+mov [runtime_output_length+rbx*8],rax
+;	runtime_output_length[fd] = runtime_output_length[fd] + length
+mov rax,[rsp+0]
+add rsp,8
+ret
+;
+write_int:
+;int write_int(int fd, int n):
+push 0
+push 0
+push 0
+mov rax,[rsp+32]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+push rax
+;	# positive counterpart
+mov rax,[rsp+40]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+setg al
+movzx rax,al
+test rax,rax
+jz else_label_23
+;	if n > 0:
+mov rax,[rsp+40]
+mov rax,0
+push rax
+mov rax,[rsp+48]
+pop rbx
+sub rbx,rax
+mov rax,rbx
+mov [rsp+40],rax
+;		n = 0 - n
+jmp end_if_label_23
+else_label_23:
+end_if_label_23:
+mov rax,0
+mov [rsp+31],al
+;	digits[23] = 0
+mov rax,22
+push rax
+;	int i = 22
+mov rax,[rsp+0]
+push rax
+mov rax,48
+push rax
+mov rax,[rsp+64]
+push rax
+mov rax,10
+mov rbx,rax
+pop rax
+cqo
+idiv rbx
+mov rax,rdx
+pop rbx
+sub rbx,rax
+mov rax,rbx
+pop rbx
+mov [rsp+16+rbx*1],al
+;	digits[i] = 48 - n % 10
+mov rax,[rsp+48]
+mov rax,[rsp+48]
+push rax
+mov rax,10
+mov rbx,rax
+pop rax
+cqo
+idiv rbx
+mov [rsp+48],rax
+;	n = n / 10
+while_start_5:
+mov rax,[rsp+48]
+test rax,rax
+jz while_end_5
+;	while n:
+mov rax,[rsp+0]
+mov rax,[rsp+0]
+push rax
+mov rax,1
+pop rbx
+sub rbx,rax
+mov rax,rbx
+mov [rsp+0],rax
+;		i = i - 1
+mov rax,[rsp+0]
+push rax
+mov rax,48
+push rax
+mov rax,[rsp+64]
+push rax
+mov rax,10
+mov rbx,rax
+pop rax
+cqo
+idiv rbx
+mov rax,rdx
+pop rbx
+sub rbx,rax
+mov rax,rbx
+pop rbx
+mov [rsp+16+rbx*1],al
+;		digits[i] = 48 - n % 10
+mov rax,[rsp+48]
+mov rax,[rsp+48]
+push rax
+mov rax,10
+mov rbx,rax
+pop rax
+cqo
+idiv rbx
+mov [rsp+48],rax
+;		n = n / 10
+jmp while_start_5
+while_end_5:
+mov rax,[rsp+8]
+test rax,rax
+jz else_label_24
+;	if negative:
+mov rax,[rsp+0]
+mov rax,[rsp+0]
+push rax
+mov rax,1
+pop rbx
+sub rbx,rax
+mov rax,rbx
+mov [rsp+0],rax
+;		i = i - 1
+mov rax,[rsp+0]
+push rax
+mov rax,45
+pop rbx
+mov [rsp+16+rbx*1],al
+;		digits[i] = 45
+jmp end_if_label_24
+else_label_24:
+end_if_label_24:
+mov rax,[rsp+56]
+push rax
+mov rax,[rsp+8]
+lea rax,[rsp+24+rax*1]
+push rax
+call write_str
+add rsp,16
+add rsp,40
+ret
+;# "function calls cycles self_cycles" lines
+runtime_profile_dump:
+;int runtime_profile_dump():
+push 0
+push 0
+push 0
+mov rax,0
+mov [rsp+23],al
+;	digits[23] = 0
+mov rax,2
+push rax
+call $ + 40
+db "function", 09h, "calls", 09h, "cycles", 09h, "self_cycles", 0ah, 0
+pop rax
+push rax
+call write_str
+add rsp,16
+;	write_str(2, "function\tcalls\tcycles\tself_cycles\n")
+lea rax,[runtime_profile+8]
+push rax
+;	int* record = &runtime_profile[1]
+push 0
+mov rax,[runtime_profile]
+push rax
+push 1
+for_start_1:
+mov rax,[rsp+16]
+mov rbx,[rsp+8]
+cmp rax,rbx
+je for_end_1
+;	for int i in range(runtime_profile[0]):
+mov rax,2
+push rax
+mov rbx,[rsp+32]
+mov rax,[rbx]
+push rax
+call write_str
+add rsp,16
+;		write_str(2, record[0])
+mov rax,2
+push rax
+mov rax,9
+push rax
+call write_char
+add rsp,16
+;		write_char(2, 9)
+mov rax,2
+push rax
+lea rax,[rsp+63]
+push rax
+mov rbx,[rsp+40]
+lea rax,[rbx+8]
+push rax
+call runtime_counter_digits
+add rsp,16
+push rax
+call write_str
+add rsp,16
+;		write_str(2, runtime_counter_digits(&digits[23], &record[1]))
+mov rax,2
+push rax
+mov rax,9
+push rax
+call write_char
+add rsp,16
+;		write_char(2, 9)
+mov rax,2
+push rax
+lea rax,[rsp+63]
+push rax
+mov rbx,[rsp+40]
+lea rax,[rbx+24]
+push rax
+call runtime_counter_digits
+add rsp,16
+push rax
+call write_str
+add rsp,16
+;		write_str(2, runtime_counter_digits(&digits[23], &record[3]))
+mov rax,2
+push rax
+mov rax,9
+push rax
+call write_char
+add rsp,16
+;		write_char(2, 9)
+mov rax,2
+push rax
+lea rax,[rsp+63]
+push rax
+mov rbx,[rsp+40]
+lea rax,[rbx+40]
+push rax
+call runtime_counter_digits
+add rsp,16
+push rax
+call write_str
+add rsp,16
+;		write_str(2, runtime_counter_digits(&digits[23], &record[5]))
+mov rax,2
+push rax
+mov rax,10
+push rax
+call write_char
+add rsp,16
+;		write_char(2, 10)
+mov rax,[rsp+24]
+mov rbx,[rsp+24]
+lea rax,[rbx+56]
+mov [rsp+24],rax
+;		record = &record[7]
+mov rax,[rsp+0]
+add [rsp+16],rax
+jmp for_start_1
+for_end_1:
+add rsp,24
+mov rax,0
+add rsp,32
+ret
+;	return 0
+main:
+;int main():
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+mov rax,7
+mov [rsp+56],rax
+;	arr[7] = 7
+mov rax,[rsp+56]
+push rax
+mov rax,7
+pop rbx
+sub rbx,rax
+mov rax,rbx
+add rsp,64
+ret
+;
+
+segment readable writeable
+
+align 8
+runtime_profile dq 0
+
+segment readable writeable
+
+align 8
+runtime_heap_top rb 8
+align 8
+runtime_heap_end rb 8
+align 8
+runtime_free_lists rb 64
+align 8
+runtime_large_blocks rb 8
+align 8
+runtime_output_length rb 24
+align 8
+runtime_output rb 12288
\ No newline at end of file
@@ -0,0 +1,1464 @@
+format ELF64 executable 3
+entry _main
+
+segment readable executable
+
+syscall1:
+mov rax,[rsp+8]
+syscall
+ret
+syscall4:
+mov rax,[rsp+32]
+mov rdi,[rsp+24]
+mov rsi,[rsp+16]
+mov rdx,[rsp+8]
+syscall
+ret
+syscall5:
+mov rax,[rsp+40]
+mov rdi,[rsp+32]
+mov rsi,[rsp+24]
+mov rdx,[rsp+16]
+mov r10,[rsp+8]
+syscall
+ret
+
+_main:
+call main
+push rax
+call runtime_flush
+pop rax
+mov rdi,rax
+mov rax,60
+syscall
+
+memset:
+push rdi
+mov rdi,[rsp+32]
+movzx rax,byte [rsp+24]
+mov rdx,0x0101010101010101
+imul rax,rdx
+mov rcx,[rsp+16]
+mov rdx,rcx
+shr rcx,3
+rep stosq
+mov rcx,rdx
+and rcx,7
+rep stosb
+pop rdi
+mov rax,[rsp+24]
+ret
+memcpy:
+push rsi
+push rdi
+mov rdi,[rsp+40]
+mov rsi,[rsp+32]
+mov rcx,[rsp+24]
+mov rdx,rcx
+shr rcx,3
+rep movsq
+mov rcx,rdx
+and rcx,7
+rep movsb
+pop rdi
+pop rsi
+mov rax,[rsp+24]
+ret
+runtime_counter_digits:
+mov rcx,[rsp+16]
+mov rax,[rsp+8]
+mov rax,[rax]
+mov rbx,10
+runtime_counter_digits_loop:
+xor rdx,rdx
+div rbx
+add dl,48
+dec rcx
+mov [rcx],dl
+test rax,rax
+jnz runtime_counter_digits_loop
+mov rax,rcx
+ret
+
+;uint runtime_heap_top
+source_line_1:
+;# free lists of size class i, blocks of 16 << i bytes
+source_line_2:
+;# free list of blocks larger than 2048 bytes
+source_line_3:
+;# bytes in the output buffer of file descriptors 0 to 2
+source_line_4:
+;int[3] runtime_output_length
+source_line_5:
+;# Grows the heap by at least size bytes, the break is moved in large chunks
+source_line_6:
+runtime_grow:
+;int runtime_grow(int size):
+source_line_7:
+mov rax,65536
+push rax
+;	uint chunk = 65536
+source_line_8:
+mov rax,[rsp+0]
+push rax
+mov rax,[rsp+24]
+pop rbx
+cmp rbx,rax
+setb al
+movzx rax,al
+test rax,rax
+jz else_label_1
+;	if chunk < size:
+source_line_9:
+mov rax,[rsp+0]
+mov rax,[rsp+16]
+mov [rsp+0],rax
+;		chunk = size
+source_line_10:
+jmp end_if_label_1
+else_label_1:
+end_if_label_1:
+mov rax,[runtime_heap_end]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+sete al
+movzx rax,al
+test rax,rax
+jz else_label_2
+;	if runtime_heap_end == 0:
+source_line_11:
+mov rax,[runtime_heap_end]
+mov rax,12
+push rax
+mov rax,0
+push rax
+mov rax,0
+push rax
+mov rax,0
+push rax
+call syscall4
+add rsp,32
+mov [runtime_heap_end],rax
+;		runtime_heap_end = syscall4(45, 0, 0, 0)
+source_line_12:
+mov rax,[runtime_heap_top]
+mov rax,[runtime_heap_end]
+mov [runtime_heap_top],rax
+;		runtime_heap_top = runtime_heap_end
+source_line_13:
+jmp end_if_label_2
+else_label_2:
+end_if_label_2:
+mov rax,[runtime_heap_end]
+push rax
+mov rax,[rsp+8]
+pop rbx
+add rax,rbx
+mov [rsp+0],rax
+;	uint wanted = runtime_heap_end + chunk
+source_line_14:
+mov rax,[rsp+0]
+push rax
+mov rax,[runtime_heap_end]
+pop rbx
+cmp rbx,rax
+setb al
+movzx rax,al
+test rax,rax
+jz else_label_3
+;	if wanted < runtime_heap_end:
+source_line_15:
+mov rax,0
+add rsp,8
+ret
+;	# brk returns the old break when it fails
+source_line_16:
+jmp end_if_label_3
+else_label_3:
+end_if_label_3:
+mov rax,12
+push rax
+mov rax,[rsp+8]
+push rax
+mov rax,0
+push rax
+mov rax,0
+push rax
+call syscall4
+add rsp,32
+push rax
+;	uint end = syscall4(45, wanted, 0, 0)
+source_line_17:
+mov rax,[rsp+0]
+push rax
+mov rax,[rsp+16]
+pop rbx
+cmp rbx,rax
+setb al
+movzx rax,al
+test rax,rax
+jz else_label_4
+;	if end < wanted:
+source_line_18:
+mov rax,0
+add rsp,16
+ret
+;		return 0
+source_line_19:
+jmp end_if_label_4
+else_label_4:
+end_if_label_4:
+mov rax,[runtime_heap_end]
+mov rax,[rsp+0]
+mov [runtime_heap_end],rax
+;	runtime_heap_end = end
+source_line_20:
+mov rax,1
+add rsp,16
+ret
+;# Takes the first block of at least size bytes from the large block list
+source_line_21:
+runtime_large_block:
+;int runtime_large_block(int size):
+source_line_22:
+mov rax,0
+push rax
+;	int* previous = 0
+source_line_23:
+mov rax,[runtime_large_blocks]
+push rax
+;	int* block = runtime_large_blocks
+source_line_24:
+while_start_1:
+mov rax,[rsp+0]
+test rax,rax
+jz while_end_1
+;	while block:
+source_line_25:
+mov rbx,[rsp+0]
+mov rax,[rbx+-8]
+push rax
+mov rax,[rsp+32]
+pop rbx
+cmp rbx,rax
+setge al
+movzx rax,al
+test rax,rax
+jz else_label_5
+;		if block[-1] >= size:
+source_line_26:
+mov rax,[rsp+8]
+test rax,rax
+jz else_label_6
+;			if previous:
+source_line_27:
+mov rbx,[rsp+0]
+mov rax,[rbx]
+mov rcx,[rsp+8]
+mov [rcx],rax
+;				previous[0] = block[0]
+source_line_28:
+jmp end_if_label_6
+else_label_6:
+;			else:
+source_line_29:
+mov rax,[runtime_large_blocks]
+mov rbx,[rsp+0]
+mov rax,[rbx]
+mov [runtime_large_blocks],rax
+;				runtime_large_blocks = block[0]
+source_line_30:
+end_if_label_6:
+mov rax,[rsp+0]
+add rsp,16
+ret
+;			return block
+source_line_31:
+jmp end_if_label_5
+else_label_5:
+end_if_label_5:
+mov rax,[rsp+8]
+mov rax,[rsp+0]
+mov [rsp+8],rax
+;		previous = block
+source_line_32:
+mov rax,[rsp+0]
+mov rbx,[rsp+0]
+mov rax,[rbx]
+mov [rsp+0],rax
+;		block = block[0]
+source_line_33:
+jmp while_start_1
+while_end_1:
+source_line_34:
+mov rax,0
+add rsp,16
+ret
+;
+source_line_35:
+malloc:
+;	# Negative sizes and ones that overflow with the header and rounding
+source_line_36:
+mov rax,[rsp+8]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz else_label_7
+;	if size < 0:
+source_line_37:
+mov rax,0
+ret
+;		return 0
+source_line_38:
+jmp end_if_label_7
+else_label_7:
+end_if_label_7:
+mov rax,[rsp+8]
+push rax
+mov rax,8
+pop rbx
+add rax,rbx
+push rax
+mov rax,15
+pop rbx
+add rax,rbx
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz else_label_8
+;	if size + 8 + 15 < 0:
+source_line_39:
+mov rax,0
+ret
+;		return 0
+source_line_40:
+jmp end_if_label_8
+else_label_8:
+end_if_label_8:
+mov rax,0
+push rax
+;	int* block = 0
+source_line_41:
+mov rax,8
+push rax
+;	int size_class = 8
+source_line_42:
+mov rax,16
+push rax
+;	int block_size = 16
+source_line_43:
+mov rax,[rsp+32]
+push rax
+mov rax,8
+pop rbx
+add rax,rbx
+push rax
+mov rax,2048
+pop rbx
+cmp rbx,rax
+setle al
+movzx rax,al
+test rax,rax
+jz else_label_9
+;	if size + 8 <= 2048:
+source_line_44:
+mov rax,[rsp+8]
+mov rax,0
+mov [rsp+8],rax
+;		size_class = 0
+source_line_45:
+while_start_2:
+mov rax,[rsp+0]
+push rax
+mov rax,[rsp+40]
+push rax
+mov rax,8
+pop rbx
+add rax,rbx
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz while_end_2
+;		while block_size < size + 8:
+source_line_46:
+mov rax,[rsp+0]
+mov rax,[rsp+0]
+push rax
+mov rax,2
+pop rbx
+imul rax,rbx
+mov [rsp+0],rax
+;			block_size = block_size * 2
+source_line_47:
+mov rax,[rsp+8]
+mov rax,[rsp+8]
+push rax
+mov rax,1
+pop rbx
+add rax,rbx
+mov [rsp+8],rax
+;			size_class = size_class + 1
+source_line_48:
+jmp while_start_2
+while_end_2:
+source_line_49:
+jmp end_if_label_9
+else_label_9:
+end_if_label_9:
+mov rax,[rsp+8]
+push rax
+mov rax,8
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz else_label_10
+;	if size_class < 8:
+source_line_50:
+mov rax,[rsp+16]
+mov rax,[rsp+8]
+mov rax,[runtime_free_lists+rax*8]
+mov [rsp+16],rax
+;		block = runtime_free_lists[size_class]
+source_line_51:
+mov rax,[rsp+16]
+test rax,rax
+jz else_label_11
+;		if block:
+source_line_52:
+mov rax,[rsp+8]
+push rax
+mov rbx,[rsp+24]
+mov rax,[rbx]
+pop rbx
+mov [runtime_free_lists+rbx*8],rax
+;			runtime_free_lists[size_class] = block[0]
+source_line_53:
+mov rax,[rsp+16]
+add rsp,24
+ret
+;			return block
+source_line_54:
+jmp end_if_label_11
+else_label_11:
+end_if_label_11:
+jmp end_if_label_10
+else_label_10:
+;	else:
+source_line_55:
+mov rax,[rsp+0]
+mov rax,[rsp+32]
+push rax
+mov rax,8
+pop rbx
+add rax,rbx
+push rax
+mov rax,15
+pop rbx
+add rax,rbx
+push rax
+mov rax,16
+mov rbx,rax
+pop rax
+cqo
+idiv rbx
+push rax
+mov rax,16
+pop rbx
+imul rax,rbx
+mov [rsp+0],rax
+;		block_size = (size + 8 + 15) / 16 * 16
+source_line_56:
+mov rax,[rsp+16]
+mov rax,[rsp+0]
+push rax
+call runtime_large_block
+add rsp,8
+mov [rsp+16],rax
+;		block = runtime_large_block(block_size)
+source_line_57:
+mov rax,[rsp+16]
+test rax,rax
+jz else_label_12
+;		if block:
+source_line_58:
+mov rax,[rsp+16]
+add rsp,24
+ret
+;			return block
+source_line_59:
+jmp end_if_label_12
+else_label_12:
+end_if_label_12:
+end_if_label_10:
+mov rax,[rsp+0]
+push rax
+mov rax,[runtime_heap_end]
+push rax
+mov rax,[runtime_heap_top]
+pop rbx
+sub rbx,rax
+mov rax,rbx
+pop rbx
+cmp rbx,rax
+seta al
+movzx rax,al
+test rax,rax
+jz else_label_13
+;	if block_size > runtime_heap_end - runtime_heap_top:
+source_line_60:
+mov rax,[rsp+0]
+push rax
+call runtime_grow
+add rsp,8
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+sete al
+movzx rax,al
+test rax,rax
+jz else_label_14
+;		if runtime_grow(block_size) == 0:
+source_line_61:
+mov rax,0
+add rsp,24
+ret
+;			return 0
+source_line_62:
+jmp end_if_label_14
+else_label_14:
+end_if_label_14:
+jmp end_if_label_13
+else_label_13:
+end_if_label_13:
+mov rax,[rsp+16]
+mov rax,[runtime_heap_top]
+push rax
+mov rax,8
+pop rbx
+add rax,rbx
+mov [rsp+16],rax
+;	block = runtime_heap_top + 8
+source_line_63:
+mov rax,[runtime_heap_top]
+mov rax,[runtime_heap_top]
+push rax
+mov rax,[rsp+8]
+pop rbx
+add rax,rbx
+mov [runtime_heap_top],rax
+;	runtime_heap_top = runtime_heap_top + block_size
+source_line_64:
+mov rax,[rsp+0]
+mov rcx,[rsp+16]
+mov [rcx+-8],rax
+;	block[-1] = block_size
+source_line_65:
+mov rax,[rsp+16]
+add rsp,24
+ret
+;
+source_line_66:
+free:
+;int free(int* block):
+source_line_67:
+mov rax,[rsp+8]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+sete al
+movzx rax,al
+test rax,rax
+jz else_label_15
+;	if block == 0:
+source_line_68:
+mov rax,0
+ret
+;		return 0
+source_line_69:
+jmp end_if_label_15
+else_label_15:
+end_if_label_15:
+mov rax,0
+push rax
+;	int size_class = 0
+source_line_70:
+mov rax,16
+push rax
+;	int class_size = 16
+source_line_71:
+while_start_3:
+mov rax,[rsp+0]
+push rax
+mov rbx,[rsp+32]
+mov rax,[rbx+-8]
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz while_end_3
+;	while class_size < block[-1]:
+source_line_72:
+mov rax,[rsp+0]
+mov rax,[rsp+0]
+push rax
+mov rax,2
+pop rbx
+imul rax,rbx
+mov [rsp+0],rax
+;		class_size = class_size * 2
+source_line_73:
+mov rax,[rsp+8]
+mov rax,[rsp+8]
+push rax
+mov rax,1
+pop rbx
+add rax,rbx
+mov [rsp+8],rax
+;		size_class = size_class + 1
+source_line_74:
+jmp while_start_3
+while_end_3:
+source_line_75:
+mov rax,[rsp+8]
+push rax
+mov rax,8
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+test rax,rax
+jz else_label_16
+;	if size_class < 8:
+source_line_76:
+mov rax,[rsp+8]
+mov rax,[runtime_free_lists+rax*8]
+mov rcx,[rsp+24]
+mov [rcx],rax
+;		block[0] = runtime_free_lists[size_class]
+source_line_77:
+mov rax,[rsp+8]
+push rax
+mov rax,[rsp+32]
+pop rbx
+mov [runtime_free_lists+rbx*8],rax
+;		runtime_free_lists[size_class] = block
+source_line_78:
+jmp end_if_label_16
+else_label_16:
+;	else:
+source_line_79:
+mov rax,[runtime_large_blocks]
+mov rcx,[rsp+24]
+mov [rcx],rax
+;		block[0] = runtime_large_blocks
+source_line_80:
+mov rax,[runtime_large_blocks]
+mov rax,[rsp+24]
+mov [runtime_large_blocks],rax
+;		runtime_large_blocks = block
+source_line_81:
+end_if_label_16:
+mov rax,0
+add rsp,16
+ret
+;
+source_line_82:
+flush:
+;int flush(int fd):
+source_line_83:
+mov rax,[rsp+8]
+mov rax,[runtime_output_length+rax*8]
+push rax
+;	int length = runtime_output_length[fd]
+source_line_84:
+mov rax,[rsp+0]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+setg al
+movzx rax,al
+test rax,rax
+jz else_label_17
+;	if length > 0:
+source_line_85:
+mov rax,1
+push rax
+mov rax,[rsp+24]
+push rax
+mov rax,[rsp+32]
+push rax
+mov rax,4096
+pop rbx
+imul rax,rbx
+lea rax,[runtime_output+rax*1]
+push rax
+mov rax,[rsp+24]
+push rax
+call syscall4
+add rsp,32
+;		syscall4(4, fd, &runtime_output[fd * 4096], length)
+source_line_86:
+mov rax,[rsp+16]
+push rax
+mov rax,0
+pop rbx
+mov [runtime_output_length+rbx*8],rax
+;		runtime_output_length[fd] = 0
+source_line_87:
+jmp end_if_label_17
+else_label_17:
+end_if_label_17:
+mov rax,0
+add rsp,8
+ret
+;
+source_line_88:
+runtime_flush:
+;int runtime_flush():
+source_line_89:
+mov rax,1
+push rax
+call flush
+add rsp,8
+;	flush(1)
+source_line_90:
+mov rax,2
+push rax
+call flush
+add rsp,8
+;	flush(2)
+source_line_91:
+mov rax,0
+push rax
+call flush
+add rsp,8
+;	flush(0)
+source_line_92:
+mov rax,0
+ret
+;# Ends the program with code after writing out buffered output
+source_line_93:
+exit:
+;int exit(int code):
+source_line_94:
+call runtime_flush
+;	runtime_flush()
+source_line_95:
+mov rax,60
+push rax
+mov rax,[rsp+16]
+push rax
+mov rax,0
+push rax
+mov rax,0
+push rax
+call syscall4
+add rsp,32
+ret
+;
+source_line_96:
+write_char:
+;int write_char(int fd, int c):
+source_line_97:
+mov rax,[rsp+16]
+push rax
+mov rax,2
+pop rbx
+cmp rbx,rax
+setg al
+movzx rax,al
+test rax,rax
+jz else_label_18
+;	if fd > 2:
+source_line_98:
+mov rax,1
+push rax
+mov rax,[rsp+24]
+push rax
+lea rax,[rsp+24]
+push rax
+mov rax,1
+push rax
+call syscall4
+add rsp,32
+ret
+;		return syscall4(4, fd, &c, 1)
+source_line_99:
+jmp end_if_label_18
+else_label_18:
+end_if_label_18:
+mov rax,[rsp+16]
+mov rax,[runtime_output_length+rax*8]
+push rax
+mov rax,4096
+pop rbx
+cmp rbx,rax
+sete al
+movzx rax,al
+test rax,rax
+jz else_label_19
+;	if runtime_output_length[fd] == 4096:
+source_line_100:
+mov rax,[rsp+16]
+push rax
+call flush
+add rsp,8
+;		flush(fd)
+source_line_101:
+jmp end_if_label_19
+else_label_19:
+end_if_label_19:
+mov rax,[rsp+16]
+push rax
+mov rax,4096
+pop rbx
+imul rax,rbx
+push rax
+mov rax,[rsp+24]
+mov rax,[runtime_output_length+rax*8]
+pop rbx
+add rax,rbx
+push rax
+mov rax,[rsp+16]
+pop rbx
+mov [runtime_output+rbx*1],al
+;	runtime_output[fd * 4096 + runtime_output_length[fd]] = c
+source_line_102:
+mov rax,[rsp+16]
+push rax
+mov rax,[rsp+24]
+mov rax,[runtime_output_length+rax*8]
+push rax
+mov rax,1
+pop rbx
+add rax,rbx
+pop rbx
+mov [runtime_output_length+rbx*8],rax
+;	runtime_output_length[fd] = runtime_output_length[fd] + 1
+source_line_103:
+mov rax,1
+ret
+;
+source_line_104:
+write_str:
+;int write_str(int fd, char* str):
+source_line_105:
+mov rax,0
+push rax
+;	int length = 0
+source_line_106:
+while_start_4:
+mov rax,[rsp+0]
+mov rbx,[rsp+16]
+movsx rax,byte [rbx+rax*1]
+test rax,rax
+jz while_end_4
+;	while str[length]:
+source_line_107:
+mov rax,[rsp+0]
+mov rax,[rsp+0]
+push rax
+mov rax,1
+pop rbx
+add rax,rbx
+mov [rsp+0],rax
+;		length = length + 1
+source_line_108:
+jmp while_start_4
+while_end_4:
+source_line_109:
+mov rax,[rsp+24]
+push rax
+mov rax,2
+pop rbx
+cmp rbx,rax
+setg al
+movzx rax,al
+test rax,rax
+jz else_label_20
+;	if fd > 2:
+source_line_110:
+mov rax,1
+push rax
+mov rax,[rsp+32]
+push rax
+mov rax,[rsp+32]
+push rax
+mov rax,[rsp+24]
+push rax
+call syscall4
+add rsp,32
+add rsp,8
+ret
+;		return syscall4(4, fd, str, length)
+source_line_111:
+jmp end_if_label_20
+else_label_20:
+end_if_label_20:
+mov rax,[rsp+24]
+mov rax,[runtime_output_length+rax*8]
+push rax
+mov rax,[rsp+8]
+pop rbx
+add rax,rbx
+push rax
+mov rax,4096
+pop rbx
+cmp rbx,rax
+setg al
+movzx rax,al
+test rax,rax
+jz else_label_21
+;	if runtime_output_length[fd] + length > 4096:
+source_line_112:
+mov rax,[rsp+24]
+push rax
+call flush
+add rsp,8
+;		flush(fd)
+source_line_113:
+jmp end_if_label_21
+else_label_21:
+end_if_label_21:
+mov rax,[rsp+0]
+push rax
+mov rax,4096
+pop rbx
+cmp rbx,rax
+setge al
+movzx rax,al
+test rax,rax
+jz else_label_22
+;	if length >= 4096:
+source_line_114:
+mov rax,1
+push rax
+mov rax,[rsp+32]
+push rax
+mov rax,[rsp+32]
+push rax
+mov rax,[rsp+24]
+push rax
+call syscall4
+add rsp,32
+add rsp,8
+ret
+;		return syscall4(4, fd, str, length)
+source_line_115:
+jmp end_if_label_22
+else_label_22:
+end_if_label_22:
+mov rax,[rsp+24]
+push rax
+mov rax,4096
+pop rbx
+imul rax,rbx
+push rax
+mov rax,[rsp+32]
+mov rax,[runtime_output_length+rax*8]
+pop rbx
+add rax,rbx
+lea rax,[runtime_output+rax*1]
+push rax
+mov rax,[rsp+24]
+push rax
+mov rax,[rsp+16]
+push rax
+call memcpy
+add rsp,24
+;	memcpy(&runtime_output[fd * 4096 + runtime_output_length[fd]], str, length)
+source_line_116:
+mov rax,[rsp+24]
+push rax
+mov rax,[rsp+32]
+mov rax,[runtime_output_length+rax*8]
+push rax
+mov rax,[rsp+16]
+pop rbx
+add rax,rbx
+pop rbx
+mov [runtime_output_length+rbx*8],rax
+;	runtime_output_length[fd] = runtime_output_length[fd] + length
+source_line_117:
+mov rax,[rsp+0]
+add rsp,8
+ret
+;
+source_line_118:
+write_int:
+;int write_int(int fd, int n):
+source_line_119:
+push 0
+push 0
+push 0
+mov rax,[rsp+32]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+setl al
+movzx rax,al
+push rax
+;	# positive counterpart
+source_line_120:
+mov rax,[rsp+40]
+push rax
+mov rax,0
+pop rbx
+cmp rbx,rax
+setg al
+movzx rax,al
+test rax,rax
+jz else_label_23
+;	if n > 0:
+source_line_121:
+mov rax,[rsp+40]
+mov rax,0
+push rax
+mov rax,[rsp+48]
+pop rbx
+sub rbx,rax
+mov rax,rbx
+mov [rsp+40],rax
+;		n = 0 - n
+source_line_122:
+jmp end_if_label_23
+else_label_23:
+end_if_label_23:
+mov rax,0
+mov [rsp+31],al
+;	digits[23] = 0
+source_line_123:
+mov rax,22
+push rax
+;	int i = 22
+source_line_124:
+mov rax,[rsp+0]
+push rax
+mov rax,48
+push rax
+mov rax,[rsp+64]
+push rax
+mov rax,10
+mov rbx,rax
+pop rax
+cqo
+idiv rbx
+mov rax,rdx
+pop rbx
+sub rbx,rax
+mov rax,rbx
+pop rbx
+mov [rsp+16+rbx*1],al
+;	digits[i] = 48 - n % 10
+source_line_125:
+mov rax,[rsp+48]
+mov rax,[rsp+48]
+push rax
+mov rax,10
+mov rbx,rax
+pop rax
+cqo
+idiv rbx
+mov [rsp+48],rax
+;	n = n / 10
+source_line_126:
+while_start_5:
+mov rax,[rsp+48]
+test rax,rax
+jz while_end_5
+;	while n:
+source_line_127:
+mov rax,[rsp+0]
+mov rax,[rsp+0]
+push rax
+mov rax,1
+pop rbx
+sub rbx,rax
+mov rax,rbx
+mov [rsp+0],rax
+;		i = i - 1
+source_line_128:
+mov rax,[rsp+0]
+push rax
+mov rax,48
+push rax
+mov rax,[rsp+64]
+push rax
+mov rax,10
+mov rbx,rax
+pop rax
+cqo
+idiv rbx
+mov rax,rdx
+pop rbx
+sub rbx,rax
+mov rax,rbx
+pop rbx
+mov [rsp+16+rbx*1],al
+;		digits[i] = 48 - n % 10
+source_line_129:
+mov rax,[rsp+48]
+mov rax,[rsp+48]
+push rax
+mov rax,10
+mov rbx,rax
+pop rax
+cqo
+idiv rbx
+mov [rsp+48],rax
+;		n = n / 10
+source_line_130:
+jmp while_start_5
+while_end_5:
+source_line_131:
+mov rax,[rsp+8]
+test rax,rax
+jz else_label_24
+;	if negative:
+source_line_132:
+mov rax,[rsp+0]
+mov rax,[rsp+0]
+push rax
+mov rax,1
+pop rbx
+sub rbx,rax
+mov rax,rbx
+mov [rsp+0],rax
+;		i = i - 1
+source_line_133:
+mov rax,[rsp+0]
+push rax
+mov rax,45
+pop rbx
+mov [rsp+16+rbx*1],al
+;		digits[i] = 45
+source_line_134:
+jmp end_if_label_24
+else_label_24:
+end_if_label_24:
+mov rax,[rsp+56]
+push rax
+mov rax,[rsp+8]
+lea rax,[rsp+24+rax*1]
+push rax
+call write_str
+add rsp,16
+add rsp,40
+ret
+;# "function calls cycles self_cycles" lines
+source_line_135:
+runtime_profile_dump:
+;int runtime_profile_dump():
+source_line_136:
+push 0
+push 0
+push 0
+mov rax,0
+mov [rsp+23],al
+;	digits[23] = 0
+source_line_137:
+mov rax,2
+push rax
+call $ + 40
+db "function", 09h, "calls", 09h, "cycles", 09h, "self_cycles", 0ah, 0
+pop rax
+push rax
+call write_str
+add rsp,16
+;	write_str(2, "function\tcalls\tcycles\tself_cycles\n")
+source_line_138:
+lea rax,[runtime_profile+8]
+push rax
+;	int* record = &runtime_profile[1]
+source_line_139:
+push 0
+mov rax,[runtime_profile]
+push rax
+push 1
+for_start_1:
+mov rax,[rsp+16]
+mov rbx,[rsp+8]
+cmp rax,rbx
+je for_end_1
+;	for int i in range(runtime_profile[0]):
+source_line_140:
+mov rax,2
+push rax
+mov rbx,[rsp+32]
+mov rax,[rbx]
+push rax
+call write_str
+add rsp,16
+;		write_str(2, record[0])
+source_line_141:
+mov rax,2
+push rax
+mov rax,9
+push rax
+call write_char
+add rsp,16
+;		write_char(2, 9)
+source_line_142:
+mov rax,2
+push rax
+lea rax,[rsp+63]
+push rax
+mov rbx,[rsp+40]
+lea rax,[rbx+8]
+push rax
+call runtime_counter_digits
+add rsp,16
+push rax
+call write_str
+add rsp,16
+;		write_str(2, runtime_counter_digits(&digits[23], &record[1]))
+source_line_143:
+mov rax,2
+push rax
+mov rax,9
+push rax
+call write_char
+add rsp,16
+;		write_char(2, 9)
+source_line_144:
+mov rax,2
+push rax
+lea rax,[rsp+63]
+push rax
+mov rbx,[rsp+40]
+lea rax,[rbx+24]
+push rax
+call runtime_counter_digits
+add rsp,16
+push rax
+call write_str
+add rsp,16
+;		write_str(2, runtime_counter_digits(&digits[23], &record[3]))
+source_line_145:
+mov rax,2
+push rax
+mov rax,9
+push rax
+call write_char
+add rsp,16
+;		write_char(2, 9)
+source_line_146:
+mov rax,2
+push rax
+lea rax,[rsp+63]
+push rax
+mov rbx,[rsp+40]
+lea rax,[rbx+40]
+push rax
+call runtime_counter_digits
+add rsp,16
+push rax
+call write_str
+add rsp,16
+;		write_str(2, runtime_counter_digits(&digits[23], &record[5]))
+source_line_147:
+mov rax,2
+push rax
+mov rax,10
+push rax
+call write_char
+add rsp,16
+;		write_char(2, 10)
+source_line_148:
+mov rax,[rsp+24]
+mov rbx,[rsp+24]
+lea rax,[rbx+56]
+mov [rsp+24],rax
+;		record = &record[7]
+source_line_149:
+mov rax,[rsp+0]
+add [rsp+16],rax
+jmp for_start_1
+for_end_1:
+add rsp,24
+source_line_150:
+mov rax,0
+add rsp,32
+ret
+;	return 0
+source_line_151:
+;struct pair:
+source_line_152:
+main:
+;int main():
+source_line_153:
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+mov rax,4
+push rax
+push 1
+for_start_2:
+mov rax,[rsp+16]
+mov rbx,[rsp+8]
+cmp rax,rbx
+je for_end_2
+;	for int i in range(4):
+source_line_154:
+mov rax,[rsp+16]
+imul rax,rax,24
+push rax
+mov rax,[rsp+24]
+pop rbx
+mov [rsp+56+rbx*1],rax
+;		pairs[i].key = i
+source_line_155:
+mov rax,[rsp+16]
+imul rax,rax,24
+push rax
+mov rax,[rsp+24]
+push rax
+mov rax,10
+pop rbx
+imul rax,rbx
+pop rbx
+mov [rsp+72+rbx*1],rax
+;		pairs[i].value = i * 10
+source_line_156:
+mov rax,[rsp+16]
+push rax
+mov rax,[rsp+24]
+push rax
+mov rax,1
+pop rbx
+add rax,rbx
+pop rbx
+mov [rsp+24+rbx*8],rax
+;		arr[i] = i + 1
+source_line_157:
+mov rax,[rsp+0]
+add [rsp+16],rax
+jmp for_start_2
+for_end_2:
+add rsp,24
+source_line_158:
+lea rax,[rsp+8]
+push rax
+;	int* p = &arr[1]
+source_line_159:
+mov rax,40
+mov rcx,[rsp+0]
+mov [rcx+16],rax
+;	p[2] = 40
+source_line_160:
+mov rax,7
+mov [rsp+96],al
+;	pairs[2].tag = 7
+source_line_161:
+mov rax,[rsp+128]
+push rax
+mov rax,[rsp+120]
+push rax
+mov rax,10
+pop rbx
+imul rax,rbx
+pop rbx
+sub rbx,rax
+mov rax,rbx
+push rax
+mov rax,[rsp+112]
+pop rbx
+add rax,rbx
+push rax
+mov rax,20
+pop rbx
+sub rbx,rax
+mov rax,rbx
+push rax
+mov rax,[rsp+40]
+pop rbx
+add rax,rbx
+push rax
+mov rbx,[rsp+8]
+mov rax,[rbx+16]
+pop rbx
+sub rbx,rax
+mov rax,rbx
+push rax
+movsx rax,byte [rsp+104]
+pop rbx
+add rax,rbx
+push rax
+mov rax,7
+pop rbx
+sub rbx,rax
+mov rax,rbx
+add rsp,136
+ret
+;	return pairs[3].value - pairs[3].key * 10 + pairs[2].value - 20 + arr[3] - p[2] + pairs[2].tag - 7
+source_line_162:
+
+segment readable
+
+align 4
+w_line_table db 'WLINES', 0, 0
+dd 162
+dd source_line_1, source_line_2, source_line_3, source_line_4, source_line_5, source_line_6, source_line_7, source_line_8, source_line_9, source_line_10, source_line_11, source_line_12, source_line_13, source_line_14, source_line_15, source_line_16
+dd source_line_17, source_line_18, source_line_19, source_line_20, source_line_21, source_line_22, source_line_23, source_line_24, source_line_25, source_line_26, source_line_27, source_line_28, source_line_29, source_line_30, source_line_31, source_line_32
+dd source_line_33, source_line_34, source_line_35, source_line_36, source_line_37, source_line_38, source_line_39, source_line_40, source_line_41, source_line_42, source_line_43, source_line_44, source_line_45, source_line_46, source_line_47, source_line_48
+dd source_line_49, source_line_50, source_line_51, source_line_52, source_line_53, source_line_54, source_line_55, source_line_56, source_line_57, source_line_58, source_line_59, source_line_60, source_line_61, source_line_62, source_line_63, source_line_64
+dd source_line_65, source_line_66, source_line_67, source_line_68, source_line_69, source_line_70, source_line_71, source_line_72, source_line_73, source_line_74, source_line_75, source_line_76, source_line_77, source_line_78, source_line_79, source_line_80
+dd source_line_81, source_line_82, source_line_83, source_line_84, source_line_85, source_line_86, source_line_87, source_line_88, source_line_89, source_line_90, source_line_91, source_line_92, source_line_93, source_line_94, source_line_95, source_line_96
+dd source_line_97, source_line_98, source_line_99, source_line_100, source_line_101, source_line_102, source_line_103, source_line_104, source_line_105, source_line_106, source_line_107, source_line_108, source_line_109, source_line_110, source_line_111, source_line_112
+dd source_line_113, source_line_114, source_line_115, source_line_116, source_line_117, source_line_118, source_line_119, source_line_120, source_line_121, source_line_122, source_line_123, source_line_124, source_line_125, source_line_126, source_line_127, source_line_128
+dd source_line_129, source_line_130, source_line_131, source_line_132, source_line_133, source_line_134, source_line_135, source_line_136, source_line_137, source_line_138, source_line_139, source_line_140, source_line_141, source_line_142, source_line_143, source_line_144
+dd source_line_145, source_line_146, source_line_147, source_line_148, source_line_149, source_line_150, source_line_151, source_line_152, source_line_153, source_line_154, source_line_155, source_line_156, source_line_157, source_line_158, source_line_159, source_line_160
+dd source_line_161, source_line_162
+
+segment readable writeable
+
+align 8
+runtime_profile dq 0
+
+segment readable writeable
+
+align 8
+runtime_heap_top rb 8
+align 8
+runtime_heap_end rb 8
+align 8
+runtime_free_lists rb 64
+align 8
+runtime_large_blocks rb 8
+align 8
+runtime_output_length rb 24
+align 8
+runtime_output rb 12288
\ No newline at end of file
@@ -0,0 +1,1661 @@
+format ELF executable 3
+entry _main
+
+segment readable executable
+
+syscall1:
+mov eax,[esp+4]
+int 0x80
+ret
+syscall4:
+mov eax,[esp+16]
+mov ebx,[esp+12]
+mov ecx,[esp+8]
+mov edx,[esp+4]
+int 0x80
+ret
+syscall5:
+mov eax,[esp+20]
+mov ebx,[esp+16]
+mov ecx,[esp+12]
+mov edx,[esp+8]
+mov esi,[esp+4]
+int 0x80
+ret
+
+_main:
+call main
+push eax
+call runtime_profile_dump
+call runtime_flush
+pop eax
+mov ebx,eax
+mov eax,1
+int 0x80
+
+memset:
+push edi
+mov edi,[esp+16]
+movzx eax,byte [esp+12]
+mov edx,0x01010101
+imul eax,edx
+mov ecx,[esp+8]
+mov edx,ecx
+shr ecx,2
+rep stosd
+mov ecx,edx
+and ecx,3
+rep stosb
+pop edi
+mov eax,[esp+12]
+ret
+memcpy:
+push esi
+push edi
+mov edi,[esp+20]
+mov esi,[esp+16]
+mov ecx,[esp+12]
+mov edx,ecx
+shr ecx,2
+rep movsd
+mov ecx,edx
+and ecx,3
+rep movsb
+pop edi
+pop esi
+mov eax,[esp+12]
+ret
+runtime_counter_digits:
+push esi
+mov ecx,[esp+12]
+mov esi,[esp+8]
+mov eax,[esi]
+mov edx,[esi+4]
+mov ebx,10
+runtime_counter_digits_loop:
+mov esi,eax
+mov eax,edx
+xor edx,edx
+div ebx
+xchg eax,esi
+div ebx
+add dl,48
+dec ecx
+mov [ecx],dl
+mov edx,esi
+or esi,eax
+jnz runtime_counter_digits_loop
+mov eax,ecx
+pop esi
+ret
+
+;uint runtime_heap_top
+;# free lists of size class i, blocks of 16 << i bytes
+;# free list of blocks larger than 2048 bytes
+;# bytes in the output buffer of file descriptors 0 to 2
+;int[3] runtime_output_length
+;# Grows the heap by at least size bytes, the break is moved in large chunks
+runtime_grow:
+;int runtime_grow(int size):
+mov eax,65536
+push eax
+;	uint chunk = 65536
+mov eax,[esp+0]
+push eax
+mov eax,[esp+12]
+pop ebx
+cmp ebx,eax
+setb al
+movzx eax,al
+test eax,eax
+jz else_label_1
+;	if chunk < size:
+mov eax,[esp+0]
+mov eax,[esp+8]
+mov [esp+0],eax
+;		chunk = size
+jmp end_if_label_1
+else_label_1:
+end_if_label_1:
+mov eax,[runtime_heap_end]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+sete al
+movzx eax,al
+test eax,eax
+jz else_label_2
+;	if runtime_heap_end == 0:
+mov eax,[runtime_heap_end]
+mov eax,45
+push eax
+mov eax,0
+push eax
+mov eax,0
+push eax
+mov eax,0
+push eax
+call syscall4
+add esp,16
+mov [runtime_heap_end],eax
+;		runtime_heap_end = syscall4(45, 0, 0, 0)
+mov eax,[runtime_heap_top]
+mov eax,[runtime_heap_end]
+mov [runtime_heap_top],eax
+;		runtime_heap_top = runtime_heap_end
+jmp end_if_label_2
+else_label_2:
+end_if_label_2:
+mov eax,[runtime_heap_end]
+push eax
+mov eax,[esp+4]
+pop ebx
+add eax,ebx
+mov [esp+0],eax
+;	uint wanted = runtime_heap_end + chunk
+mov eax,[esp+0]
+push eax
+mov eax,[runtime_heap_end]
+pop ebx
+cmp ebx,eax
+setb al
+movzx eax,al
+test eax,eax
+jz else_label_3
+;	if wanted < runtime_heap_end:
+mov eax,0
+add esp,4
+ret
+;	# brk returns the old break when it fails
+jmp end_if_label_3
+else_label_3:
+end_if_label_3:
+mov eax,45
+push eax
+mov eax,[esp+4]
+push eax
+mov eax,0
+push eax
+mov eax,0
+push eax
+call syscall4
+add esp,16
+push eax
+;	uint end = syscall4(45, wanted, 0, 0)
+mov eax,[esp+0]
+push eax
+mov eax,[esp+8]
+pop ebx
+cmp ebx,eax
+setb al
+movzx eax,al
+test eax,eax
+jz else_label_4
+;	if end < wanted:
+mov eax,0
+add esp,8
+ret
+;		return 0
+jmp end_if_label_4
+else_label_4:
+end_if_label_4:
+mov eax,[runtime_heap_end]
+mov eax,[esp+0]
+mov [runtime_heap_end],eax
+;	runtime_heap_end = end
+mov eax,1
+add esp,8
+ret
+;# Takes the first block of at least size bytes from the large block list
+runtime_large_block:
+;int runtime_large_block(int size):
+mov eax,0
+push eax
+;	int* previous = 0
+mov eax,[runtime_large_blocks]
+push eax
+;	int* block = runtime_large_blocks
+while_start_1:
+mov eax,[esp+0]
+test eax,eax
+jz while_end_1
+;	while block:
+mov ebx,[esp+0]
+mov eax,[ebx+-4]
+push eax
+mov eax,[esp+16]
+pop ebx
+cmp ebx,eax
+setge al
+movzx eax,al
+test eax,eax
+jz else_label_5
+;		if block[-1] >= size:
+mov eax,[esp+4]
+test eax,eax
+jz else_label_6
+;			if previous:
+mov ebx,[esp+0]
+mov eax,[ebx]
+mov ecx,[esp+4]
+mov [ecx],eax
+;				previous[0] = block[0]
+jmp end_if_label_6
+else_label_6:
+;			else:
+mov eax,[runtime_large_blocks]
+mov ebx,[esp+0]
+mov eax,[ebx]
+mov [runtime_large_blocks],eax
+;				runtime_large_blocks = block[0]
+end_if_label_6:
+mov eax,[esp+0]
+add esp,8
+ret
+;			return block
+jmp end_if_label_5
+else_label_5:
+end_if_label_5:
+mov eax,[esp+4]
+mov eax,[esp+0]
+mov [esp+4],eax
+;		previous = block
+mov eax,[esp+0]
+mov ebx,[esp+0]
+mov eax,[ebx]
+mov [esp+0],eax
+;		block = block[0]
+jmp while_start_1
+while_end_1:
+mov eax,0
+add esp,8
+ret
+;
+malloc:
+;	# Negative sizes and ones that overflow with the header and rounding
+mov eax,[esp+4]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz else_label_7
+;	if size < 0:
+mov eax,0
+ret
+;		return 0
+jmp end_if_label_7
+else_label_7:
+end_if_label_7:
+mov eax,[esp+4]
+push eax
+mov eax,8
+pop ebx
+add eax,ebx
+push eax
+mov eax,15
+pop ebx
+add eax,ebx
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz else_label_8
+;	if size + 8 + 15 < 0:
+mov eax,0
+ret
+;		return 0
+jmp end_if_label_8
+else_label_8:
+end_if_label_8:
+mov eax,0
+push eax
+;	int* block = 0
+mov eax,8
+push eax
+;	int size_class = 8
+mov eax,16
+push eax
+;	int block_size = 16
+mov eax,[esp+16]
+push eax
+mov eax,8
+pop ebx
+add eax,ebx
+push eax
+mov eax,2048
+pop ebx
+cmp ebx,eax
+setle al
+movzx eax,al
+test eax,eax
+jz else_label_9
+;	if size + 8 <= 2048:
+mov eax,[esp+4]
+mov eax,0
+mov [esp+4],eax
+;		size_class = 0
+while_start_2:
+mov eax,[esp+0]
+push eax
+mov eax,[esp+20]
+push eax
+mov eax,8
+pop ebx
+add eax,ebx
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz while_end_2
+;		while block_size < size + 8:
+mov eax,[esp+0]
+mov eax,[esp+0]
+push eax
+mov eax,2
+pop ebx
+imul eax,ebx
+mov [esp+0],eax
+;			block_size = block_size * 2
+mov eax,[esp+4]
+mov eax,[esp+4]
+push eax
+mov eax,1
+pop ebx
+add eax,ebx
+mov [esp+4],eax
+;			size_class = size_class + 1
+jmp while_start_2
+while_end_2:
+jmp end_if_label_9
+else_label_9:
+end_if_label_9:
+mov eax,[esp+4]
+push eax
+mov eax,8
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz else_label_10
+;	if size_class < 8:
+mov eax,[esp+8]
+mov eax,[esp+4]
+mov eax,[runtime_free_lists+eax*4]
+mov [esp+8],eax
+;		block = runtime_free_lists[size_class]
+mov eax,[esp+8]
+test eax,eax
+jz else_label_11
+;		if block:
+mov eax,[esp+4]
+push eax
+mov ebx,[esp+12]
+mov eax,[ebx]
+pop ebx
+mov [runtime_free_lists+ebx*4],eax
+;			runtime_free_lists[size_class] = block[0]
+mov eax,[esp+8]
+add esp,12
+ret
+;			return block
+jmp end_if_label_11
+else_label_11:
+end_if_label_11:
+jmp end_if_label_10
+else_label_10:
+;	else:
+mov eax,[esp+0]
+mov eax,[esp+16]
+push eax
+mov eax,8
+pop ebx
+add eax,ebx
+push eax
+mov eax,15
+pop ebx
+add eax,ebx
+push eax
+mov eax,16
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+push eax
+mov eax,16
+pop ebx
+imul eax,ebx
+mov [esp+0],eax
+;		block_size = (size + 8 + 15) / 16 * 16
+mov eax,[esp+8]
+mov eax,[esp+0]
+push eax
+call runtime_large_block
+add esp,4
+mov [esp+8],eax
+;		block = runtime_large_block(block_size)
+mov eax,[esp+8]
+test eax,eax
+jz else_label_12
+;		if block:
+mov eax,[esp+8]
+add esp,12
+ret
+;			return block
+jmp end_if_label_12
+else_label_12:
+end_if_label_12:
+end_if_label_10:
+mov eax,[esp+0]
+push eax
+mov eax,[runtime_heap_end]
+push eax
+mov eax,[runtime_heap_top]
+pop ebx
+sub ebx,eax
+mov eax,ebx
+pop ebx
+cmp ebx,eax
+seta al
+movzx eax,al
+test eax,eax
+jz else_label_13
+;	if block_size > runtime_heap_end - runtime_heap_top:
+mov eax,[esp+0]
+push eax
+call runtime_grow
+add esp,4
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+sete al
+movzx eax,al
+test eax,eax
+jz else_label_14
+;		if runtime_grow(block_size) == 0:
+mov eax,0
+add esp,12
+ret
+;			return 0
+jmp end_if_label_14
+else_label_14:
+end_if_label_14:
+jmp end_if_label_13
+else_label_13:
+end_if_label_13:
+mov eax,[esp+8]
+mov eax,[runtime_heap_top]
+push eax
+mov eax,8
+pop ebx
+add eax,ebx
+mov [esp+8],eax
+;	block = runtime_heap_top + 8
+mov eax,[runtime_heap_top]
+mov eax,[runtime_heap_top]
+push eax
+mov eax,[esp+4]
+pop ebx
+add eax,ebx
+mov [runtime_heap_top],eax
+;	runtime_heap_top = runtime_heap_top + block_size
+mov eax,[esp+0]
+mov ecx,[esp+8]
+mov [ecx+-4],eax
+;	block[-1] = block_size
+mov eax,[esp+8]
+add esp,12
+ret
+;
+free:
+;int free(int* block):
+mov eax,[esp+4]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+sete al
+movzx eax,al
+test eax,eax
+jz else_label_15
+;	if block == 0:
+mov eax,0
+ret
+;		return 0
+jmp end_if_label_15
+else_label_15:
+end_if_label_15:
+mov eax,0
+push eax
+;	int size_class = 0
+mov eax,16
+push eax
+;	int class_size = 16
+while_start_3:
+mov eax,[esp+0]
+push eax
+mov ebx,[esp+16]
+mov eax,[ebx+-4]
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz while_end_3
+;	while class_size < block[-1]:
+mov eax,[esp+0]
+mov eax,[esp+0]
+push eax
+mov eax,2
+pop ebx
+imul eax,ebx
+mov [esp+0],eax
+;		class_size = class_size * 2
+mov eax,[esp+4]
+mov eax,[esp+4]
+push eax
+mov eax,1
+pop ebx
+add eax,ebx
+mov [esp+4],eax
+;		size_class = size_class + 1
+jmp while_start_3
+while_end_3:
+mov eax,[esp+4]
+push eax
+mov eax,8
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz else_label_16
+;	if size_class < 8:
+mov eax,[esp+4]
+mov eax,[runtime_free_lists+eax*4]
+mov ecx,[esp+12]
+mov [ecx],eax
+;		block[0] = runtime_free_lists[size_class]
+mov eax,[esp+4]
+push eax
+mov eax,[esp+16]
+pop ebx
+mov [runtime_free_lists+ebx*4],eax
+;		runtime_free_lists[size_class] = block
+jmp end_if_label_16
+else_label_16:
+;	else:
+mov eax,[runtime_large_blocks]
+mov ecx,[esp+12]
+mov [ecx],eax
+;		block[0] = runtime_large_blocks
+mov eax,[runtime_large_blocks]
+mov eax,[esp+12]
+mov [runtime_large_blocks],eax
+;		runtime_large_blocks = block
+end_if_label_16:
+mov eax,0
+add esp,8
+ret
+;
+flush:
+;int flush(int fd):
+mov eax,[esp+4]
+mov eax,[runtime_output_length+eax*4]
+push eax
+;	int length = runtime_output_length[fd]
+mov eax,[esp+0]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+setg al
+movzx eax,al
+test eax,eax
+jz else_label_17
+;	if length > 0:
+mov eax,4
+push eax
+mov eax,[esp+12]
+push eax
+mov eax,[esp+16]
+push eax
+mov eax,4096
+pop ebx
+imul eax,ebx
+lea eax,[runtime_output+eax*1]
+push eax
+mov eax,[esp+12]
+push eax
+call syscall4
+add esp,16
+;		syscall4(4, fd, &runtime_output[fd * 4096], length)
+mov eax,[esp+8]
+push eax
+mov eax,0
+pop ebx
+mov [runtime_output_length+ebx*4],eax
+;		runtime_output_length[fd] = 0
+jmp end_if_label_17
+else_label_17:
+end_if_label_17:
+mov eax,0
+add esp,4
+ret
+;
+runtime_flush:
+;int runtime_flush():
+mov eax,1
+push eax
+call flush
+add esp,4
+;	flush(1)
+mov eax,2
+push eax
+call flush
+add esp,4
+;	flush(2)
+mov eax,0
+push eax
+call flush
+add esp,4
+;	flush(0)
+mov eax,0
+ret
+;# Ends the program with code after writing out buffered output
+exit:
+;int exit(int code):
+call runtime_flush
+;	runtime_flush()
+mov eax,1
+push eax
+mov eax,[esp+8]
+push eax
+mov eax,0
+push eax
+mov eax,0
+push eax
+call syscall4
+add esp,16
+ret
+;
+write_char:
+;int write_char(int fd, int c):
+mov eax,[esp+8]
+push eax
+mov eax,2
+pop ebx
+cmp ebx,eax
+setg al
+movzx eax,al
+test eax,eax
+jz else_label_18
+;	if fd > 2:
+mov eax,4
+push eax
+mov eax,[esp+12]
+push eax
+lea eax,[esp+12]
+push eax
+mov eax,1
+push eax
+call syscall4
+add esp,16
+ret
+;		return syscall4(4, fd, &c, 1)
+jmp end_if_label_18
+else_label_18:
+end_if_label_18:
+mov eax,[esp+8]
+mov eax,[runtime_output_length+eax*4]
+push eax
+mov eax,4096
+pop ebx
+cmp ebx,eax
+sete al
+movzx eax,al
+test eax,eax
+jz else_label_19
+;	if runtime_output_length[fd] == 4096:
+mov eax,[esp+8]
+push eax
+call flush
+add esp,4
+;		flush(fd)
+jmp end_if_label_19
+else_label_19:
+end_if_label_19:
+mov eax,[esp+8]
+push eax
+mov eax,4096
+pop ebx
+imul eax,ebx
+push eax
+mov eax,[esp+12]
+mov eax,[runtime_output_length+eax*4]
+pop ebx
+add eax,ebx
+push eax
+mov eax,[esp+8]
+pop ebx
+mov [runtime_output+ebx*1],al
+;	runtime_output[fd * 4096 + runtime_output_length[fd]] = c
+mov eax,[esp+8]
+push eax
+mov eax,[esp+12]
+mov eax,[runtime_output_length+eax*4]
+push eax
+mov eax,1
+pop ebx
+add eax,ebx
+pop ebx
+mov [runtime_output_length+ebx*4],eax
+;	runtime_output_length[fd] = runtime_output_length[fd] + 1
+mov eax,1
+ret
+;
+write_str:
+;int write_str(int fd, char* str):
+mov eax,0
+push eax
+;	int length = 0
+while_start_4:
+mov eax,[esp+0]
+mov ebx,[esp+8]
+movsx eax,byte [ebx+eax*1]
+test eax,eax
+jz while_end_4
+;	while str[length]:
+mov eax,[esp+0]
+mov eax,[esp+0]
+push eax
+mov eax,1
+pop ebx
+add eax,ebx
+mov [esp+0],eax
+;		length = length + 1
+jmp while_start_4
+while_end_4:
+mov eax,[esp+12]
+push eax
+mov eax,2
+pop ebx
+cmp ebx,eax
+setg al
+movzx eax,al
+test eax,eax
+jz else_label_20
+;	if fd > 2:
+mov eax,4
+push eax
+mov eax,[esp+16]
+push eax
+mov eax,[esp+16]
+push eax
+mov eax,[esp+12]
+push eax
+call syscall4
+add esp,16
+add esp,4
+ret
+;		return syscall4(4, fd, str, length)
+jmp end_if_label_20
+else_label_20:
+end_if_label_20:
+mov eax,[esp+12]
+mov eax,[runtime_output_length+eax*4]
+push eax
+mov eax,[esp+4]
+pop ebx
+add eax,ebx
+push eax
+mov eax,4096
+pop ebx
+cmp ebx,eax
+setg al
+movzx eax,al
+test eax,eax
+jz else_label_21
+;	if runtime_output_length[fd] + length > 4096:
+mov eax,[esp+12]
+push eax
+call flush
+add esp,4
+;		flush(fd)
+jmp end_if_label_21
+else_label_21:
+end_if_label_21:
+mov eax,[esp+0]
+push eax
+mov eax,4096
+pop ebx
+cmp ebx,eax
+setge al
+movzx eax,al
+test eax,eax
+jz else_label_22
+;	if length >= 4096:
+mov eax,4
+push eax
+mov eax,[esp+16]
+push eax
+mov eax,[esp+16]
+push eax
+mov eax,[esp+12]
+push eax
+call syscall4
+add esp,16
+add esp,4
+ret
+;		return syscall4(4, fd, str, length)
+jmp end_if_label_22
+else_label_22:
+end_if_label_22:
+mov eax,[esp+12]
+push eax
+mov eax,4096
+pop ebx
+imul eax,ebx
+push eax
+mov eax,[esp+16]
+mov eax,[runtime_output_length+eax*4]
+pop ebx
+add eax,ebx
+lea eax,[runtime_output+eax*1]
+push eax
+mov eax,[esp+12]
+push eax
+mov eax,[esp+8]
+push eax
+call memcpy
+add esp,12
+;	memcpy(&runtime_output[fd * 4096 + runtime_output_length[fd]], str, length)
+mov eax,[esp+12]
+push eax
+mov eax,[esp+16]
+mov eax,[runtime_output_length+eax*4]
+push eax
+mov eax,[esp+8]
+pop ebx
+add eax,ebx
+pop ebx
+mov [runtime_output_length+ebx*4],eax
+;	runtime_output_length[fd] = runtime_output_length[fd] + length
+mov eax,[esp+0]
+add esp,4
+ret
+;
+write_int:
+;int write_int(int fd, int n):
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+mov eax,[esp+28]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+push eax
+;	# positive counterpart
+mov eax,[esp+32]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+setg al
+movzx eax,al
+test eax,eax
+jz else_label_23
+;	if n > 0:
+mov eax,[esp+32]
+mov eax,0
+push eax
+mov eax,[esp+36]
+pop ebx
+sub ebx,eax
+mov eax,ebx
+mov [esp+32],eax
+;		n = 0 - n
+jmp end_if_label_23
+else_label_23:
+end_if_label_23:
+mov eax,0
+mov [esp+27],al
+;	digits[23] = 0
+mov eax,22
+push eax
+;	int i = 22
+mov eax,[esp+0]
+push eax
+mov eax,48
+push eax
+mov eax,[esp+44]
+push eax
+mov eax,10
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+mov eax,edx
+pop ebx
+sub ebx,eax
+mov eax,ebx
+pop ebx
+mov [esp+8+ebx*1],al
+;	digits[i] = 48 - n % 10
+mov eax,[esp+36]
+mov eax,[esp+36]
+push eax
+mov eax,10
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+mov [esp+36],eax
+;	n = n / 10
+while_start_5:
+mov eax,[esp+36]
+test eax,eax
+jz while_end_5
+;	while n:
+mov eax,[esp+0]
+mov eax,[esp+0]
+push eax
+mov eax,1
+pop ebx
+sub ebx,eax
+mov eax,ebx
+mov [esp+0],eax
+;		i = i - 1
+mov eax,[esp+0]
+push eax
+mov eax,48
+push eax
+mov eax,[esp+44]
+push eax
+mov eax,10
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+mov eax,edx
+pop ebx
+sub ebx,eax
+mov eax,ebx
+pop ebx
+mov [esp+8+ebx*1],al
+;		digits[i] = 48 - n % 10
+mov eax,[esp+36]
+mov eax,[esp+36]
+push eax
+mov eax,10
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+mov [esp+36],eax
+;		n = n / 10
+jmp while_start_5
+while_end_5:
+mov eax,[esp+4]
+test eax,eax
+jz else_label_24
+;	if negative:
+mov eax,[esp+0]
+mov eax,[esp+0]
+push eax
+mov eax,1
+pop ebx
+sub ebx,eax
+mov eax,ebx
+mov [esp+0],eax
+;		i = i - 1
+mov eax,[esp+0]
+push eax
+mov eax,45
+pop ebx
+mov [esp+8+ebx*1],al
+;		digits[i] = 45
+jmp end_if_label_24
+else_label_24:
+end_if_label_24:
+mov eax,[esp+40]
+push eax
+mov eax,[esp+4]
+lea eax,[esp+12+eax*1]
+push eax
+call write_str
+add esp,8
+add esp,32
+ret
+;# "function calls cycles self_cycles" lines
+runtime_profile_dump:
+;int runtime_profile_dump():
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+mov eax,0
+mov [esp+23],al
+;	digits[23] = 0
+mov eax,2
+push eax
+call $ + 40
+db "function", 09h, "calls", 09h, "cycles", 09h, "self_cycles", 0ah, 0
+pop eax
+push eax
+call write_str
+add esp,8
+;	write_str(2, "function\tcalls\tcycles\tself_cycles\n")
+lea eax,[runtime_profile+4]
+push eax
+;	int* record = &runtime_profile[1]
+push 0
+mov eax,[runtime_profile]
+push eax
+push 1
+for_start_1:
+mov eax,[esp+8]
+mov ebx,[esp+4]
+cmp eax,ebx
+je for_end_1
+;	for int i in range(runtime_profile[0]):
+mov eax,2
+push eax
+mov ebx,[esp+16]
+mov eax,[ebx]
+push eax
+call write_str
+add esp,8
+;		write_str(2, record[0])
+mov eax,2
+push eax
+mov eax,9
+push eax
+call write_char
+add esp,8
+;		write_char(2, 9)
+mov eax,2
+push eax
+lea eax,[esp+43]
+push eax
+mov ebx,[esp+20]
+lea eax,[ebx+4]
+push eax
+call runtime_counter_digits
+add esp,8
+push eax
+call write_str
+add esp,8
+;		write_str(2, runtime_counter_digits(&digits[23], &record[1]))
+mov eax,2
+push eax
+mov eax,9
+push eax
+call write_char
+add esp,8
+;		write_char(2, 9)
+mov eax,2
+push eax
+lea eax,[esp+43]
+push eax
+mov ebx,[esp+20]
+lea eax,[ebx+12]
+push eax
+call runtime_counter_digits
+add esp,8
+push eax
+call write_str
+add esp,8
+;		write_str(2, runtime_counter_digits(&digits[23], &record[3]))
+mov eax,2
+push eax
+mov eax,9
+push eax
+call write_char
+add esp,8
+;		write_char(2, 9)
+mov eax,2
+push eax
+lea eax,[esp+43]
+push eax
+mov ebx,[esp+20]
+lea eax,[ebx+20]
+push eax
+call runtime_counter_digits
+add esp,8
+push eax
+call write_str
+add esp,8
+;		write_str(2, runtime_counter_digits(&digits[23], &record[5]))
+mov eax,2
+push eax
+mov eax,10
+push eax
+call write_char
+add esp,8
+;		write_char(2, 10)
+mov eax,[esp+12]
+mov ebx,[esp+12]
+lea eax,[ebx+28]
+mov [esp+12],eax
+;		record = &record[7]
+mov eax,[esp+0]
+add [esp+8],eax
+jmp for_start_1
+for_end_1:
+add esp,12
+mov eax,0
+add esp,28
+ret
+;	return 0
+fib:
+add dword [profile_fib],1
+adc dword [profile_fib+4],0
+mov ebx,[runtime_profile_top]
+cmp ebx,[runtime_profile_end]
+jae profile_enter_1_full
+rdtsc
+mov [ebx],eax
+mov [ebx+4],edx
+mov dword [ebx+8],0
+mov dword [ebx+12],0
+add ebx,16
+mov [runtime_profile_top],ebx
+jmp profile_enter_1_done
+profile_enter_1_full:
+add dword [runtime_profile_overflow],1
+profile_enter_1_done:
+;int fib(int n):
+mov eax,[esp+4]
+push eax
+mov eax,2
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz else_label_25
+;	if n < 2:
+mov eax,[esp+4]
+cmp dword [runtime_profile_overflow],0
+jne profile_exit_1_full
+mov ecx,eax
+rdtsc
+mov ebx,[runtime_profile_top]
+sub ebx,16
+mov [runtime_profile_top],ebx
+sub eax,[ebx]
+sbb edx,[ebx+4]
+add [profile_fib+8],eax
+adc [profile_fib+12],edx
+add [ebx-8],eax
+adc [ebx-4],edx
+sub eax,[ebx+8]
+sbb edx,[ebx+12]
+add [profile_fib+16],eax
+adc [profile_fib+20],edx
+mov eax,ecx
+jmp profile_exit_1_done
+profile_exit_1_full:
+sub dword [runtime_profile_overflow],1
+profile_exit_1_done:
+ret
+;		return n
+jmp end_if_label_25
+else_label_25:
+end_if_label_25:
+mov eax,[esp+4]
+push eax
+mov eax,1
+pop ebx
+sub ebx,eax
+mov eax,ebx
+push eax
+call fib
+add esp,4
+push eax
+mov eax,[esp+8]
+push eax
+mov eax,2
+pop ebx
+sub ebx,eax
+mov eax,ebx
+push eax
+call fib
+add esp,4
+pop ebx
+add eax,ebx
+cmp dword [runtime_profile_overflow],0
+jne profile_exit_2_full
+mov ecx,eax
+rdtsc
+mov ebx,[runtime_profile_top]
+sub ebx,16
+mov [runtime_profile_top],ebx
+sub eax,[ebx]
+sbb edx,[ebx+4]
+add [profile_fib+8],eax
+adc [profile_fib+12],edx
+add [ebx-8],eax
+adc [ebx-4],edx
+sub eax,[ebx+8]
+sbb edx,[ebx+12]
+add [profile_fib+16],eax
+adc [profile_fib+20],edx
+mov eax,ecx
+jmp profile_exit_2_done
+profile_exit_2_full:
+sub dword [runtime_profile_overflow],1
+profile_exit_2_done:
+ret
+;
+countdown:
+push ecx
+push edx
+add dword [profile_countdown],1
+adc dword [profile_countdown+4],0
+mov ebx,[runtime_profile_top]
+cmp ebx,[runtime_profile_end]
+jae profile_enter_2_full
+rdtsc
+mov [ebx],eax
+mov [ebx+4],edx
+mov dword [ebx+8],0
+mov dword [ebx+12],0
+add ebx,16
+mov [runtime_profile_top],ebx
+jmp profile_enter_2_done
+profile_enter_2_full:
+add dword [runtime_profile_overflow],1
+profile_enter_2_done:
+;fastcall int countdown(int n, int acc):
+mov eax,[esp+4]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+sete al
+movzx eax,al
+test eax,eax
+jz else_label_26
+;	if n == 0:
+mov eax,[esp+0]
+add esp,8
+cmp dword [runtime_profile_overflow],0
+jne profile_exit_3_full
+mov ecx,eax
+rdtsc
+mov ebx,[runtime_profile_top]
+sub ebx,16
+mov [runtime_profile_top],ebx
+sub eax,[ebx]
+sbb edx,[ebx+4]
+add [profile_countdown+8],eax
+adc [profile_countdown+12],edx
+add [ebx-8],eax
+adc [ebx-4],edx
+sub eax,[ebx+8]
+sbb edx,[ebx+12]
+add [profile_countdown+16],eax
+adc [profile_countdown+20],edx
+mov eax,ecx
+jmp profile_exit_3_done
+profile_exit_3_full:
+sub dword [runtime_profile_overflow],1
+profile_exit_3_done:
+ret
+;		return acc
+jmp end_if_label_26
+else_label_26:
+end_if_label_26:
+mov eax,[esp+4]
+push eax
+mov eax,1
+pop ebx
+sub ebx,eax
+mov eax,ebx
+push eax
+mov eax,[esp+4]
+push eax
+mov eax,1
+pop ebx
+add eax,ebx
+mov edx,eax
+pop ecx
+add esp,8
+push ecx
+push edx
+cmp dword [runtime_profile_overflow],0
+jne profile_exit_4_full
+mov ecx,eax
+rdtsc
+mov ebx,[runtime_profile_top]
+sub ebx,16
+mov [runtime_profile_top],ebx
+sub eax,[ebx]
+sbb edx,[ebx+4]
+add [profile_countdown+8],eax
+adc [profile_countdown+12],edx
+add [ebx-8],eax
+adc [ebx-4],edx
+sub eax,[ebx+8]
+sbb edx,[ebx+12]
+add [profile_countdown+16],eax
+adc [profile_countdown+20],edx
+mov eax,ecx
+jmp profile_exit_4_done
+profile_exit_4_full:
+sub dword [runtime_profile_overflow],1
+profile_exit_4_done:
+pop edx
+pop ecx
+jmp countdown
+;# Nests deeper than the 16384 entries of the profiling stack
+depth:
+add dword [profile_depth],1
+adc dword [profile_depth+4],0
+mov ebx,[runtime_profile_top]
+cmp ebx,[runtime_profile_end]
+jae profile_enter_3_full
+rdtsc
+mov [ebx],eax
+mov [ebx+4],edx
+mov dword [ebx+8],0
+mov dword [ebx+12],0
+add ebx,16
+mov [runtime_profile_top],ebx
+jmp profile_enter_3_done
+profile_enter_3_full:
+add dword [runtime_profile_overflow],1
+profile_enter_3_done:
+;int depth(int n):
+mov eax,[esp+4]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+sete al
+movzx eax,al
+test eax,eax
+jz else_label_27
+;	if n == 0:
+mov eax,0
+cmp dword [runtime_profile_overflow],0
+jne profile_exit_5_full
+mov ecx,eax
+rdtsc
+mov ebx,[runtime_profile_top]
+sub ebx,16
+mov [runtime_profile_top],ebx
+sub eax,[ebx]
+sbb edx,[ebx+4]
+add [profile_depth+8],eax
+adc [profile_depth+12],edx
+add [ebx-8],eax
+adc [ebx-4],edx
+sub eax,[ebx+8]
+sbb edx,[ebx+12]
+add [profile_depth+16],eax
+adc [profile_depth+20],edx
+mov eax,ecx
+jmp profile_exit_5_done
+profile_exit_5_full:
+sub dword [runtime_profile_overflow],1
+profile_exit_5_done:
+ret
+;		return 0
+jmp end_if_label_27
+else_label_27:
+end_if_label_27:
+mov eax,[esp+4]
+push eax
+mov eax,1
+pop ebx
+sub ebx,eax
+mov eax,ebx
+push eax
+call depth
+add esp,4
+push eax
+mov eax,1
+pop ebx
+add eax,ebx
+cmp dword [runtime_profile_overflow],0
+jne profile_exit_6_full
+mov ecx,eax
+rdtsc
+mov ebx,[runtime_profile_top]
+sub ebx,16
+mov [runtime_profile_top],ebx
+sub eax,[ebx]
+sbb edx,[ebx+4]
+add [profile_depth+8],eax
+adc [profile_depth+12],edx
+add [ebx-8],eax
+adc [ebx-4],edx
+sub eax,[ebx+8]
+sbb edx,[ebx+12]
+add [profile_depth+16],eax
+adc [profile_depth+20],edx
+mov eax,ecx
+jmp profile_exit_6_done
+profile_exit_6_full:
+sub dword [runtime_profile_overflow],1
+profile_exit_6_done:
+ret
+;
+main:
+add dword [profile_main],1
+adc dword [profile_main+4],0
+mov ebx,[runtime_profile_top]
+cmp ebx,[runtime_profile_end]
+jae profile_enter_4_full
+rdtsc
+mov [ebx],eax
+mov [ebx+4],edx
+mov dword [ebx+8],0
+mov dword [ebx+12],0
+add ebx,16
+mov [runtime_profile_top],ebx
+jmp profile_enter_4_done
+profile_enter_4_full:
+add dword [runtime_profile_overflow],1
+profile_enter_4_done:
+;	# The heap starts after the profiling stack
+mov eax,64
+push eax
+call malloc
+add esp,4
+push eax
+;	int* guard = malloc(64)
+mov eax,12345
+mov ecx,[esp+0]
+mov [ecx],eax
+;	guard[0] = 12345
+mov eax,20000
+push eax
+call depth
+add esp,4
+push eax
+mov eax,20000
+pop ebx
+cmp ebx,eax
+setne al
+movzx eax,al
+test eax,eax
+jz else_label_28
+;	if depth(20000) != 20000:
+mov eax,1
+add esp,4
+cmp dword [runtime_profile_overflow],0
+jne profile_exit_7_full
+mov ecx,eax
+rdtsc
+mov ebx,[runtime_profile_top]
+sub ebx,16
+mov [runtime_profile_top],ebx
+sub eax,[ebx]
+sbb edx,[ebx+4]
+add [profile_main+8],eax
+adc [profile_main+12],edx
+add [ebx-8],eax
+adc [ebx-4],edx
+sub eax,[ebx+8]
+sbb edx,[ebx+12]
+add [profile_main+16],eax
+adc [profile_main+20],edx
+mov eax,ecx
+jmp profile_exit_7_done
+profile_exit_7_full:
+sub dword [runtime_profile_overflow],1
+profile_exit_7_done:
+ret
+;		return 1
+jmp end_if_label_28
+else_label_28:
+end_if_label_28:
+mov ebx,[esp+0]
+mov eax,[ebx]
+push eax
+mov eax,12345
+pop ebx
+cmp ebx,eax
+setne al
+movzx eax,al
+test eax,eax
+jz else_label_29
+;	if guard[0] != 12345:
+mov eax,2
+add esp,4
+cmp dword [runtime_profile_overflow],0
+jne profile_exit_8_full
+mov ecx,eax
+rdtsc
+mov ebx,[runtime_profile_top]
+sub ebx,16
+mov [runtime_profile_top],ebx
+sub eax,[ebx]
+sbb edx,[ebx+4]
+add [profile_main+8],eax
+adc [profile_main+12],edx
+add [ebx-8],eax
+adc [ebx-4],edx
+sub eax,[ebx+8]
+sbb edx,[ebx+12]
+add [profile_main+16],eax
+adc [profile_main+20],edx
+mov eax,ecx
+jmp profile_exit_8_done
+profile_exit_8_full:
+sub dword [runtime_profile_overflow],1
+profile_exit_8_done:
+ret
+;		return 2
+jmp end_if_label_29
+else_label_29:
+end_if_label_29:
+mov eax,15
+push eax
+call fib
+add esp,4
+push eax
+mov eax,610
+pop ebx
+sub ebx,eax
+mov eax,ebx
+push eax
+mov eax,1000
+push eax
+mov eax,0
+mov edx,eax
+pop ecx
+call countdown
+pop ebx
+add eax,ebx
+push eax
+mov eax,1000
+pop ebx
+sub ebx,eax
+mov eax,ebx
+add esp,4
+cmp dword [runtime_profile_overflow],0
+jne profile_exit_9_full
+mov ecx,eax
+rdtsc
+mov ebx,[runtime_profile_top]
+sub ebx,16
+mov [runtime_profile_top],ebx
+sub eax,[ebx]
+sbb edx,[ebx+4]
+add [profile_main+8],eax
+adc [profile_main+12],edx
+add [ebx-8],eax
+adc [ebx-4],edx
+sub eax,[ebx+8]
+sbb edx,[ebx+12]
+add [profile_main+16],eax
+adc [profile_main+20],edx
+mov eax,ecx
+jmp profile_exit_9_done
+profile_exit_9_full:
+sub dword [runtime_profile_overflow],1
+profile_exit_9_done:
+ret
+;	return fib(15) - 610 + countdown(1000, 0) - 1000
+
+segment readable
+
+profile_fib_name db 'fib', 0
+profile_countdown_name db 'countdown', 0
+profile_depth_name db 'depth', 0
+profile_main_name db 'main', 0
+
+segment readable writeable
+
+align 4
+runtime_profile dd 4
+dd profile_fib_name
+profile_fib dd 0, 0, 0, 0, 0, 0
+dd profile_countdown_name
+profile_countdown dd 0, 0, 0, 0, 0, 0
+dd profile_depth_name
+profile_depth dd 0, 0, 0, 0, 0, 0
+dd profile_main_name
+profile_main dd 0, 0, 0, 0, 0, 0
+runtime_profile_top dd runtime_profile_stack + 16
+runtime_profile_end dd runtime_profile_stack + 16 * 16384
+runtime_profile_overflow dd 0
+
+segment readable writeable
+
+align 4
+runtime_heap_top rb 4
+align 4
+runtime_heap_end rb 4
+align 4
+runtime_free_lists rb 32
+align 4
+runtime_large_blocks rb 4
+align 4
+runtime_output_length rb 12
+align 4
+runtime_output rb 12288
+align 4
+runtime_profile_stack rb 16 * 16384
\ No newline at end of file
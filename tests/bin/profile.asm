@@ -0,0 +1,1481 @@
+format ELF executable 3
+entry _main
+
+segment readable executable
+
+syscall1:
+mov eax,[esp+4]
+int 0x80
+ret
+syscall4:
+mov eax,[esp+16]
+mov ebx,[esp+12]
+mov ecx,[esp+8]
+mov edx,[esp+4]
+int 0x80
+ret
+syscall5:
+mov eax,[esp+20]
+mov ebx,[esp+16]
+mov ecx,[esp+12]
+mov edx,[esp+8]
+mov esi,[esp+4]
+int 0x80
+ret
+
+_main:
+call main
+push eax
+call runtime_flush
+pop eax
+mov ebx,eax
+mov eax,1
+int 0x80
+
+memset:
+push edi
+mov edi,[esp+16]
+movzx eax,byte [esp+12]
+mov edx,0x01010101
+imul eax,edx
+mov ecx,[esp+8]
+mov edx,ecx
+shr ecx,2
+rep stosd
+mov ecx,edx
+and ecx,3
+rep stosb
+pop edi
+mov eax,[esp+12]
+ret
+memcpy:
+push esi
+push edi
+mov edi,[esp+20]
+mov esi,[esp+16]
+mov ecx,[esp+12]
+mov edx,ecx
+shr ecx,2
+rep movsd
+mov ecx,edx
+and ecx,3
+rep movsb
+pop edi
+pop esi
+mov eax,[esp+12]
+ret
+runtime_counter_digits:
+push esi
+mov ecx,[esp+12]
+mov esi,[esp+8]
+mov eax,[esi]
+mov edx,[esi+4]
+mov ebx,10
+runtime_counter_digits_loop:
+mov esi,eax
+mov eax,edx
+xor edx,edx
+div ebx
+xchg eax,esi
+div ebx
+add dl,48
+dec ecx
+mov [ecx],dl
+mov edx,esi
+or esi,eax
+jnz runtime_counter_digits_loop
+mov eax,ecx
+pop esi
+ret
+
+;uint runtime_heap_top
+source_line_1:
+;# free lists of size class i, blocks of 16 << i bytes
+source_line_2:
+;# free list of blocks larger than 2048 bytes
+source_line_3:
+;# bytes in the output buffer of file descriptors 0 to 2
+source_line_4:
+;int[3] runtime_output_length
+source_line_5:
+;# Grows the heap by at least size bytes, the break is moved in large chunks
+source_line_6:
+runtime_grow:
+;int runtime_grow(int size):
+source_line_7:
+mov eax,65536
+push eax
+;	uint chunk = 65536
+source_line_8:
+mov eax,[esp+0]
+push eax
+mov eax,[esp+12]
+pop ebx
+cmp ebx,eax
+setb al
+movzx eax,al
+test eax,eax
+jz else_label_1
+;	if chunk < size:
+source_line_9:
+mov eax,[esp+0]
+mov eax,[esp+8]
+mov [esp+0],eax
+;		chunk = size
+source_line_10:
+jmp end_if_label_1
+else_label_1:
+end_if_label_1:
+mov eax,[runtime_heap_end]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+sete al
+movzx eax,al
+test eax,eax
+jz else_label_2
+;	if runtime_heap_end == 0:
+source_line_11:
+mov eax,[runtime_heap_end]
+mov eax,45
+push eax
+mov eax,0
+push eax
+mov eax,0
+push eax
+mov eax,0
+push eax
+call syscall4
+add esp,16
+mov [runtime_heap_end],eax
+;		runtime_heap_end = syscall4(45, 0, 0, 0)
+source_line_12:
+mov eax,[runtime_heap_top]
+mov eax,[runtime_heap_end]
+mov [runtime_heap_top],eax
+;		runtime_heap_top = runtime_heap_end
+source_line_13:
+jmp end_if_label_2
+else_label_2:
+end_if_label_2:
+mov eax,[runtime_heap_end]
+push eax
+mov eax,[esp+4]
+pop ebx
+add eax,ebx
+mov [esp+0],eax
+;	uint wanted = runtime_heap_end + chunk
+source_line_14:
+mov eax,[esp+0]
+push eax
+mov eax,[runtime_heap_end]
+pop ebx
+cmp ebx,eax
+setb al
+movzx eax,al
+test eax,eax
+jz else_label_3
+;	if wanted < runtime_heap_end:
+source_line_15:
+mov eax,0
+add esp,4
+ret
+;	# brk returns the old break when it fails
+source_line_16:
+jmp end_if_label_3
+else_label_3:
+end_if_label_3:
+mov eax,45
+push eax
+mov eax,[esp+4]
+push eax
+mov eax,0
+push eax
+mov eax,0
+push eax
+call syscall4
+add esp,16
+push eax
+;	uint end = syscall4(45, wanted, 0, 0)
+source_line_17:
+mov eax,[esp+0]
+push eax
+mov eax,[esp+8]
+pop ebx
+cmp ebx,eax
+setb al
+movzx eax,al
+test eax,eax
+jz else_label_4
+;	if end < wanted:
+source_line_18:
+mov eax,0
+add esp,8
+ret
+;		return 0
+source_line_19:
+jmp end_if_label_4
+else_label_4:
+end_if_label_4:
+mov eax,[runtime_heap_end]
+mov eax,[esp+0]
+mov [runtime_heap_end],eax
+;	runtime_heap_end = end
+source_line_20:
+mov eax,1
+add esp,8
+ret
+;# Takes the first block of at least size bytes from the large block list
+source_line_21:
+runtime_large_block:
+;int runtime_large_block(int size):
+source_line_22:
+mov eax,0
+push eax
+;	int* previous = 0
+source_line_23:
+mov eax,[runtime_large_blocks]
+push eax
+;	int* block = runtime_large_blocks
+source_line_24:
+while_start_1:
+mov eax,[esp+0]
+test eax,eax
+jz while_end_1
+;	while block:
+source_line_25:
+mov ebx,[esp+0]
+mov eax,[ebx+-4]
+push eax
+mov eax,[esp+16]
+pop ebx
+cmp ebx,eax
+setge al
+movzx eax,al
+test eax,eax
+jz else_label_5
+;		if block[-1] >= size:
+source_line_26:
+mov eax,[esp+4]
+test eax,eax
+jz else_label_6
+;			if previous:
+source_line_27:
+mov ebx,[esp+0]
+mov eax,[ebx]
+mov ecx,[esp+4]
+mov [ecx],eax
+;				previous[0] = block[0]
+source_line_28:
+jmp end_if_label_6
+else_label_6:
+;			else:
+source_line_29:
+mov eax,[runtime_large_blocks]
+mov ebx,[esp+0]
+mov eax,[ebx]
+mov [runtime_large_blocks],eax
+;				runtime_large_blocks = block[0]
+source_line_30:
+end_if_label_6:
+mov eax,[esp+0]
+add esp,8
+ret
+;			return block
+source_line_31:
+jmp end_if_label_5
+else_label_5:
+end_if_label_5:
+mov eax,[esp+4]
+mov eax,[esp+0]
+mov [esp+4],eax
+;		previous = block
+source_line_32:
+mov eax,[esp+0]
+mov ebx,[esp+0]
+mov eax,[ebx]
+mov [esp+0],eax
+;		block = block[0]
+source_line_33:
+jmp while_start_1
+while_end_1:
+source_line_34:
+mov eax,0
+add esp,8
+ret
+;
+source_line_35:
+malloc:
+;	# Negative sizes and ones that overflow with the header and rounding
+source_line_36:
+mov eax,[esp+4]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz else_label_7
+;	if size < 0:
+source_line_37:
+mov eax,0
+ret
+;		return 0
+source_line_38:
+jmp end_if_label_7
+else_label_7:
+end_if_label_7:
+mov eax,[esp+4]
+push eax
+mov eax,8
+pop ebx
+add eax,ebx
+push eax
+mov eax,15
+pop ebx
+add eax,ebx
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz else_label_8
+;	if size + 8 + 15 < 0:
+source_line_39:
+mov eax,0
+ret
+;		return 0
+source_line_40:
+jmp end_if_label_8
+else_label_8:
+end_if_label_8:
+mov eax,0
+push eax
+;	int* block = 0
+source_line_41:
+mov eax,8
+push eax
+;	int size_class = 8
+source_line_42:
+mov eax,16
+push eax
+;	int block_size = 16
+source_line_43:
+mov eax,[esp+16]
+push eax
+mov eax,8
+pop ebx
+add eax,ebx
+push eax
+mov eax,2048
+pop ebx
+cmp ebx,eax
+setle al
+movzx eax,al
+test eax,eax
+jz else_label_9
+;	if size + 8 <= 2048:
+source_line_44:
+mov eax,[esp+4]
+mov eax,0
+mov [esp+4],eax
+;		size_class = 0
+source_line_45:
+while_start_2:
+mov eax,[esp+0]
+push eax
+mov eax,[esp+20]
+push eax
+mov eax,8
+pop ebx
+add eax,ebx
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz while_end_2
+;		while block_size < size + 8:
+source_line_46:
+mov eax,[esp+0]
+mov eax,[esp+0]
+push eax
+mov eax,2
+pop ebx
+imul eax,ebx
+mov [esp+0],eax
+;			block_size = block_size * 2
+source_line_47:
+mov eax,[esp+4]
+mov eax,[esp+4]
+push eax
+mov eax,1
+pop ebx
+add eax,ebx
+mov [esp+4],eax
+;			size_class = size_class + 1
+source_line_48:
+jmp while_start_2
+while_end_2:
+source_line_49:
+jmp end_if_label_9
+else_label_9:
+end_if_label_9:
+mov eax,[esp+4]
+push eax
+mov eax,8
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz else_label_10
+;	if size_class < 8:
+source_line_50:
+mov eax,[esp+8]
+mov eax,[esp+4]
+mov eax,[runtime_free_lists+eax*4]
+mov [esp+8],eax
+;		block = runtime_free_lists[size_class]
+source_line_51:
+mov eax,[esp+8]
+test eax,eax
+jz else_label_11
+;		if block:
+source_line_52:
+mov eax,[esp+4]
+push eax
+mov ebx,[esp+12]
+mov eax,[ebx]
+pop ebx
+mov [runtime_free_lists+ebx*4],eax
+;			runtime_free_lists[size_class] = block[0]
+source_line_53:
+mov eax,[esp+8]
+add esp,12
+ret
+;			return block
+source_line_54:
+jmp end_if_label_11
+else_label_11:
+end_if_label_11:
+jmp end_if_label_10
+else_label_10:
+;	else:
+source_line_55:
+mov eax,[esp+0]
+mov eax,[esp+16]
+push eax
+mov eax,8
+pop ebx
+add eax,ebx
+push eax
+mov eax,15
+pop ebx
+add eax,ebx
+push eax
+mov eax,16
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+push eax
+mov eax,16
+pop ebx
+imul eax,ebx
+mov [esp+0],eax
+;		block_size = (size + 8 + 15) / 16 * 16
+source_line_56:
+mov eax,[esp+8]
+mov eax,[esp+0]
+push eax
+call runtime_large_block
+add esp,4
+mov [esp+8],eax
+;		block = runtime_large_block(block_size)
+source_line_57:
+mov eax,[esp+8]
+test eax,eax
+jz else_label_12
+;		if block:
+source_line_58:
+mov eax,[esp+8]
+add esp,12
+ret
+;			return block
+source_line_59:
+jmp end_if_label_12
+else_label_12:
+end_if_label_12:
+end_if_label_10:
+mov eax,[esp+0]
+push eax
+mov eax,[runtime_heap_end]
+push eax
+mov eax,[runtime_heap_top]
+pop ebx
+sub ebx,eax
+mov eax,ebx
+pop ebx
+cmp ebx,eax
+seta al
+movzx eax,al
+test eax,eax
+jz else_label_13
+;	if block_size > runtime_heap_end - runtime_heap_top:
+source_line_60:
+mov eax,[esp+0]
+push eax
+call runtime_grow
+add esp,4
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+sete al
+movzx eax,al
+test eax,eax
+jz else_label_14
+;		if runtime_grow(block_size) == 0:
+source_line_61:
+mov eax,0
+add esp,12
+ret
+;			return 0
+source_line_62:
+jmp end_if_label_14
+else_label_14:
+end_if_label_14:
+jmp end_if_label_13
+else_label_13:
+end_if_label_13:
+mov eax,[esp+8]
+mov eax,[runtime_heap_top]
+push eax
+mov eax,8
+pop ebx
+add eax,ebx
+mov [esp+8],eax
+;	block = runtime_heap_top + 8
+source_line_63:
+mov eax,[runtime_heap_top]
+mov eax,[runtime_heap_top]
+push eax
+mov eax,[esp+4]
+pop ebx
+add eax,ebx
+mov [runtime_heap_top],eax
+;	runtime_heap_top = runtime_heap_top + block_size
+source_line_64:
+mov eax,[esp+0]
+mov ecx,[esp+8]
+mov [ecx+-4],eax
+;	block[-1] = block_size
+source_line_65:
+mov eax,[esp+8]
+add esp,12
+ret
+;
+source_line_66:
+free:
+;int free(int* block):
+source_line_67:
+mov eax,[esp+4]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+sete al
+movzx eax,al
+test eax,eax
+jz else_label_15
+;	if block == 0:
+source_line_68:
+mov eax,0
+ret
+;		return 0
+source_line_69:
+jmp end_if_label_15
+else_label_15:
+end_if_label_15:
+mov eax,0
+push eax
+;	int size_class = 0
+source_line_70:
+mov eax,16
+push eax
+;	int class_size = 16
+source_line_71:
+while_start_3:
+mov eax,[esp+0]
+push eax
+mov ebx,[esp+16]
+mov eax,[ebx+-4]
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz while_end_3
+;	while class_size < block[-1]:
+source_line_72:
+mov eax,[esp+0]
+mov eax,[esp+0]
+push eax
+mov eax,2
+pop ebx
+imul eax,ebx
+mov [esp+0],eax
+;		class_size = class_size * 2
+source_line_73:
+mov eax,[esp+4]
+mov eax,[esp+4]
+push eax
+mov eax,1
+pop ebx
+add eax,ebx
+mov [esp+4],eax
+;		size_class = size_class + 1
+source_line_74:
+jmp while_start_3
+while_end_3:
+source_line_75:
+mov eax,[esp+4]
+push eax
+mov eax,8
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+test eax,eax
+jz else_label_16
+;	if size_class < 8:
+source_line_76:
+mov eax,[esp+4]
+mov eax,[runtime_free_lists+eax*4]
+mov ecx,[esp+12]
+mov [ecx],eax
+;		block[0] = runtime_free_lists[size_class]
+source_line_77:
+mov eax,[esp+4]
+push eax
+mov eax,[esp+16]
+pop ebx
+mov [runtime_free_lists+ebx*4],eax
+;		runtime_free_lists[size_class] = block
+source_line_78:
+jmp end_if_label_16
+else_label_16:
+;	else:
+source_line_79:
+mov eax,[runtime_large_blocks]
+mov ecx,[esp+12]
+mov [ecx],eax
+;		block[0] = runtime_large_blocks
+source_line_80:
+mov eax,[runtime_large_blocks]
+mov eax,[esp+12]
+mov [runtime_large_blocks],eax
+;		runtime_large_blocks = block
+source_line_81:
+end_if_label_16:
+mov eax,0
+add esp,8
+ret
+;
+source_line_82:
+flush:
+;int flush(int fd):
+source_line_83:
+mov eax,[esp+4]
+mov eax,[runtime_output_length+eax*4]
+push eax
+;	int length = runtime_output_length[fd]
+source_line_84:
+mov eax,[esp+0]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+setg al
+movzx eax,al
+test eax,eax
+jz else_label_17
+;	if length > 0:
+source_line_85:
+mov eax,4
+push eax
+mov eax,[esp+12]
+push eax
+mov eax,[esp+16]
+push eax
+mov eax,4096
+pop ebx
+imul eax,ebx
+lea eax,[runtime_output+eax*1]
+push eax
+mov eax,[esp+12]
+push eax
+call syscall4
+add esp,16
+;		syscall4(4, fd, &runtime_output[fd * 4096], length)
+source_line_86:
+mov eax,[esp+8]
+push eax
+mov eax,0
+pop ebx
+mov [runtime_output_length+ebx*4],eax
+;		runtime_output_length[fd] = 0
+source_line_87:
+jmp end_if_label_17
+else_label_17:
+end_if_label_17:
+mov eax,0
+add esp,4
+ret
+;
+source_line_88:
+runtime_flush:
+;int runtime_flush():
+source_line_89:
+mov eax,1
+push eax
+call flush
+add esp,4
+;	flush(1)
+source_line_90:
+mov eax,2
+push eax
+call flush
+add esp,4
+;	flush(2)
+source_line_91:
+mov eax,0
+push eax
+call flush
+add esp,4
+;	flush(0)
+source_line_92:
+mov eax,0
+ret
+;# Ends the program with code after writing out buffered output
+source_line_93:
+exit:
+;int exit(int code):
+source_line_94:
+call runtime_flush
+;	runtime_flush()
+source_line_95:
+mov eax,1
+push eax
+mov eax,[esp+8]
+push eax
+mov eax,0
+push eax
+mov eax,0
+push eax
+call syscall4
+add esp,16
+ret
+;
+source_line_96:
+write_char:
+;int write_char(int fd, int c):
+source_line_97:
+mov eax,[esp+8]
+push eax
+mov eax,2
+pop ebx
+cmp ebx,eax
+setg al
+movzx eax,al
+test eax,eax
+jz else_label_18
+;	if fd > 2:
+source_line_98:
+mov eax,4
+push eax
+mov eax,[esp+12]
+push eax
+lea eax,[esp+12]
+push eax
+mov eax,1
+push eax
+call syscall4
+add esp,16
+ret
+;		return syscall4(4, fd, &c, 1)
+source_line_99:
+jmp end_if_label_18
+else_label_18:
+end_if_label_18:
+mov eax,[esp+8]
+mov eax,[runtime_output_length+eax*4]
+push eax
+mov eax,4096
+pop ebx
+cmp ebx,eax
+sete al
+movzx eax,al
+test eax,eax
+jz else_label_19
+;	if runtime_output_length[fd] == 4096:
+source_line_100:
+mov eax,[esp+8]
+push eax
+call flush
+add esp,4
+;		flush(fd)
+source_line_101:
+jmp end_if_label_19
+else_label_19:
+end_if_label_19:
+mov eax,[esp+8]
+push eax
+mov eax,4096
+pop ebx
+imul eax,ebx
+push eax
+mov eax,[esp+12]
+mov eax,[runtime_output_length+eax*4]
+pop ebx
+add eax,ebx
+push eax
+mov eax,[esp+8]
+pop ebx
+mov [runtime_output+ebx*1],al
+;	runtime_output[fd * 4096 + runtime_output_length[fd]] = c
+source_line_102:
+mov eax,[esp+8]
+push eax
+mov eax,[esp+12]
+mov eax,[runtime_output_length+eax*4]
+push eax
+mov eax,1
+pop ebx
+add eax,ebx
+pop ebx
+mov [runtime_output_length+ebx*4],eax
+;	runtime_output_length[fd] = runtime_output_length[fd] + 1
+source_line_103:
+mov eax,1
+ret
+;
+source_line_104:
+write_str:
+;int write_str(int fd, char* str):
+source_line_105:
+mov eax,0
+push eax
+;	int length = 0
+source_line_106:
+while_start_4:
+mov eax,[esp+0]
+mov ebx,[esp+8]
+movsx eax,byte [ebx+eax*1]
+test eax,eax
+jz while_end_4
+;	while str[length]:
+source_line_107:
+mov eax,[esp+0]
+mov eax,[esp+0]
+push eax
+mov eax,1
+pop ebx
+add eax,ebx
+mov [esp+0],eax
+;		length = length + 1
+source_line_108:
+jmp while_start_4
+while_end_4:
+source_line_109:
+mov eax,[esp+12]
+push eax
+mov eax,2
+pop ebx
+cmp ebx,eax
+setg al
+movzx eax,al
+test eax,eax
+jz else_label_20
+;	if fd > 2:
+source_line_110:
+mov eax,4
+push eax
+mov eax,[esp+16]
+push eax
+mov eax,[esp+16]
+push eax
+mov eax,[esp+12]
+push eax
+call syscall4
+add esp,16
+add esp,4
+ret
+;		return syscall4(4, fd, str, length)
+source_line_111:
+jmp end_if_label_20
+else_label_20:
+end_if_label_20:
+mov eax,[esp+12]
+mov eax,[runtime_output_length+eax*4]
+push eax
+mov eax,[esp+4]
+pop ebx
+add eax,ebx
+push eax
+mov eax,4096
+pop ebx
+cmp ebx,eax
+setg al
+movzx eax,al
+test eax,eax
+jz else_label_21
+;	if runtime_output_length[fd] + length > 4096:
+source_line_112:
+mov eax,[esp+12]
+push eax
+call flush
+add esp,4
+;		flush(fd)
+source_line_113:
+jmp end_if_label_21
+else_label_21:
+end_if_label_21:
+mov eax,[esp+0]
+push eax
+mov eax,4096
+pop ebx
+cmp ebx,eax
+setge al
+movzx eax,al
+test eax,eax
+jz else_label_22
+;	if length >= 4096:
+source_line_114:
+mov eax,4
+push eax
+mov eax,[esp+16]
+push eax
+mov eax,[esp+16]
+push eax
+mov eax,[esp+12]
+push eax
+call syscall4
+add esp,16
+add esp,4
+ret
+;		return syscall4(4, fd, str, length)
+source_line_115:
+jmp end_if_label_22
+else_label_22:
+end_if_label_22:
+mov eax,[esp+12]
+push eax
+mov eax,4096
+pop ebx
+imul eax,ebx
+push eax
+mov eax,[esp+16]
+mov eax,[runtime_output_length+eax*4]
+pop ebx
+add eax,ebx
+lea eax,[runtime_output+eax*1]
+push eax
+mov eax,[esp+12]
+push eax
+mov eax,[esp+8]
+push eax
+call memcpy
+add esp,12
+;	memcpy(&runtime_output[fd * 4096 + runtime_output_length[fd]], str, length)
+source_line_116:
+mov eax,[esp+12]
+push eax
+mov eax,[esp+16]
+mov eax,[runtime_output_length+eax*4]
+push eax
+mov eax,[esp+8]
+pop ebx
+add eax,ebx
+pop ebx
+mov [runtime_output_length+ebx*4],eax
+;	runtime_output_length[fd] = runtime_output_length[fd] + length
+source_line_117:
+mov eax,[esp+0]
+add esp,4
+ret
+;
+source_line_118:
+write_int:
+;int write_int(int fd, int n):
+source_line_119:
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+mov eax,[esp+28]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+setl al
+movzx eax,al
+push eax
+;	# positive counterpart
+source_line_120:
+mov eax,[esp+32]
+push eax
+mov eax,0
+pop ebx
+cmp ebx,eax
+setg al
+movzx eax,al
+test eax,eax
+jz else_label_23
+;	if n > 0:
+source_line_121:
+mov eax,[esp+32]
+mov eax,0
+push eax
+mov eax,[esp+36]
+pop ebx
+sub ebx,eax
+mov eax,ebx
+mov [esp+32],eax
+;		n = 0 - n
+source_line_122:
+jmp end_if_label_23
+else_label_23:
+end_if_label_23:
+mov eax,0
+mov [esp+27],al
+;	digits[23] = 0
+source_line_123:
+mov eax,22
+push eax
+;	int i = 22
+source_line_124:
+mov eax,[esp+0]
+push eax
+mov eax,48
+push eax
+mov eax,[esp+44]
+push eax
+mov eax,10
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+mov eax,edx
+pop ebx
+sub ebx,eax
+mov eax,ebx
+pop ebx
+mov [esp+8+ebx*1],al
+;	digits[i] = 48 - n % 10
+source_line_125:
+mov eax,[esp+36]
+mov eax,[esp+36]
+push eax
+mov eax,10
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+mov [esp+36],eax
+;	n = n / 10
+source_line_126:
+while_start_5:
+mov eax,[esp+36]
+test eax,eax
+jz while_end_5
+;	while n:
+source_line_127:
+mov eax,[esp+0]
+mov eax,[esp+0]
+push eax
+mov eax,1
+pop ebx
+sub ebx,eax
+mov eax,ebx
+mov [esp+0],eax
+;		i = i - 1
+source_line_128:
+mov eax,[esp+0]
+push eax
+mov eax,48
+push eax
+mov eax,[esp+44]
+push eax
+mov eax,10
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+mov eax,edx
+pop ebx
+sub ebx,eax
+mov eax,ebx
+pop ebx
+mov [esp+8+ebx*1],al
+;		digits[i] = 48 - n % 10
+source_line_129:
+mov eax,[esp+36]
+mov eax,[esp+36]
+push eax
+mov eax,10
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+mov [esp+36],eax
+;		n = n / 10
+source_line_130:
+jmp while_start_5
+while_end_5:
+source_line_131:
+mov eax,[esp+4]
+test eax,eax
+jz else_label_24
+;	if negative:
+source_line_132:
+mov eax,[esp+0]
+mov eax,[esp+0]
+push eax
+mov eax,1
+pop ebx
+sub ebx,eax
+mov eax,ebx
+mov [esp+0],eax
+;		i = i - 1
+source_line_133:
+mov eax,[esp+0]
+push eax
+mov eax,45
+pop ebx
+mov [esp+8+ebx*1],al
+;		digits[i] = 45
+source_line_134:
+jmp end_if_label_24
+else_label_24:
+end_if_label_24:
+mov eax,[esp+40]
+push eax
+mov eax,[esp+4]
+lea eax,[esp+12+eax*1]
+push eax
+call write_str
+add esp,8
+add esp,32
+ret
+;# "function calls cycles self_cycles" lines
+source_line_135:
+runtime_profile_dump:
+;int runtime_profile_dump():
+source_line_136:
+push 0
+push 0
+push 0
+push 0
+push 0
+push 0
+mov eax,0
+mov [esp+23],al
+;	digits[23] = 0
+source_line_137:
+mov eax,2
+push eax
+call $ + 40
+db "function", 09h, "calls", 09h, "cycles", 09h, "self_cycles", 0ah, 0
+pop eax
+push eax
+call write_str
+add esp,8
+;	write_str(2, "function\tcalls\tcycles\tself_cycles\n")
+source_line_138:
+lea eax,[runtime_profile+4]
+push eax
+;	int* record = &runtime_profile[1]
+source_line_139:
+push 0
+mov eax,[runtime_profile]
+push eax
+push 1
+for_start_1:
+mov eax,[esp+8]
+mov ebx,[esp+4]
+cmp eax,ebx
+je for_end_1
+;	for int i in range(runtime_profile[0]):
+source_line_140:
+mov eax,2
+push eax
+mov ebx,[esp+16]
+mov eax,[ebx]
+push eax
+call write_str
+add esp,8
+;		write_str(2, record[0])
+source_line_141:
+mov eax,2
+push eax
+mov eax,9
+push eax
+call write_char
+add esp,8
+;		write_char(2, 9)
+source_line_142:
+mov eax,2
+push eax
+lea eax,[esp+43]
+push eax
+mov ebx,[esp+20]
+lea eax,[ebx+4]
+push eax
+call runtime_counter_digits
+add esp,8
+push eax
+call write_str
+add esp,8
+;		write_str(2, runtime_counter_digits(&digits[23], &record[1]))
+source_line_143:
+mov eax,2
+push eax
+mov eax,9
+push eax
+call write_char
+add esp,8
+;		write_char(2, 9)
+source_line_144:
+mov eax,2
+push eax
+lea eax,[esp+43]
+push eax
+mov ebx,[esp+20]
+lea eax,[ebx+12]
+push eax
+call runtime_counter_digits
+add esp,8
+push eax
+call write_str
+add esp,8
+;		write_str(2, runtime_counter_digits(&digits[23], &record[3]))
+source_line_145:
+mov eax,2
+push eax
+mov eax,9
+push eax
+call write_char
+add esp,8
+;		write_char(2, 9)
+source_line_146:
+mov eax,2
+push eax
+lea eax,[esp+43]
+push eax
+mov ebx,[esp+20]
+lea eax,[ebx+20]
+push eax
+call runtime_counter_digits
+add esp,8
+push eax
+call write_str
+add esp,8
+;		write_str(2, runtime_counter_digits(&digits[23], &record[5]))
+source_line_147:
+mov eax,2
+push eax
+mov eax,10
+push eax
+call write_char
+add esp,8
+;		write_char(2, 10)
+source_line_148:
+mov eax,[esp+12]
+mov ebx,[esp+12]
+lea eax,[ebx+28]
+mov [esp+12],eax
+;		record = &record[7]
+source_line_149:
+mov eax,[esp+0]
+add [esp+8],eax
+jmp for_start_1
+for_end_1:
+add esp,12
+source_line_150:
+mov eax,0
+add esp,28
+ret
+;	return 0
+source_line_151:
+slow:
+;int slow(int n):
+source_line_152:
+mov eax,0
+push eax
+;	int total = 0
+source_line_153:
+push 0
+mov eax,[esp+12]
+push eax
+push 1
+for_start_2:
+mov eax,[esp+8]
+mov ebx,[esp+4]
+cmp eax,ebx
+je for_end_2
+;	for int i in range(n):
+source_line_154:
+mov eax,[esp+12]
+mov eax,[esp+12]
+push eax
+mov eax,[esp+12]
+push eax
+mov eax,7
+mov ebx,eax
+pop eax
+cdq
+idiv ebx
+mov eax,edx
+pop ebx
+add eax,ebx
+mov [esp+12],eax
+;		total = total + i % 7
+source_line_155:
+mov eax,[esp+0]
+add [esp+8],eax
+jmp for_start_2
+for_end_2:
+add esp,12
+source_line_156:
+mov eax,[esp+0]
+add esp,4
+ret
+;
+source_line_157:
+fast:
+;int fast(int n):
+source_line_158:
+mov eax,[esp+4]
+push eax
+mov eax,3
+pop ebx
+imul eax,ebx
+ret
+;
+source_line_159:
+main:
+;int main():
+source_line_160:
+mov eax,0
+push eax
+;	int total = 0
+source_line_161:
+push 0
+mov eax,200
+push eax
+push 1
+for_start_3:
+mov eax,[esp+8]
+mov ebx,[esp+4]
+cmp eax,ebx
+je for_end_3
+;	for int i in range(200):
+source_line_162:
+mov eax,[esp+12]
+mov eax,[esp+12]
+push eax
+mov eax,20000
+push eax
+call slow
+add esp,4
+pop ebx
+add eax,ebx
+mov [esp+12],eax
+;		total = total + slow(20000)
+source_line_163:
+mov eax,[esp+12]
+mov eax,[esp+12]
+push eax
+mov eax,[esp+12]
+push eax
+call fast
+add esp,4
+pop ebx
+add eax,ebx
+mov [esp+12],eax
+;		total = total + fast(i)
+source_line_164:
+mov eax,[esp+0]
+add [esp+8],eax
+jmp for_start_3
+for_end_3:
+add esp,12
+source_line_165:
+mov eax,1
+push eax
+mov eax,[esp+4]
+push eax
+call write_int
+add esp,8
+;	write_int(1, total)
+source_line_166:
+mov eax,1
+push eax
+call $ + 7
+db "", 0ah, 0
+pop eax
+push eax
+call write_str
+add esp,8
+;	write_str(1, "\n")
+source_line_167:
+mov eax,0
+add esp,4
+ret
+;	return 0
+source_line_168:
+
+segment readable
+
+align 4
+w_line_table db 'WLINES', 0, 0
+dd 168
+dd source_line_1, source_line_2, source_line_3, source_line_4, source_line_5, source_line_6, source_line_7, source_line_8, source_line_9, source_line_10, source_line_11, source_line_12, source_line_13, source_line_14, source_line_15, source_line_16
+dd source_line_17, source_line_18, source_line_19, source_line_20, source_line_21, source_line_22, source_line_23, source_line_24, source_line_25, source_line_26, source_line_27, source_line_28, source_line_29, source_line_30, source_line_31, source_line_32
+dd source_line_33, source_line_34, source_line_35, source_line_36, source_line_37, source_line_38, source_line_39, source_line_40, source_line_41, source_line_42, source_line_43, source_line_44, source_line_45, source_line_46, source_line_47, source_line_48
+dd source_line_49, source_line_50, source_line_51, source_line_52, source_line_53, source_line_54, source_line_55, source_line_56, source_line_57, source_line_58, source_line_59, source_line_60, source_line_61, source_line_62, source_line_63, source_line_64
+dd source_line_65, source_line_66, source_line_67, source_line_68, source_line_69, source_line_70, source_line_71, source_line_72, source_line_73, source_line_74, source_line_75, source_line_76, source_line_77, source_line_78, source_line_79, source_line_80
+dd source_line_81, source_line_82, source_line_83, source_line_84, source_line_85, source_line_86, source_line_87, source_line_88, source_line_89, source_line_90, source_line_91, source_line_92, source_line_93, source_line_94, source_line_95, source_line_96
+dd source_line_97, source_line_98, source_line_99, source_line_100, source_line_101, source_line_102, source_line_103, source_line_104, source_line_105, source_line_106, source_line_107, source_line_108, source_line_109, source_line_110, source_line_111, source_line_112
+dd source_line_113, source_line_114, source_line_115, source_line_116, source_line_117, source_line_118, source_line_119, source_line_120, source_line_121, source_line_122, source_line_123, source_line_124, source_line_125, source_line_126, source_line_127, source_line_128
+dd source_line_129, source_line_130, source_line_131, source_line_132, source_line_133, source_line_134, source_line_135, source_line_136, source_line_137, source_line_138, source_line_139, source_line_140, source_line_141, source_line_142, source_line_143, source_line_144
+dd source_line_145, source_line_146, source_line_147, source_line_148, source_line_149, source_line_150, source_line_151, source_line_152, source_line_153, source_line_154, source_line_155, source_line_156, source_line_157, source_line_158, source_line_159, source_line_160
+dd source_line_161, source_line_162, source_line_163, source_line_164, source_line_165, source_line_166, source_line_167, source_line_168
+
+segment readable writeable
+
+align 4
+runtime_profile dd 0
+
+segment readable writeable
+
+align 4
+runtime_heap_top rb 4
+align 4
+runtime_heap_end rb 4
+align 4
+runtime_free_lists rb 32
+align 4
+runtime_large_blocks rb 4
+align 4
+runtime_output_length rb 12
+align 4
+runtime_output rb 12288
\ No newline at end of file
@@ -0,0 +1,67 @@
+# Calls of pure functions with constant arguments are evaluated at compile time
+int calls
+
+int mask(int bits):
+	int value = 1
+	repeat:
+		value = value * 2
+		bits = bits - 1
+	until bits == 0
+	return value - 1
+
+int factorial(int n):
+	if n < 2:
+		return 1
+	return n * factorial(n - 1)
+
+int table_size(int rows, int columns):
+	int size = rows * columns
+	while size % 16 != 0:
+		size = size + 1
+	return size
+
+int cell_offset(int row, int column):
+	return row * table_size(3, 5) + column
+
+fastcall int clamp(int x, int low, int high):
+	if x < low:
+		return low
+	if x > high:
+		return high
+	return x
+
+# Changes a global, every call has to run
+int counted(int x):
+	calls = calls + 1
+	return x
+
+# Does not finish within the budget, stays a call
+int spin(int n):
+	int total = 0
+	for int i in range(n):
+		total = total + i % 3
+	return total
+
+int main():
+	if mask(4) != 15:
+		return 1
+	if factorial(10) != 3628800:
+		return 2
+	if table_size(3, 5) != 16:
+		return 3
+	if cell_offset(2, 1) != 33:
+		return 4
+	if clamp(-5, 0, 10) != 0:
+		return 5
+	if clamp(50, 0, 10) != 10:
+		return 5
+	counted(1)
+	counted(1)
+	if calls != 2:
+		return 6
+	int n = 7
+	if factorial(n) != 5040:
+		return 7
+	if spin(10000) != 9999:
+		return 8
+	return 0
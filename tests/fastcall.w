@@ -0,0 +1,11 @@
+fastcall int sub2(int x, int y):
+	return x - y
+
+fastcall int negate(int x):
+	return 0 - x
+
+fastcall int sub4(int a, int b, int c, int d):
+	return a - b - c - d
+
+int main():
+	return sub2(10, 5) + negate(5) + sub4(20, 10, 5, 5)
@@ -0,0 +1,37 @@
+struct point:
+	int x
+	int y
+
+int counter
+int[5] squares = [0, 1, 4, 9, 16]
+int bias = -3
+char[8] name = "w\n"
+int[1024] table
+point origin
+int* cursor
+
+# Names of registers and of labels of the runtime
+int dx = 2
+int[4] si
+int rax
+int runtime_profile_top
+
+int count():
+	counter = counter + 1
+	return counter
+
+int main():
+	for int i in range(1024):
+		table[i] = i * 2
+	count()
+	count()
+	origin.y = 7
+	cursor = &table[10]
+	cursor[1] = 5
+	syscall4(4, 1, name, 2)
+	si[3] = dx + 1
+	rax = si[3] * 2
+	runtime_profile_top = rax + dx
+	if runtime_profile_top != 8:
+		return 1
+	return table[1023] - 2046 + squares[4] - 16 + counter - 2 + bias + 3 + origin.y - 7 + origin.x + table[11] - 5 + name[0] - 119
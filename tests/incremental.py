@@ -0,0 +1,82 @@
+"""
+Builds a program through edits with one UnitCache, as --watch does, and
+checks every incremental build against a fresh full build of the same
+source.
+
+	$ python incremental.py
+"""
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from symbol_table import UnitCache
+from w import Compiler
+
+source = '''struct point:
+	int x
+	int y
+
+point origin
+
+int scale(int n):
+	return n * 3
+
+int length(point* p):
+	return p.x + p.y
+
+int main():
+	origin.x = scale(2)
+	origin.y = 4
+	return length(&origin) - 10
+'''
+
+# Replaced text and the number of declarations compiled again
+edits = [
+	# The function and main, which folds calls of it at compile time
+	('return n * 3', 'return n * 5', 2),
+	# The struct and origin, length and main, which use its layout
+	('\tint x\n', '\tint z\n\tint x\n', 4),
+]
+
+
+def build(filename, target, unit_cache=None):
+	compiler = Compiler(filename, target, True, False, False, unit_cache)
+	compiler.compile()
+	return compiler.code
+
+
+def renumbered(code):
+	"""Numbers generated labels in order of appearance, cached code keeps the numbers of the build that compiled it."""
+	numbers = {}
+	def number(match):
+		return numbers.setdefault(match.group(0), match.group(1) + str(len(numbers)))
+	return [re.sub(r'\b([A-Za-z_]\w*?_)\d+\b', number, line) for line in code]
+
+
+def main():
+	with tempfile.TemporaryDirectory() as directory:
+		filename = os.path.join(directory, 'incremental.w')
+		for target in ['x86', 'x86_64']:
+			text = source
+			unit_cache = UnitCache()
+			for i, (old, new, recompiled) in enumerate([(None, None, None)] + edits):
+				if old is not None:
+					assert old in text, old
+					text = text.replace(old, new)
+				with open(filename, 'w', encoding='utf8') as f:
+					f.write(text)
+				unit_cache.recompiled = 0
+				incremental = build(filename, target, unit_cache)
+				if recompiled is not None:
+					# Without the runtime prelude, which is unchanged
+					assert unit_cache.recompiled == recompiled, (target, i, unit_cache.recompiled)
+				full = build(filename, target)
+				assert renumbered(incremental) == renumbered(full), (target, i)
+	print('incremental builds match full builds')
+
+
+if __name__ == '__main__':
+	main()
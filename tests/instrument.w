@@ -0,0 +1,28 @@
+# Compiled with --instrument, the counters are written to stderr, also when
+# the program ends through exit()
+int fib(int n):
+	if n < 2:
+		return n
+	return fib(n - 1) + fib(n - 2)
+
+fastcall int countdown(int n, int acc):
+	if n == 0:
+		return acc
+	return countdown(n - 1, acc + 1)
+
+# Nests deeper than the 16384 entries of the profiling stack
+int depth(int n):
+	if n == 0:
+		return 0
+	return depth(n - 1) + 1
+
+int main():
+	# The heap starts after the profiling stack
+	int* guard = malloc(64)
+	guard[0] = 12345
+	if depth(20000) != 20000:
+		return 1
+	if guard[0] != 12345:
+		return 2
+	exit(fib(15) - 610 + countdown(1000, 0) - 1000)
+	return 3
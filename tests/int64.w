@@ -0,0 +1,71 @@
+# case values beyond 32 bits
+int64 few(int64 key):
+	switch key:
+		case 4294967296:
+			return 1
+		case -4294967296:
+			return 2
+	return 0
+
+int64 many(int64 key):
+	switch key:
+		case 5:
+			return 1
+		case 4294967296:
+			return 2
+		case 8589934592:
+			return 3
+		case 12884901888:
+			return 4
+		case 17179869184:
+			return 5
+	return 0
+
+int64 dense(int64 key):
+	switch key:
+		case 4294967296:
+			return 1
+		case 4294967297:
+			return 2
+		case 4294967299:
+			return 3
+		case 4294967300:
+			return 4
+	return 0
+
+# Unsigned remainders of powers of two beyond 32 bits are masks
+uint64 low_bits(uint64 value):
+	return value % 1099511627776
+
+int main():
+	int64 big = 4294967296
+	int64[4] values
+	for int i in range(4):
+		values[i] = big * i
+	int32 small = 7
+	if few(big) != 1:
+		return 2
+	if few(0 - big) != 2:
+		return 2
+	if few(0) != 0:
+		return 2
+	if many(big * 3) != 4:
+		return 3
+	if many(5) != 1:
+		return 3
+	if many(big + 5) != 0:
+		return 3
+	if dense(big + 3) != 3:
+		return 4
+	if dense(big + 4) != 4:
+		return 4
+	if dense(big + 2) != 0:
+		return 4
+	if dense(3) != 0:
+		return 4
+	if low_bits(big * 1024 + big * 3 + 5) != big * 3 + 5:
+		return 5
+	if values[3] - 12884901888 == 0:
+		syscall4(4, 1, "64 bit!\n", 8)
+		return small - 7
+	return 1
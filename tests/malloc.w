@@ -0,0 +1,32 @@
+int main():
+	int* a = malloc(100)
+	int* b = malloc(100)
+	a[24] = 24
+	b[0] = 1
+	free(a)
+	int* c = malloc(90)
+	if c != a:
+		return 1
+	char* big = malloc(100000)
+	memset(big, 7, 100000)
+	char* copy = malloc(100000)
+	memcpy(copy, big, 100000)
+	int sum = 0
+	for int i in range(0, 99900, 999):
+		sum = sum + copy[i] - 7
+	free(big)
+	int* again = malloc(5000)
+	if again != big:
+		return 2
+	# Sizes that are negative or overflow with the block header
+	if malloc(0 - 1) != 0:
+		return 3
+	int largest = 1
+	while largest > 0:
+		largest = largest * 2
+	largest = largest - 1
+	if malloc(largest) != 0:
+		return 4
+	if malloc(largest - 20) != 0:
+		return 5
+	return sum + b[0] - 1
@@ -0,0 +1,18 @@
+# Busy program for wprof, most samples should land in slow()
+int slow(int n):
+	int total = 0
+	for int i in range(n):
+		total = total + i % 7
+	return total
+
+int fast(int n):
+	return n * 3
+
+int main():
+	int total = 0
+	for int i in range(200):
+		total = total + slow(20000)
+		total = total + fast(i)
+	write_int(1, total)
+	write_str(1, "\n")
+	return 0
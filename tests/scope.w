@@ -0,0 +1,94 @@
+# Locals of a block are popped when it ends, locals that are no longer
+# used give their stack slot to later ones
+int sum_squares(int n):
+	int total = 0
+	for int i in range(n):
+		int square = i * i
+		total = total + square
+	return total
+
+int branches(int x):
+	if x > 0:
+		int doubled = x * 2
+		return doubled
+	else:
+		int negated = 0 - x
+		int incremented = negated + 1
+		return incremented
+
+int chain(int x):
+	int a = x + 1
+	int b = a * 2
+	int c = b + 3
+	int d = c * c
+	return d
+
+# a is changed through p after its last use by name
+int pinned(int x):
+	int a = x
+	int* p = &a
+	int b = 5
+	@p = 7
+	return a + b
+
+# counter is used again on the next iteration
+int looped(int n):
+	int counter = 0
+	int first = n
+	while counter < n:
+		int step = first
+		counter = counter + 1
+		int unused
+		step = step + unused
+	return counter
+
+int nested(int n):
+	int total = 0
+	int i = 0
+	while i < n:
+		int j = 0
+		while j < i:
+			int product = i * j
+			total = total + product
+			j = j + 1
+		i = i + 1
+	return total
+
+# Names of the runtime prelude can be declared again
+int free = 4
+int runtime_heap_top
+
+int shadowed(int n):
+	int flush = 3
+	int malloc = n
+	return flush + malloc + free
+
+int main():
+	int before = 11
+	# Variables keep the calls from being evaluated at compile time
+	int two = 2
+	int five = 5
+	for int k in range(1000):
+		int spare = k
+		if spare != k:
+			return 9
+	if sum_squares(two * five) != 285:
+		return 1
+	if branches(five) != 10:
+		return 2
+	if branches(0 - five) != 6:
+		return 3
+	if chain(two) != 81:
+		return 4
+	if pinned(two - 1) != 12:
+		return 5
+	if looped(two * two) != 4:
+		return 6
+	if nested(two * two) != 11:
+		return 7
+	if before != 11:
+		return 8
+	runtime_heap_top = 1
+	if shadowed(two) + runtime_heap_top != 10:
+		return 10
+	return 0
@@ -6,7 +6,7 @@ int main():
 	point s
 	s.x = 5
 	s.y = 5
-	point* p
+	point* p = &s
 	p.x = 10
 	p.y = 20
-	return p.y - p.x * 2
+	return p.y - p.x * 2 + s.y - s.x * 2
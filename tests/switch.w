@@ -0,0 +1,57 @@
+# dense cases compile to a jump table, sparse ones to a binary search
+int dense(int op):
+	switch op:
+		case 0:
+			return 10
+		case 1, 2:
+			return 20
+		case 3:
+			return 30
+		case 5:
+			return 50
+		else:
+			return 0 - 1
+	return 0
+
+int sparse(int key):
+	int result = 0
+	match key:
+		case -100:
+			result = 1
+		case 7:
+			result = 2
+		case 300:
+			result = 3
+		case 4000, 4001, 4002, 4003:
+			result = 4
+		case 50000:
+			result = 5
+	return result
+
+int main():
+	int errors = 0
+	if dense(0) != 10:
+		errors = errors + 1
+	if dense(2) != 20:
+		errors = errors + 1
+	if dense(4) != 0 - 1:
+		errors = errors + 1
+	if dense(5) != 50:
+		errors = errors + 1
+	if dense(-3) != 0 - 1:
+		errors = errors + 1
+	if dense(6) != 0 - 1:
+		errors = errors + 1
+	if sparse(-100) != 1:
+		errors = errors + 1
+	if sparse(300) != 3:
+		errors = errors + 1
+	if sparse(4002) != 4:
+		errors = errors + 1
+	if sparse(50000) != 5:
+		errors = errors + 1
+	if sparse(8) != 0:
+		errors = errors + 1
+	write_int(1, errors)
+	write_str(1, "\n")
+	return errors
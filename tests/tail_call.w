@@ -0,0 +1,45 @@
+fastcall int count(int n, int acc):
+	if n == 0:
+		return acc
+	return count(n - 1, acc + 2)
+
+int sum(int n, int acc):
+	if n == 0:
+		return acc
+	return sum(n - 1, acc + 1)
+
+struct pair:
+	int x
+	int y
+
+# Its locals overwrite the frame of a caller that jumped here
+int first(int* values):
+	int a = 0
+	int b = 0
+	int c = 0
+	int d = 0
+	return values[0] + a + b + c + d
+
+# Addresses of the frame are passed along, the calls have to return here
+int local_array(int n):
+	int[4] values
+	values[0] = n
+	return first(values)
+
+int element(int n):
+	int[4] values
+	values[2] = n
+	return first(&values[2])
+
+int field(int n):
+	pair p
+	p.y = n
+	return first(&p.y)
+
+int argument(int n):
+	return first(&n)
+
+int main():
+	if local_array(7) + element(8) + field(9) + argument(10) != 34:
+		return 1
+	return count(3000000, 0) - sum(3000000, 0) - 3000000
@@ -0,0 +1,41 @@
+# signed and unsigned loads, compares and divisions
+int main():
+	int errors = 0
+	char c = 200
+	byte b = 200
+	if c != 0 - 56:
+		errors = errors + 1
+	if b != 200:
+		errors = errors + 1
+	int16[2] halves
+	uint16[2] unsigned_halves
+	halves[1] = 40000
+	unsigned_halves[1] = 40000
+	if halves[1] != 40000 - 65536:
+		errors = errors + 1
+	if unsigned_halves[1] != 40000:
+		errors = errors + 1
+	char[4] bytes
+	bytes[2] = 255
+	if bytes[2] >= 0:
+		errors = errors + 1
+	# idiv with the dividend sign extended
+	int n = 0 - 7
+	if n / 2 != 0 - 3:
+		errors = errors + 1
+	if n % 2 != 0 - 1:
+		errors = errors + 1
+	# all bits set is the largest unsigned value
+	uint u = 0 - 1
+	if u < 1:
+		errors = errors + 1
+	if u / 2 < 1:
+		errors = errors + 1
+	if u % 8 != 7:
+		errors = errors + 1
+	uint three = 3
+	if u / three < 1:
+		errors = errors + 1
+	if (u - 1) % three != 2:
+		errors = errors + 1
+	return errors
@@ -0,0 +1,97 @@
+# Simple array loops are vectorized and unrolled with -O2, the results
+# are checked against loops that are compiled as written
+int[67] left
+int[67] right
+int[67] result
+int total
+
+int sum(int* values, int count):
+	int partial = 0
+	for int i in range(count):
+		partial = partial + values[i]
+	return partial
+
+int main():
+	int n = 67
+	int k = 0
+	while k < n:
+		left[k] = k * 3
+		right[k] = 1000 - k
+		k = k + 1
+
+	# Global arrays and a constant
+	for int i in range(n):
+		result[i] = left[i] + right[i] - 5
+	k = 0
+	while k < n:
+		if result[k] != 995 + k * 2:
+			return 1
+		k = k + 1
+
+	# Sums, of a global array and through a pointer
+	for int j in range(n):
+		total = total + left[j]
+	if total != 6633:
+		return 2
+	if sum(left, n) != 6633:
+		return 3
+	if sum(left, 5) != 30:
+		return 4
+
+	# Bytes wrap around, the range starts at 3
+	char[40] bytes
+	char[40] shifted
+	k = 0
+	while k < 40:
+		bytes[k] = k * 7
+		shifted[k] = 0
+		k = k + 1
+	for int m in range(3, 40, 1):
+		shifted[m] = bytes[m] + 200
+	if shifted[2] != 0:
+		return 5
+	k = 3
+	while k < 40:
+		char expected = k * 7 + 200
+		if shifted[k] != expected:
+			return 6
+		k = k + 1
+
+	# int16 products are vectorized, word sized ones unrolled
+	int16[21] short
+	int16[21] squares
+	int[21] words
+	int[21] cubes
+	k = 0
+	while k < 21:
+		short[k] = k * 300
+		words[k] = k
+		k = k + 1
+	for int p in range(21):
+		squares[p] = short[p] * short[p]
+	for int q in range(21):
+		cubes[q] = words[q] * 7
+	k = 0
+	while k < 21:
+		int16 square = k * 300 * k * 300
+		if squares[k] != square:
+			return 7
+		if cubes[k] != k * 7:
+			return 8
+		k = k + 1
+
+	# The destination starts an element after the source, every element
+	# depends on the previous one
+	int* source = &left[0]
+	int* destination = &left[1]
+	for int r in range(n - 1):
+		destination[r] = source[r] + 1
+	if left[66] != 66:
+		return 9
+
+	# Empty ranges
+	for int s in range(5, 5):
+		result[s] = 0
+	if result[5] != 1005:
+		return 10
+	return 0
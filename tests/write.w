@@ -0,0 +1,39 @@
+# Checks the digits buffered for fd 1 against expected
+int buffered(char* expected):
+	int length = 0
+	while expected[length]:
+		if runtime_output[4096 + length] != expected[length]:
+			return 0
+		length = length + 1
+	return runtime_output_length[1] == length
+
+int main():
+	for int i in range(1000):
+		write_str(1, "line ")
+		write_int(1, i - 500)
+		write_char(1, 10)
+	write_str(2, "done\n")
+
+	# The smallest int can not be negated
+	flush(1)
+	write_int(1, 0 - 2147483647 - 1)
+	if buffered("-2147483648") == 0:
+		return 1
+	write_char(1, 10)
+	int smallest = 1
+	while smallest > 0:
+		smallest = smallest * 2
+	flush(1)
+	write_int(1, smallest)
+	if smallest == 0 - 2147483647 - 1:
+		if buffered("-2147483648") == 0:
+			return 2
+	else:
+		if buffered("-9223372036854775808") == 0:
+			return 3
+	write_char(1, 10)
+
+	# Buffered output is written out before exiting
+	write_str(1, "exit\n")
+	exit(0)
+	return 4
@@ -6,6 +6,9 @@ class Tokenizer:
 		self.nextc = ''
 		self.token = []
 		self.line_number = 1
+		# lines of the current and the previous token
+		self.token_line_number = 1
+		self.previous_line_number = 1
 		self.column_number = 1
 		self.last_line = []
 		self.line = []
@@ -56,6 +59,7 @@ class Tokenizer:
 
 	def get_token(self):
 		self.token_newline = False
+		self.previous_line_number = self.token_line_number
 		w = True
 		while True:
 			w = False
@@ -73,11 +77,12 @@ class Tokenizer:
 				self.nextc = self.get_character()
 			
 			self.token = []
+			self.token_line_number = self.line_number
 
 			# Identifiers and Numbers
 			# This should potentially be split up
 			# E.g. could have '123asdf' which is not valid
-			while self.nextc.isalnum():
+			while self.nextc.isalnum() or self.nextc == '_':
 				self.take_char()
 
 			# Operators
@@ -114,11 +119,9 @@ class Tokenizer:
 
 				# Line Comments
 				elif self.nextc == '#':
-					self.take_char()
-					self.nextc = self.get_character()
-					while self.nextc != '\n':
+					while self.nextc != '\n' and self.nextc != '':
 						self.nextc = self.get_character()
-					w = True
+					continue
 
 			return self.source_index < len(self.source)
 		
@@ -156,6 +159,51 @@ class Tokenizer:
 	def expect_end(self):
 		self.expect_or_newline(';')
 
+	def units(self):
+		"""
+		Splits the source into top level declarations, returns their
+		(index, line_number, text). Declarations start at column 0.
+		"""
+		units = []
+		index = 0
+		line_number = 1
+		start = None
+		start_line = 0
+		for line in self.source.splitlines(keepends=True):
+			if line[0] not in ' \t\r\n#':
+				if start is not None:
+					units.append((start, start_line, self.source[start:index]))
+				start = index
+				start_line = line_number
+			index += len(line)
+			line_number += 1
+		if start is not None:
+			units.append((start, start_line, self.source[start:]))
+		return units
+
+	def seek(self, index, line_number):
+		"""Continues reading at the start of a line."""
+		self.source_index = index
+		self.line_number = line_number
+		self.tab_level = 0
+		self.line = []
+		self.last_line = []
+		self.end_of_file = False
+		self.nextc = ''
+		self.nextc = self.get_character()
+
+	def save(self):
+		"""State to continue reading from the current token with restore()."""
+		state = dict(vars(self))
+		for name in ['token', 'line', 'last_line']:
+			state[name] = list(state[name])
+		return state
+
+	def restore(self, state):
+		vars(self).update(state)
+		for name in ['token', 'line', 'last_line']:
+			setattr(self, name, list(state[name]))
+
 	def read(self):
 		f = open(self.filename, 'r', encoding='utf8')
 		self.source = f.read()
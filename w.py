@@ -1,13 +1,80 @@
+import os
+import re
 import sys
-from math import log2
+import time
 from collections import defaultdict
 
 from tokenizer import Tokenizer
 from symbol_table import *
+from target import targets
+from emulator import Emulator, Fault
+
+
+# Escaped characters of string literals and their byte values
+string_escapes = {
+	'n': '0ah',
+	't': '09h',
+}
+
+# set instructions of signed compares and their unsigned counterparts
+unsigned_conditions = {
+	'setl': 'setb',
+	'setle': 'setbe',
+	'setg': 'seta',
+	'setge': 'setae',
+}
+
+# Binary operators by token: precedence, the method emitting the code
+# after both operands are evaluated and the operation passed to it
+binary_operators = {
+	'==': (1, 'compare_code', 'sete'),
+	'!=': (1, 'compare_code', 'setne'),
+	'<': (2, 'compare_code', 'setl'),
+	'<=': (2, 'compare_code', 'setle'),
+	'>': (2, 'compare_code', 'setg'),
+	'>=': (2, 'compare_code', 'setge'),
+	'+': (3, 'arithmetic_code', 'add'),
+	'-': (3, 'arithmetic_code', 'sub'),
+	'*': (4, 'arithmetic_code', 'imul'),
+	'/': (4, 'division_code', 'div'),
+	'%': (4, 'division_code', 'mod'),
+}
+
+# Runtime prelude compiled ahead of every program
+runtime_filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'runtime.w')
+
+# Instructions that make a function impure, besides accesses to memory
+# outside of its stack frame and calls of impure functions
+impure_instructions = re.compile(r'^(?:int|syscall|rdtsc|rep)\b', re.MULTILINE)
+jump_targets = re.compile(r'^(?:call|j[a-z]+) (.*)$', re.MULTILINE)
+
+# Calls of pure functions with constant arguments are evaluated at compile
+# time, unless they run for more instructions or use more stack than this
+evaluation_budget = 100000
+evaluation_stack_size = 64 * 1024
+
+# Entries of the stack of active calls in --instrument builds
+profile_stack_entries = 16384
+
+# Operators of the array loops vectorized with -O2: SSE2 instruction by
+# element size and the scalar instruction of the remaining elements.
+# Loops without a vector instruction for their element size are unrolled.
+array_operators = {
+	'+': ({1: 'paddb', 2: 'paddw', 4: 'paddd', 8: 'paddq'}, 'add'),
+	'-': ({1: 'psubb', 2: 'psubw', 4: 'psubd', 8: 'psubq'}, 'sub'),
+	'*': ({2: 'pmullw'}, 'imul'),
+}
+
+# Bytes of an xmm register and xmm registers processed per vector loop iteration
+vector_size = 16
+vector_unroll = 2
+
+# Elements per iteration of unrolled scalar loops
+scalar_unroll = 4
 
 
 class Compiler:
-	def __init__(self, filename) -> None:
+	def __init__(self, filename, target='x86', runtime=True, line_table=False, instrument=False, unit_cache=None, optimize=0) -> None:
 		self.symbol_table = SymbolTable()
 
 		# mapping of filename to Tokenizer object
@@ -16,9 +83,23 @@ class Compiler:
 		# filename being compiled
 		self.root_filename = filename
 
+		# Machine the code is generated for
+		self.target = targets[target]()
+
+		# Link in the runtime prelude
+		self.runtime = runtime
+
 		# word size of the platform in bytes
 		# 4 * 8 = 32 bit platforms
-		self.word_size = 4
+		# 8 * 8 = 64 bit platforms
+		self.word_size = self.target.word_size
+
+		# Word sized register names
+		self.ax = self.target.ax
+		self.bx = self.target.bx
+		self.cx = self.target.cx
+		self.dx = self.target.dx
+		self.sp = self.target.sp
 
 		# Current tokenizer
 		self.tokenizer = None
@@ -32,8 +113,27 @@ class Compiler:
 		# code output
 		self.code = []
 
+		# initialized global variables, output to the data segment
+		self.data = []
+
+		# uninitialized global variables, output to the zero filled bss segment
+		self.bss = []
+
+		# constant data like jump tables, output to a read only segment
+		self.rodata = []
+
+		# Symbols of the runtime prelude by name, declarations of the
+		# program shadow them
+		self.runtime_symbols = {}
+
+		# Units of earlier builds, only declarations that changed or
+		# depend on changed symbols are compiled again
+		self.unit_cache = unit_cache
+
 		# label counters for asm output
 		self.label_counters = defaultdict(int)
+		if unit_cache:
+			self.label_counters = unit_cache.label_counters
 
 		# Used to compute an address rather than value of a variable via "&"
 		self.address_of = False
@@ -41,71 +141,203 @@ class Compiler:
 		# Used when dereferencing pointers via "@"
 		self.pointer_dereference = 0
 
-		# used for array assignments
-		self.array_assignment = False
+		# Struct field being accessed via "."
+		self.current_field = None
+
+		# Pending "[base+index*scale+displacement]" operand of an array
+		# element or struct field, loaded in promote() or stored in
+		# assignment_expression()
+		self.memory_access = None
+
+		# Index into code where the last identifier was loaded
+		self.identifier_code_index = 0
+
+		# Type of the value in the accumulator, None for plain ints,
+		# selects signed or unsigned compares and divisions
+		self.value_type = None
+
+		# Registers used for the first arguments of "fastcall" functions
+		self.argument_registers = self.target.argument_registers
+
+		# Most recent call site, used to detect calls in tail position
+		self.last_call = None
+
+		# Function whose body is being compiled
+		self.current_function = None
+
+		# Lifetimes and stack slots of its locals
+		self.frame = None
+
+		# Label, source file, line and function of the code before each
+		# "source_line_N" label, written to a sidecar file for wprof
+		self.line_table = [] if line_table else None
+
+		# Count calls and cycles of the functions in the compiled file,
+		# the counters are written to stderr when main returns
+		self.instrument = instrument
+		self.profiled_functions = []
+
+		# Results of pure functions by label and constant arguments,
+		# None when the call has to be made at run time
+		self.evaluations = {}
+
+		# Optimization level, -O2 vectorizes and unrolls simple array loops
+		self.optimize = optimize
 
 	def compile(self):
 		self.define_base_types()
 		self.define_linux_syscall()
 		self.linux_asm_header()
+		declared = set(self.symbol_table.table[-1])
+		if self.runtime:
+			self.define_runtime()
+		if self.line_table is not None:
+			# Code before it has no source line
+			self.code.append('source_start:')
+		if self.runtime:
+			self.init_file(runtime_filename)
+			self.module()
+			# The program can declare the names of the runtime again
+			self.runtime_symbols = {name: symbol for scope in self.symbol_table.table
+				for name, symbol in scope.items() if name not in declared}
 		self.init_file(self.root_filename)
 		self.module()
+		self.linux_asm_footer()
 
 	def define_base_types(self):
-		self.symbol_table.declare(Type('void', 0))
-
-		self.symbol_table.declare(Type('char', 1, signed=True))
-		self.symbol_table.declare(Type('byte', 1))
-
-		self.symbol_table.declare(Type('int', self.word_size, signed=True))
-		self.symbol_table.declare(Type('int8', 1, signed=True))
-		self.symbol_table.declare(Type('int16', 2, signed=True))
-		self.symbol_table.declare(Type('int32', 4, signed=True))
-		self.symbol_table.declare(Type('int64', 8, signed=True))
-
-		self.symbol_table.declare(Type('uint', self.word_size))
-		self.symbol_table.declare(Type('uint8', 1))
-		self.symbol_table.declare(Type('uint16', 2))
-		self.symbol_table.declare(Type('uint32', 4))
-		self.symbol_table.declare(Type('uint64', 8))
+		self.define_type(Type('void', 0))
+
+		self.define_type(Type('char', 1, signed=True))
+		self.define_type(Type('byte', 1))
+
+		self.define_type(Type('int', self.word_size, signed=True))
+		self.define_type(Type('int8', 1, signed=True))
+		self.define_type(Type('int16', 2, signed=True))
+		self.define_type(Type('int32', 4, signed=True))
+		self.define_type(Type('int64', 8, signed=True))
+
+		self.define_type(Type('uint', self.word_size))
+		self.define_type(Type('uint8', 1))
+		self.define_type(Type('uint16', 2))
+		self.define_type(Type('uint32', 4))
+		self.define_type(Type('uint64', 8))
+
+		# Type of addresses, not declared so it can not be named
+		self.pointer_type = Type('pointer', self.word_size)
+		self.define_type(self.pointer_type, declare=False)
+
+	def define_type(self, type_symbol, declare=True):
+		# Instruction selection is done once per type
+		if type_symbol.size > 0:
+			type_symbol.load = self.target.load(type_symbol.size, type_symbol.signed)
+			type_symbol.store = self.target.store(type_symbol.size)
+		if declare:
+			self.symbol_table.declare(type_symbol)
 
 	def define_linux_syscall(self):
-		self.symbol_table.declare(Function('syscall1', 'int', 0))
-		self.symbol_table.declare(Function('syscall4', 'int', 0))
-		self.symbol_table.declare(Function('syscall5', 'int', 0))
+		# mapping of syscall stub name to the number of values it loads
+		self.syscall_stubs = {
+			'syscall1': 1,
+			'syscall4': 4,
+			'syscall5': 5,
+		}
+		for name in self.syscall_stubs:
+			self.symbol_table.declare(Function(name, 'int', 0))
+
+	def define_runtime(self):
+		# Primitives of the runtime prelude that are written in assembly
+		self.symbol_table.declare(Function('memset', 'int', 0))
+		self.symbol_table.declare(Function('memcpy', 'int', 0))
+		self.symbol_table.declare(Function('runtime_counter_digits', 'int', 0))
+		self.code.extend(self.target.memset())
+		self.code.extend(self.target.memcpy())
+		self.code.extend(self.target.counter_digits())
+		self.code.append('')
+		# Function count followed by records of a name pointer, the
+		# call, cycle and self cycle counters, two words each, and the
+		# number of active calls
+		runtime_profile = Variable('runtime_profile', self.symbol_table.lookup('int'), 'Global', array_count=1)
+		runtime_profile.label = 'r_runtime_profile'
+		self.symbol_table.declare(runtime_profile)
 
 	def linux_asm_header(self):
 		self.code.extend([
-			'format ELF executable 3',
+			'format ' + self.target.format,
 			'entry _main',
 			'',
-			'syscall1:',
-			'mov eax,[esp+4]',
-			'int 0x80',
-			'ret',
-			'syscall4:',
-			'mov eax,[esp+16]',
-			'mov ebx,[esp+12]',
-			'mov ecx,[esp+8]',
-			'mov edx,[esp+4]',
-			'int 0x80',
-			'ret',
-			'syscall5:',
-			'mov eax,[esp+20]',
-			'mov ebx,[esp+16]',
-			'mov ecx,[esp+12]',
-			'mov edx,[esp+8]',
-			'mov esi,[esp+4]',
-			'int 0x80',
-			'ret',
+			'segment readable executable',
+			'',
+			])
+		for name, count in self.syscall_stubs.items():
+			self.code.extend(self.target.syscall_stub(name, count))
+		self.code.extend([
 			'',
 			'_main:',
 			'call main',
-			'mov ebx,eax',
-			'mov eax,1',
-			'int 0x80',
-			'',
 			])
+		if self.runtime:
+			# Write out buffered output, keeping the exit code
+			self.code.append(f'push {self.ax}')
+			if self.instrument:
+				self.code.append('call runtime_profile_dump')
+			self.code.extend([
+				'call runtime_flush',
+				f'pop {self.ax}',
+				])
+		self.code.extend(self.target.exit())
+		self.code.append('')
+
+	def linux_asm_footer(self):
+		if self.line_table is not None:
+			# Addresses of the start of the source code and of the line
+			# labels, found by wprof through the magic
+			self.rodata.extend([
+				'align 4',
+				"w_line_table db 'WLINES', 0, 0",
+				f'dd {len(self.line_table)}',
+				'dd source_start',
+				])
+			for i in range(0, len(self.line_table), 16):
+				labels = [entry[0] for entry in self.line_table[i:i + 16]]
+				self.rodata.append('dd ' + ', '.join(labels))
+		if self.runtime:
+			self.profile_table()
+		if self.rodata:
+			self.code.extend(['', 'segment readable', ''])
+			self.code.extend(self.rodata)
+		if self.data:
+			self.code.extend(['', 'segment readable writeable', ''])
+			self.code.extend(self.data)
+		# Reserved data takes no space in the executable
+		if self.bss:
+			self.code.extend(['', 'segment readable writeable', ''])
+			self.code.extend(self.bss)
+
+	def profile_table(self):
+		directive = {4: 'dd', 8: 'dq'}[self.word_size]
+		self.data.extend([
+			f'align {self.word_size}',
+			f"{self.runtime_symbols['runtime_profile'].label} {directive} {len(self.profiled_functions)}",
+			])
+		for function in self.profiled_functions:
+			self.rodata.append(f"{function.profile_label}_name db '{function.name}', 0")
+			self.data.append(f'{directive} {function.profile_label}_name')
+			self.data.append(f'{function.profile_label} {directive} 0, 0, 0, 0, 0, 0, 0')
+		if self.profiled_functions:
+			# Start time and child cycles of the active calls, the
+			# first entry collects the cycles of main. Calls nested
+			# deeper are still counted, but only their depth is kept in
+			# runtime_profile_overflow and their cycles are part of the
+			# deepest call on the stack.
+			self.data.extend([
+				f'runtime_profile_top {directive} runtime_profile_stack + 16',
+				f'runtime_profile_end {directive} runtime_profile_stack + 16 * {profile_stack_entries}',
+				f'runtime_profile_overflow {directive} 0',
+				])
+			self.bss.extend([
+				f'align {self.word_size}',
+				f'runtime_profile_stack rb 16 * {profile_stack_entries}',
+				])
 
 	def init_file(self, filename):
 		self.tokenizer = Tokenizer(filename)
@@ -115,10 +347,20 @@ class Compiler:
 
 	def expect_end(self):
 		self.code.append(';' + ''.join(self.tokenizer.last_line))
+		self.source_line(self.tokenizer.previous_line_number)
 		if False:
 			self.code.append(f' stack:{self.stack_position}')
 		self.tokenizer.expect_end()
 
+	def source_line(self, line_number):
+		"""In --line-table builds, the code since the last label belongs to line_number."""
+		if self.line_table is None:
+			return
+		function = self.current_function.name if self.current_function else '-'
+		label = self.next_label('source_line')
+		self.line_table.append((label, self.tokenizer.filename, line_number, function))
+		self.code.append(label + ':')
+
 	def print_tokens(self):
 		while self.tokenizer.get_token():
 			print('Token:', ''.join(self.tokenizer.token))
@@ -144,19 +386,158 @@ class Compiler:
 		return type_object
 
 	def module(self):
-		self.tokenizer.get_token()
 		self.symbol_table.add_scope('Module')
+		if self.unit_cache is not None:
+			self.incremental_module()
+			return
+		self.tokenizer.get_token()
 		# Handle imports
-		# Handle struct declarations
-		while self.struct_declaration():
-			pass
-		# Handle variable declarations
-		# Handle function declarations
 		while not self.tokenizer.end_of_file:
-			self.function()
-		
+			if not self.struct_declaration():
+				self.declaration()
+
+	def incremental_module(self):
+		"""Compiles changed declarations and reuses the output of the others."""
+		filename = self.tokenizer.filename
+		cached = self.unit_cache.files.get(filename, {})
+		units = {}
+		for index, line_number, text in self.tokenizer.units():
+			unit = cached.get(text)
+			if unit and unit.valid(self.symbol_table):
+				self.reuse_unit(unit, line_number)
+			else:
+				unit = self.compile_unit(index, line_number, text)
+				self.unit_cache.recompiled += 1
+			self.unit_cache.units += 1
+			units[text] = unit
+		self.unit_cache.files[filename] = units
+
+	def unit_outputs(self):
+		outputs = {
+			'code': self.code,
+			'data': self.data,
+			'bss': self.bss,
+			'rodata': self.rodata,
+			'profiled_functions': self.profiled_functions,
+		}
+		if self.line_table is not None:
+			outputs['line_table'] = self.line_table
+		return outputs
+
+	def compile_unit(self, index, line_number, text):
+		unit = Unit(text, line_number)
+		module_scope = self.symbol_table.table[-1]
+		declared = set(module_scope)
+		starts = {name: len(output) for name, output in self.unit_outputs().items()}
+		self.symbol_table.lookups = {}
+		self.tokenizer.seek(index, line_number)
+		self.tokenizer.get_token()
+		if not self.struct_declaration():
+			self.declaration()
+		lookups = self.symbol_table.lookups
+		self.symbol_table.lookups = None
+		unit.symbols = [module_scope[name] for name in module_scope if name not in declared]
+		for name, symbol in lookups.items():
+			if symbol not in unit.symbols:
+				unit.dependencies[name] = signature(symbol)
+		for name, output in self.unit_outputs().items():
+			unit.outputs[name] = output[starts[name]:]
+		return unit
+
+	def reuse_unit(self, unit, line_number):
+		for symbol in unit.symbols:
+			self.symbol_table.declare(symbol)
+		if 'line_table' in unit.outputs:
+			# Earlier declarations may have grown or shrunk
+			shift = line_number - unit.line_number
+			unit.outputs['line_table'] = [(label, source, line + shift, function)
+				for label, source, line, function in unit.outputs['line_table']]
+		unit.line_number = line_number
+		for name, output in self.unit_outputs().items():
+			output.extend(unit.outputs[name])
+
+	def declaration(self):
+		"""Function or global variable declaration."""
+		calling_convention = 'stack'
+		if self.tokenizer.accept('fastcall'):
+			calling_convention = 'fastcall'
+		type_symbol = self.expect_type_name()
+		pointer_level, array_count = self.variable_type_suffix()
+		name = self.tokenizer.token_string()
+		self.tokenizer.get_token()
+		if self.tokenizer.accept('('):
+			self.function(type_symbol, name, calling_convention)
+		else:
+			if self.previous_declaration(name):
+				self.fail('variable "' + name + '" was previously declared')
+			variable = Variable(name, type_symbol, 'Global', pointer_level=pointer_level, array_count=array_count)
+			if self.tokenizer.filename == runtime_filename:
+				# Kept apart from globals of the program with the same name
+				variable.label = 'r_' + name
+			self.symbol_table.declare(variable)
+			self.global_variable(variable)
+
+	def global_variable(self, variable):
+		if variable.array_count > 0:
+			element_size = self.element_type(variable).size
+			count = variable.array_count
+		elif variable.pointer_level > 0:
+			element_size = self.word_size
+			count = 1
+		else:
+			# Scalars take a word like stack variables
+			element_size = max(variable.variable_type.size, self.word_size)
+			count = 1
+		size = element_size * count
+		if self.tokenizer.accept('='):
+			directives = {1: 'db', 2: 'dw', 4: 'dd', 8: 'dq'}
+			if element_size not in directives:
+				self.fail(f'Global variable "{variable.name}" of type.size=={element_size} can not be initialized')
+			values, length = self.constant_initializer(variable)
+			if length > count:
+				self.fail(f'Too many values to initialize global variable "{variable.name}"')
+			values.extend(['0'] * (count - length))
+			self.data.append(f'align {self.word_size}')
+			self.data.append(f'{variable.label} {directives[element_size]} ' + ', '.join(values))
+		else:
+			self.bss.append(f'align {self.word_size}')
+			self.bss.append(f'{variable.label} rb {size}')
+		self.expect_end()
+
+	def constant_initializer(self, variable):
+		"""Returns the data directive values and element count of a constant initializer."""
+		token = self.tokenizer.token_string()
+		if token and token[0] == '"' and variable.array_count > 0:
+			# char arrays can be initialized with a string
+			string, length = self.process_string(token)
+			self.tokenizer.get_token()
+			return [string], length
+		if variable.array_count > 0:
+			if not self.tokenizer.accept('['):
+				self.fail('Expected "[" to initialize global array "' + variable.name + '"')
+			values = []
+			while not self.tokenizer.accept(']'):
+				values.append(str(self.constant_int()))
+				self.tokenizer.accept(',')
+			return values, len(values)
+		return [str(self.constant_int())], 1
+
+	def constant_int(self):
+		negative = self.tokenizer.accept('-')
+		valid, n = self.int_literal_sub()
+		if not valid:
+			self.fail('Expected a constant int, found "' + self.tokenizer.token_string() + '"')
+		self.tokenizer.get_token()
+		if negative:
+			return 0 - n
+		return n
+
 	def struct_declaration(self):
+		# packed structs have no padding, e.g. for wire formats
+		packed = self.tokenizer.accept('packed')
 		if not self.tokenizer.accept('struct'):
+			if packed:
+				self.fail('Expected "struct" after "packed"')
 			return False
 		name = self.identifier_name()
 		if not self.tokenizer.accept(':'):
@@ -167,47 +548,165 @@ class Compiler:
 		while self.tokenizer.tab_level > 0:
 			field_type = self.expect_type_name()
 			field_name = self.identifier_name()
-			offset = struct_type.size
+			# Fields are naturally aligned, up to the word size like stack slots
+			alignment = 1
+			if not packed:
+				alignment = min(field_type.alignment, self.word_size)
+			offset = self.aligned(struct_type.size, alignment)
 			field = Field(field_name, field_type, offset)
 			struct_type.fields.append(field)
-			struct_type.size += field_type.size
+			struct_type.size = offset + field_type.size
+			struct_type.alignment = max(struct_type.alignment, alignment)
+		# Padding at the end keeps the elements of struct arrays aligned
+		struct_type.size = self.aligned(struct_type.size, struct_type.alignment)
+		return True
 
-	def function(self):
-		type_symbol = self.expect_type_name()
-		name = self.tokenizer.token_string()
-		self.tokenizer.get_token()
-		if self.tokenizer.accept('('):
-			function = Function(name, type_symbol, self.code_position)
-			self.current_function = function
-			self.code.append(name + ':')
-			self.symbol_table.declare(function)
-			scope_level = len(self.symbol_table.table)
-			function.scope = self.symbol_table.add_scope('Function')
-			# Process arguments
-			variable_stack_position = 0
-			while not self.tokenizer.accept(')'):
-				# arg_type = self.expect_type_name()
-				# arg_identifier = self.tokenizer.token_string()
-				# variable = Variable(arg_identifier, arg_type, 'Argument')
-				self.variable_declaration_sub('Argument')
-				variable = self.current_variable
-				variable.stack_position = variable_stack_position
-				if variable.pointer_level > 0:
-					variable_stack_position += self.word_size
-				else:
-					variable_stack_position += variable.variable_type.size
-				function.arguments.append(variable)
-				# self.symbol_table.declare(variable)
-				# self.tokenizer.get_token()
-				self.tokenizer.accept(',')
-			# Reverse argument stack indexes
-			for arg in function.arguments:
-				arg.stack_position = variable_stack_position - arg.stack_position
-			
+	def aligned(self, size, alignment):
+		"""Rounds size up to a multiple of alignment."""
+		return (size + alignment - 1) // alignment * alignment
+
+	def function(self, type_symbol, name, calling_convention):
+		function = Function(name, type_symbol, self.code_position, calling_convention)
+		# Functions can shadow functions of the runtime prelude
+		previous = self.symbol_table.lookup(name)
+		if previous and previous.symbol_type == 'Function':
+			function.label = self.next_label(name)
+		self.current_function = function
+		function.code_index = len(self.code)
+		self.code.append(function.label + ':')
+		self.symbol_table.declare(function)
+		scope_level = len(self.symbol_table.table)
+		function.scope = self.symbol_table.add_scope('Function')
+		self.stack_position = 0
+		# Process arguments
+		variable_stack_position = 0
+		while not self.tokenizer.accept(')'):
+			# arg_type = self.expect_type_name()
+			# arg_identifier = self.tokenizer.token_string()
+			# variable = Variable(arg_identifier, arg_type, 'Argument')
+			self.variable_declaration_sub('Argument')
+			variable = self.current_variable
+			function.arguments.append(variable)
+			self.tokenizer.accept(',')
+			if len(function.register_arguments(self.argument_registers)) == len(function.arguments):
+				continue
+			variable.stack_position = variable_stack_position
+			if variable.pointer_level > 0:
+				variable_stack_position += self.word_size
+			else:
+				variable_stack_position += variable.variable_type.size
+			# self.symbol_table.declare(variable)
+			# self.tokenizer.get_token()
+		# Reverse argument stack indexes
+		for arg in function.stack_arguments(self.argument_registers):
+			arg.stack_position = variable_stack_position - arg.stack_position
+		function.stack_argument_size = variable_stack_position
+		self.spill_argument_registers(function)
+		if self.instrument and self.tokenizer.filename != runtime_filename:
+			function.profile_label = 'profile_' + function.label
+			self.profiled_functions.append(function)
+			self.code.extend(self.target.profile_enter(function.profile_label, self.next_label('profile_enter')))
+
+		self.frame = Frame()
+		self.frame.allocate(self.stack_position)
+		state = self.compile_state()
+		self.statement()
+		plan = self.frame.reuse_plan()
+		if plan:
+			# Compile again with locals sharing the slots of dead ones
+			self.restore_compile_state(state)
+			self.frame = Frame(plan)
+			self.frame.allocate(self.stack_position)
 			self.statement()
-			# ret()  # only put in if last statement is not a return
-			function.size = self.code_position - function.start_address
-			self.symbol_table.table = self.symbol_table.table[0:scope_level]
+		# ret()  # only put in if last statement is not a return
+		function.frame_size = self.frame.size
+		self.frame = None
+		function.pure_code = self.pure_code(function)
+		function.size = self.code_position - function.start_address
+		self.symbol_table.table = self.symbol_table.table[0:scope_level]
+		self.current_function = None
+
+	def compile_state(self):
+		"""Everything compiling a function body changes, for restore_compile_state()."""
+		state = {
+			'tokenizer': self.tokenizer.save(),
+			'stack_position': self.stack_position,
+			'scope_level': len(self.symbol_table.table),
+			'label_counters': dict(self.label_counters),
+			'outputs': {name: len(output) for name, output in self.unit_outputs().items()},
+		}
+		return state
+
+	def restore_compile_state(self, state):
+		self.tokenizer.restore(state['tokenizer'])
+		self.stack_position = state['stack_position']
+		self.symbol_table.table = self.symbol_table.table[0:state['scope_level']]
+		# Shared with the unit cache in --watch mode, so updated in place
+		self.label_counters.clear()
+		self.label_counters.update(state['label_counters'])
+		for name, output in self.unit_outputs().items():
+			del output[state['outputs'][name]:]
+		self.last_call = None
+
+	def pure_code(self, function):
+		"""
+		Code of a function that only accesses its stack frame and calls pure
+		functions, together with their code. None for other functions.
+		"""
+		lines = [line for line in self.code[function.code_index:] if not line.startswith(';')]
+		text = '\n'.join(lines)
+		targets = set(jump_targets.findall(text))
+		# Without a final return it falls through into the next function,
+		# labels nothing jumps to, e.g. of --line-table builds, do not count
+		instructions = [line for line in lines if not line.endswith(':') or line[:-1] in targets]
+		if instructions[-1].split(' ')[0] not in ['ret', 'jmp']:
+			return None
+		if impure_instructions.search(text):
+			return None
+		# Memory operands have to be based on the stack pointer
+		if re.search(r'\[(?!' + self.sp + r'[+\]])', text):
+			return None
+		labels = {line[:-1] for line in lines if line.endswith(':')}
+		callees = {callee.label: callee for callee in function.callees}
+		code = {function.label: tuple(lines)}
+		for target in targets:
+			if target in labels:
+				continue
+			callee = callees.get(target)
+			if callee is None or callee.pure_code is None:
+				return None
+			for label, callee_lines in callee.pure_code.items():
+				code.setdefault(label, callee_lines)
+		return code
+
+	def evaluate_call(self, function, arguments):
+		"""Result of a call of a pure function with constant arguments, None if it has to run."""
+		if function.pure_code is None or None in arguments or len(arguments) != len(function.arguments):
+			return None
+		key = (function.label, tuple(arguments))
+		if key in self.evaluations:
+			return self.evaluations[key]
+		registers = self.call_registers(function)[0:len(arguments)]
+		source = '\n'.join(line for lines in function.pure_code.values() for line in lines)
+		try:
+			evaluator = Emulator(source, self.word_size, evaluation_stack_size)
+			value = evaluator.call(function.label, arguments[len(registers):],
+				zip(registers, arguments), evaluation_budget)
+		except Fault:
+			value = None
+		if value is not None and value >> (self.word_size * 8 - 1):
+			value -= 1 << (self.word_size * 8)
+		self.evaluations[key] = value
+		return value
+
+	def spill_argument_registers(self, function):
+		# fastcall arguments arrive in registers, give them a stack slot
+		# so they can be addressed like any other local variable
+		for register, arg in zip(self.argument_registers, function.register_arguments(self.argument_registers)):
+			self.code.append('push ' + register)
+			self.stack_position += self.word_size
+			arg.sub_type = 'Local'
+			arg.stack_position = self.stack_position
 
 	def statement(self):
 		if self.tokenizer.accept(':'):
@@ -215,16 +714,23 @@ class Compiler:
 			self.symbol_table.add_scope('Inner')
 			stack_position = self.stack_position
 			scope_level = len(self.symbol_table.table)
+			first_local = len(self.frame.lifetimes)
 			start_tab_level = self.tokenizer.tab_level
 			while start_tab_level <= self.tokenizer.tab_level and self.tokenizer.nextc != '':
 				self.statement()
-			# add/sub esp, stack_position - self.stack_position
+			self.frame.end_scope(first_local, len(self.code))
+			# Pop the locals of the block, after a return there is nothing left
+			if self.stack_position > stack_position:
+				self.fix_stack(stack_position)
+				self.source_line(self.tokenizer.previous_line_number)
 			self.stack_position = stack_position
 			self.symbol_table.table = self.symbol_table.table[0:scope_level]
 		elif self.variable_declaration():
 			pass
 		elif self.if_statement():
 			pass
+		elif self.switch_statement():
+			pass
 		elif self.while_statement():
 			pass
 		elif self.repeat_statement():
@@ -234,14 +740,18 @@ class Compiler:
 		elif self.tokenizer.accept('return'):
 			self.expression()
 			self.promote()
-			self.fix_stack()
-			self.code.append('ret')
+			if not self.tail_call():
+				self.fix_stack()
+				if self.current_function.profile_label:
+					self.code.extend(self.target.profile_exit(self.current_function.profile_label, self.next_label('profile_exit')))
+				self.code.append('ret')
 			self.expect_end()
 		else:
 			self.expression()
 			self.expect_end()
 
 	def if_statement(self):
+		tab_level = self.tokenizer.tab_level
 		if not self.tokenizer.accept('if'):
 			return False
 		self.expression()
@@ -251,52 +761,160 @@ class Compiler:
 		self.label_counters['end_if_label'] += 1
 		end_if_label = 'end_if_label_' + str(self.label_counters['end_if_label'])
 
-		self.code.append('test eax,eax')
+		self.code.append(f'test {self.ax},{self.ax}')
 		self.code.append('jz ' + else_label)
 		self.statement()
 		self.code.append('jmp ' + end_if_label)
 		self.code.append(else_label + ':')
-		if self.tokenizer.accept('else'):
+		# else belongs to the if at the same indentation
+		if self.tokenizer.tab_level == tab_level and self.tokenizer.accept('else'):
 			self.statement()
 		self.code.append(end_if_label + ':')
 		return True
 	
+	def switch_statement(self):
+		"""
+		switch value:
+			case 1, 2:
+				...
+			else:
+				...
+		"""
+		tab_level = self.tokenizer.tab_level
+		if not (self.tokenizer.accept('switch') or self.tokenizer.accept('match')):
+			return False
+		self.expression()
+		self.promote()
+		if not self.tokenizer.accept(':'):
+			self.fail('Expected ":" after switch value')
+		# The dispatch code is inserted here once all case values are known
+		dispatch_index = len(self.code)
+		self.expect_end()
+		end_label = self.next_label('switch_end')
+		default_label = end_label
+		cases = {}
+		while self.tokenizer.tab_level > tab_level and not self.tokenizer.end_of_file:
+			label = self.next_label('case')
+			if self.tokenizer.accept('case'):
+				while True:
+					value = self.constant_int()
+					if value in cases:
+						self.fail(f'Duplicate case value {value} in switch')
+					cases[value] = label
+					if not self.tokenizer.accept(','):
+						break
+			elif self.tokenizer.accept('else'):
+				if default_label != end_label:
+					self.fail('Duplicate else in switch')
+				default_label = label
+			else:
+				self.fail('Expected "case" or "else" inside switch, found "' + self.tokenizer.token_string() + '"')
+			self.code.append(label + ':')
+			self.statement()
+			self.code.append('jmp ' + end_label)
+		self.code.append(end_label + ':')
+		dispatch = []
+		self.switch_dispatch(dispatch, sorted(cases.items()), default_label)
+		self.code[dispatch_index:dispatch_index] = dispatch
+		return True
+
+	def switch_dispatch(self, code, cases, default_label):
+		"""Jumps to the label of the case matching the accumulator."""
+		if not cases:
+			code.append('jmp ' + default_label)
+			return
+		low = cases[0][0]
+		high = cases[-1][0]
+		# Jump table when at least half of its entries are cases
+		if len(cases) >= 4 and high - low < len(cases) * 2:
+			table_label = self.next_label('switch_table')
+			labels = dict(cases)
+			if low != 0:
+				self.constant_operation(code, 'sub', low)
+			# Values below low wrap around to large unsigned values
+			code.append(f'cmp {self.ax},{high - low}')
+			code.append('ja ' + default_label)
+			pointer = {4: 'dword', 8: 'qword'}[self.word_size]
+			code.append(f'jmp {pointer} [{table_label}+{self.ax}*{self.word_size}]')
+			directive = {4: 'dd', 8: 'dq'}[self.word_size]
+			entries = [labels.get(value, default_label) for value in range(low, high + 1)]
+			self.rodata.append(f'align {self.word_size}')
+			self.rodata.append(f'{table_label} {directive} ' + ', '.join(entries))
+		elif len(cases) <= 3:
+			for value, label in cases:
+				self.constant_operation(code, 'cmp', value)
+				code.append('je ' + label)
+			code.append('jmp ' + default_label)
+		else:
+			# Binary search, each half may again be dense enough for a table
+			middle = len(cases) // 2
+			value, label = cases[middle]
+			upper_label = self.next_label('switch_upper')
+			self.constant_operation(code, 'cmp', value)
+			code.append('je ' + label)
+			code.append('jg ' + upper_label)
+			self.switch_dispatch(code, cases[:middle], default_label)
+			code.append(upper_label + ':')
+			self.switch_dispatch(code, cases[middle + 1:], default_label)
+
+	def constant_operation(self, code, operation, value):
+		"""Applies operation with a constant to the accumulator."""
+		# x86_64 immediates are sign extended 32 bit values
+		if self.word_size == 8 and not -2**31 <= value < 2**31:
+			code.append(f'mov {self.dx},{value}')
+			code.append(f'{operation} {self.ax},{self.dx}')
+		else:
+			code.append(f'{operation} {self.ax},{value}')
+
 	def next_label(self, name):
 		self.label_counters[name] += 1
 		return name + '_' + str(self.label_counters[name])
 
 	def while_statement(self):
+		line_number = self.tokenizer.token_line_number
 		if not self.tokenizer.accept('while'):
 			return False
 		while_start_label = self.next_label('while_start')
 		while_end_label = self.next_label('while_end')
+		loop_start = len(self.code)
 		self.code.append(while_start_label+':')
 		self.expression()
 		self.promote()
-		self.code.append('test eax,eax')
+		self.code.append(f'test {self.ax},{self.ax}')
 		self.code.append('jz '+ while_end_label)
 		self.statement()
 		self.code.append('jmp '+while_start_label)
+		self.frame.loop(loop_start, len(self.code))
 		self.code.append(while_end_label + ':')
+		self.source_line(line_number)
 		return True
 	
 	def repeat_statement(self):
 		if not self.tokenizer.accept('repeat'):
 			return False
 		repeat_start_label = self.next_label('repeat_start')
+		loop_start = len(self.code)
 		self.code.append(repeat_start_label+':')
 		self.statement()
 		if not self.tokenizer.accept('until'):
 			self.fail('expected matching "until" for "repeat" statement')
 		self.expression()
-		self.code.append('test eax,eax')
+		self.code.append(f'test {self.ax},{self.ax}')
 		self.code.append('jz '+ repeat_start_label)
+		self.frame.loop(loop_start, len(self.code))
+		self.source_line(self.tokenizer.previous_line_number)
+		return True
 
 	def for_statement(self):
+		line_number = self.tokenizer.token_line_number
 		if not self.tokenizer.accept('for'):
 			return False
+		if self.optimize >= 2 and self.array_loop():
+			self.source_line(line_number)
+			return True
 		iterator_position = self.stack_position
-		if not self.variable_declaration():
+		# The iterator, end and step are kept next to each other
+		if not self.variable_declaration(reuse=False):
 			self.fail('Could not find variable declaration inside for loop')
 		if not self.tokenizer.accept('in'):
 			self.fail('for loop parsing failed: expected "in" after variable declaration')
@@ -310,41 +928,424 @@ class Compiler:
 		self.binary1()  # end
 		self.code.append('push 1')  # counter
 		self.stack_position += self.word_size
+		self.frame.allocate(self.stack_position)
 		if self.tokenizer.accept(','):
 			self.expression()
-			self.code.append('mov ebx,[esp+'+str(self.stack_position-iterator_position-self.word_size*2)+']')
-			self.code.append('mov [esp+'+str(self.stack_position-iterator_position-self.word_size)+'],ebx')
-			self.code.append('mov [esp+'+str(self.stack_position-iterator_position-self.word_size*2)+'],eax')
+			self.code.append(f'mov {self.bx},[{self.sp}+{self.stack_position-iterator_position-self.word_size*2}]')
+			self.code.append(f'mov [{self.sp}+{self.stack_position-iterator_position-self.word_size}],{self.bx}')
+			self.code.append(f'mov [{self.sp}+{self.stack_position-iterator_position-self.word_size*2}],{self.ax}')
 		if self.tokenizer.accept(','):
 			self.expression()
-			self.code.append('mov [esp+'+str(self.stack_position-iterator_position-self.word_size*3)+'],eax')
+			self.code.append(f'mov [{self.sp}+{self.stack_position-iterator_position-self.word_size*3}],{self.ax}')
 		if not self.tokenizer.accept(')'):
 			self.fail('for loop parsing failed: expected ")" after "range(..."')
 		self.label_counters['for_start'] += 1
 		for_start_label = 'for_start_' + str(self.label_counters['for_start'])
 		self.label_counters['for_end'] += 1
 		for_end_label = 'for_end_' + str(self.label_counters['for_end'])
+		loop_start = len(self.code)
 		self.code.append(for_start_label + ':')
-		self.code.append('mov eax,[esp+'+str(self.stack_position-iterator_position-self.word_size)+']')
-		self.code.append('mov ebx,[esp+'+str(self.stack_position-iterator_position-self.word_size*2)+']')
-		self.code.append('cmp eax,ebx')
+		self.code.append(f'mov {self.ax},[{self.sp}+{self.stack_position-iterator_position-self.word_size}]')
+		self.code.append(f'mov {self.bx},[{self.sp}+{self.stack_position-iterator_position-self.word_size*2}]')
+		self.code.append(f'cmp {self.ax},{self.bx}')
 		self.code.append('je ' + for_end_label)
 		self.statement()
-		self.code.append('mov eax,[esp+'+str(self.stack_position-iterator_position-self.word_size*3)+']')
-		self.code.append('add [esp+'+str(self.stack_position-iterator_position-self.word_size)+'],eax')
+		self.code.append(f'mov {self.ax},[{self.sp}+{self.stack_position-iterator_position-self.word_size*3}]')
+		self.code.append(f'add [{self.sp}+{self.stack_position-iterator_position-self.word_size}],{self.ax}')
 		self.code.append('jmp '+for_start_label)
+		self.frame.loop(loop_start, len(self.code))
 		self.code.append(for_end_label + ':')
 		self.fix_stack(iterator_position)
+		self.source_line(line_number)
+		return True
+
+	def array_loop(self):
+		"""
+		With -O2, compiles "for int i in range(...)" loops whose body is a
+		single statement of the form
+			a[i] = b[i] + c[i] - 1
+			total = total + a[i]
+		with SSE2 instructions, several elements per iteration, and a scalar
+		loop for the remaining elements. Returns False for other loops.
+		"""
+		start = self.tokenizer.save()
+		loop = self.match_array_loop()
+		end = self.tokenizer.save()
+		self.tokenizer.restore(start)
+		if not loop:
+			return False
+		self.variable_declaration_sub('Local')
+		self.tokenizer.accept('in')
+		self.tokenizer.accept('range')
+		self.tokenizer.accept('(')
+		# The index is kept in ax and the end in dx
+		self.expression()
+		if loop['arguments'] > 1:
+			self.binary1()
+			self.tokenizer.accept(',')
+			self.expression()
+		self.promote()
+		self.code.append(f'mov {self.dx},{self.ax}')
+		if loop['arguments'] > 1:
+			self.code.append(f'pop {self.ax}')
+			self.stack_position -= self.word_size
+		else:
+			self.code.append(f'xor {self.ax},{self.ax}')
+		self.tokenizer.restore(end)
+
+		# Pointers are loaded into registers, si and di are kept for the caller
+		stack_position = self.stack_position
+		registers = [self.bx, self.target.si, self.target.di]
+		bases = {}
+		for pointer in loop['pointers']:
+			register = registers[len(bases)]
+			if register != self.bx:
+				self.code.append(f'push {register}')
+				self.stack_position += self.word_size
+			bases[pointer] = register
+		self.frame.allocate(self.stack_position)
+		loop_start = len(self.code)
+		for pointer, register in bases.items():
+			self.code.append(f'mov {register},[{self.variable_address(pointer)}]')
+		if 'accumulator' in loop:
+			self.sum_loop(loop, bases)
+		else:
+			self.map_loop(loop, bases)
+		self.frame.loop(loop_start, len(self.code))
+		for register in reversed(list(bases.values())):
+			if register != self.bx:
+				self.code.append(f'pop {register}')
+		self.stack_position = stack_position
+		return True
+
+	def match_array_loop(self):
+		"""Reads a for loop after "for", describes it when array_loop() can compile it."""
+		tab_level = self.tokenizer.tab_level
+		index_type = self.symbol_table.lookup(self.tokenizer.token_string())
+		if not index_type or index_type.symbol_type != 'Type' or index_type.size != self.word_size:
+			return None
+		self.tokenizer.get_token()
+		index = self.tokenizer.token_string()
+		if not index.isidentifier() or self.symbol_table.lookup(index):
+			return None
+		self.tokenizer.get_token()
+		if not (self.tokenizer.accept('in') and self.tokenizer.accept('range') and self.tokenizer.accept('(')):
+			return None
+		# Tokens of the range() arguments, only a step of 1 is supported
+		arguments = [[]]
+		depth = 0
+		while depth > 0 or not self.tokenizer.peek(')'):
+			token = self.tokenizer.token_string()
+			if not token:
+				return None
+			if token == '(':
+				depth += 1
+			elif token == ')':
+				depth -= 1
+			if token == ',' and depth == 0:
+				arguments.append([])
+			else:
+				arguments[-1].append(token)
+			self.tokenizer.get_token()
+		self.tokenizer.get_token()
+		if [] in arguments or len(arguments) > 3 or arguments[2:] not in [[], [['1']]]:
+			return None
+		if not self.tokenizer.accept(':') or not self.tokenizer.token_newline:
+			return None
+		# The body has to be a single line
+		body_tab_level = self.tokenizer.tab_level
+		if body_tab_level <= tab_level:
+			return None
+		body = []
+		while True:
+			body.append(self.tokenizer.token_string())
+			self.tokenizer.get_token()
+			if self.tokenizer.token_newline:
+				break
+		if self.tokenizer.token_string() and self.tokenizer.tab_level >= body_tab_level:
+			return None
+		loop = self.match_array_statement(body, ['[', index, ']'])
+		if loop:
+			loop['arguments'] = len(arguments)
+		return loop
+
+	def match_array_statement(self, body, element):
+		"""Describes the body of an array loop, element are the tokens of "[i]"."""
+		if body[1:5] == element + ['=']:
+			destination = self.array_variable(body[0])
+			if not destination:
+				return None
+			size = destination.variable_type.size
+			terms = []
+			operators = []
+			k = 5
+			while True:
+				if body[k + 1:k + 4] == element:
+					term = self.array_variable(body[k])
+					if not term or term.variable_type.size != size:
+						return None
+					k += 4
+				elif k < len(body) and body[k].isdigit() and int(body[k]) < 2**31:
+					# Constants wrap around like stores of the element type
+					term = int(body[k]) & ((1 << size * 8) - 1)
+					k += 1
+				else:
+					return None
+				terms.append(term)
+				if k == len(body):
+					break
+				if body[k] not in array_operators:
+					return None
+				operators.append(body[k])
+				k += 1
+			# Only "*" binds tighter, it has to be the single operator
+			if '*' in operators and len(operators) > 1:
+				return None
+			vector = all(size in array_operators[operator][0] for operator in operators)
+			# There is no two operand imul of bytes
+			if not vector and size == 1:
+				return None
+			arrays = [destination] + [term for term in terms if isinstance(term, Variable)]
+			loop = {'destination': destination, 'terms': terms, 'operators': operators, 'size': size, 'vector': vector}
+		elif len(body) == 8 and body[1] == '=' and body[2] == body[0] and body[3] == '+' and body[5:] == element:
+			accumulator = self.symbol_table.lookup(body[0])
+			array = self.array_variable(body[4])
+			if not accumulator or accumulator.symbol_type != 'Variable' or not array:
+				return None
+			if accumulator.pointer_level or accumulator.array_count or not accumulator.variable_type.load:
+				return None
+			# Sums are word sized like the accumulator
+			if accumulator.variable_type.size != self.word_size or array.variable_type.size != self.word_size:
+				return None
+			arrays = [array]
+			loop = {'accumulator': accumulator, 'array': array, 'size': self.word_size}
+		else:
+			return None
+		pointers = []
+		for array in arrays:
+			if array.pointer_level and array not in pointers:
+				pointers.append(array)
+		# Pointers are kept in bx, si and di
+		if len(pointers) > 3:
+			return None
+		loop['pointers'] = pointers
+		return loop
+
+	def array_variable(self, name):
+		"""Array or pointer variable of elements that fit in a register, or None."""
+		variable = self.symbol_table.lookup(name)
+		if not variable or variable.symbol_type != 'Variable':
+			return None
+		pointer = variable.array_count == 0 and variable.pointer_level == 1
+		array = variable.array_count > 0 and variable.pointer_level == 0
+		if not pointer and not array:
+			return None
+		element_type = variable.variable_type
+		if not element_type.load or element_type.size > self.word_size:
+			return None
+		return variable
+
+	def array_element(self, array, bases, displacement=0):
+		"""Operand of the element of array at the index in ax, plus displacement bytes."""
+		if array in bases:
+			base = bases[array]
+		else:
+			base = self.variable_address(array)
+		operand = f'{base}+{self.ax}*{array.variable_type.size}'
+		if displacement:
+			operand += f'+{displacement}'
+		return f'[{operand}]'
+
+	def remaining_check(self, count, label):
+		"""Jumps to label when less than count elements are left."""
+		self.code.append(f'mov {self.cx},{self.dx}')
+		self.code.append(f'sub {self.cx},{self.ax}')
+		self.code.append(f'cmp {self.cx},{count}')
+		self.code.append('jl ' + label)
+
+	def vector_constant(self, value, size):
+		"""Label of an xmm register worth of value."""
+		label = self.next_label('vector_constant')
+		directive = {1: 'db', 2: 'dw', 4: 'dd', 8: 'dq'}[size]
+		self.rodata.append(f'align {vector_size}')
+		self.rodata.append(f'{label} {directive} ' + ', '.join([str(value)] * (vector_size // size)))
+		return label
+
+	def map_loop(self, loop, bases):
+		"""Loop of "a[i] = b[i] + c[i]", vectorized or unrolled, see array_loop()."""
+		size = loop['size']
+		scalar_label = self.next_label('scalar_loop')
+		end_label = self.next_label('array_loop_end')
+		if loop['vector']:
+			self.overlap_checks(loop, bases, scalar_label)
+			constants = {term: self.vector_constant(term, size) for term in loop['terms'] if isinstance(term, int)}
+			vector_label = self.next_label('vector_loop')
+			step = vector_size // size * vector_unroll
+			self.code.append(vector_label + ':')
+			self.remaining_check(step, scalar_label)
+			for unroll in range(vector_unroll):
+				displacement = unroll * vector_size
+				for k, term in enumerate(loop['terms']):
+					register = 'xmm1' if k else 'xmm0'
+					if isinstance(term, int):
+						source = f'[{constants[term]}]'
+					else:
+						source = self.array_element(term, bases, displacement)
+					self.code.append(f'movdqu {register},{source}')
+					if k:
+						instruction = array_operators[loop['operators'][k - 1]][0][size]
+						self.code.append(f'{instruction} xmm0,xmm1')
+				# Stored before the next vector is loaded, see overlap_checks()
+				self.code.append(f'movdqu {self.array_element(loop["destination"], bases, displacement)},xmm0')
+			self.code.append(f'add {self.ax},{step}')
+			self.code.append('jmp ' + vector_label)
+		else:
+			unrolled_label = self.next_label('unrolled_loop')
+			self.code.append(unrolled_label + ':')
+			self.remaining_check(scalar_unroll, scalar_label)
+			for unroll in range(scalar_unroll):
+				self.scalar_element(loop, bases, unroll * size)
+			self.code.append(f'add {self.ax},{scalar_unroll}')
+			self.code.append('jmp ' + unrolled_label)
+		self.code.append(scalar_label + ':')
+		self.code.append(f'cmp {self.ax},{self.dx}')
+		self.code.append('jge ' + end_label)
+		self.scalar_element(loop, bases)
+		self.code.append(f'add {self.ax},1')
+		self.code.append('jmp ' + scalar_label)
+		self.code.append(end_label + ':')
+
+	def scalar_element(self, loop, bases, displacement=0):
+		"""Computes a single element of a map_loop() in cx."""
+		register = self.target.scratch[loop['size']]
+		for k, term in enumerate(loop['terms']):
+			instruction = array_operators[loop['operators'][k - 1]][1] if k else 'mov'
+			if not isinstance(term, int):
+				self.code.append(f'{instruction} {register},{self.array_element(term, bases, displacement)}')
+			elif instruction == 'imul':
+				self.code.append(f'imul {register},{register},{term}')
+			else:
+				self.code.append(f'{instruction} {register},{term}')
+		self.code.append(f'mov {self.array_element(loop["destination"], bases, displacement)},{register}')
+
+	def overlap_checks(self, loop, bases, scalar_label):
+		"""
+		A vector of elements is loaded before any of them is stored, which
+		differs from the scalar loop when the destination starts less than
+		a vector after a source. Pointers may do that, such loops run
+		element by element.
+		"""
+		destination = loop['destination']
+		checked = []
+		for source in loop['terms']:
+			if isinstance(source, int) or source is destination or source in checked:
+				continue
+			if source not in bases and destination not in bases:
+				continue
+			checked.append(source)
+			# Distance of the destination after the source in cx
+			if source in bases:
+				if destination in bases:
+					self.code.append(f'mov {self.cx},{bases[destination]}')
+				else:
+					self.code.append(f'lea {self.cx},[{self.variable_address(destination)}]')
+				self.code.append(f'sub {self.cx},{bases[source]}')
+			else:
+				self.code.append(f'lea {self.cx},[{self.variable_address(source)}]')
+				self.code.append(f'sub {self.cx},{bases[destination]}')
+				self.code.append(f'neg {self.cx}')
+			self.code.append(f'sub {self.cx},1')
+			self.code.append(f'cmp {self.cx},{vector_size - 1}')
+			self.code.append('jb ' + scalar_label)
+
+	def sum_loop(self, loop, bases):
+		"""Loop of "total = total + a[i]", one partial sum per xmm register, see array_loop()."""
+		array = loop['array']
+		add = array_operators['+'][0][loop['size']]
+		vector_label = self.next_label('vector_loop')
+		sum_label = self.next_label('vector_sum')
+		scalar_label = self.next_label('scalar_loop')
+		end_label = self.next_label('array_loop_end')
+		step = vector_size // loop['size'] * vector_unroll
+		for unroll in range(vector_unroll):
+			self.code.append(f'pxor xmm{unroll},xmm{unroll}')
+		self.code.append(vector_label + ':')
+		self.remaining_check(step, sum_label)
+		for unroll in range(vector_unroll):
+			register = f'xmm{vector_unroll + unroll}'
+			self.code.append(f'movdqu {register},{self.array_element(array, bases, unroll * vector_size)}')
+			self.code.append(f'{add} xmm{unroll},{register}')
+		self.code.append(f'add {self.ax},{step}')
+		self.code.append('jmp ' + vector_label)
+		self.code.append(sum_label + ':')
+		for unroll in range(1, vector_unroll):
+			self.code.append(f'{add} xmm0,xmm{unroll}')
+		# Adds the upper half to the lower half, then the odd dwords to the even ones
+		self.code.append('pshufd xmm1,xmm0,78')
+		self.code.append(f'{add} xmm0,xmm1')
+		if loop['size'] == 4:
+			self.code.append('pshufd xmm1,xmm0,177')
+			self.code.append(f'{add} xmm0,xmm1')
+		accumulator = self.variable_address(loop['accumulator'])
+		self.code.append(f'{self.target.vector_to_word} {self.cx},xmm0')
+		self.code.append(f'add [{accumulator}],{self.cx}')
+		self.code.append(scalar_label + ':')
+		self.code.append(f'cmp {self.ax},{self.dx}')
+		self.code.append('jge ' + end_label)
+		self.code.append(f'mov {self.cx},{self.array_element(array, bases)}')
+		self.code.append(f'add [{accumulator}],{self.cx}')
+		self.code.append(f'add {self.ax},1')
+		self.code.append('jmp ' + scalar_label)
+		self.code.append(end_label + ':')
+
+	def tail_call(self):
+		# "return f(...)": replace the call with a jump that reuses the frame
+		call = self.last_call
+		self.last_call = None
+		if not call or call['end'] != len(self.code):
+			return False
+		# The caller of this function removes our stack arguments on return,
+		# so the callee has to take either none or exactly as many
+		stack_arguments = call['stack_arguments']
+		if stack_arguments != 0 and stack_arguments != self.current_function.stack_argument_size:
+			return False
+		# Addresses of the frame may be passed along, it has to stay alive
+		if self.frame.address_taken:
+			return False
+		del self.code[call['index']:]
+		self.stack_position = call['stack_position']
+		# Overwrite our incoming arguments with the new ones,
+		# they are located above the return address
+		for offset in range(0, stack_arguments, self.word_size):
+			self.code.append(f'mov {self.bx},[{self.sp}+{offset}]')
+			self.code.append(f'mov [{self.sp}+{self.stack_position+self.word_size+offset}],{self.bx}')
+		self.fix_stack()
+		if self.current_function.profile_label:
+			# This call ends here, keep the register arguments of the callee
+			registers = self.call_registers(call['function'])
+			for register in registers:
+				self.code.append('push ' + register)
+			self.code.extend(self.target.profile_exit(self.current_function.profile_label, self.next_label('profile_exit')))
+			for register in reversed(registers):
+				self.code.append('pop ' + register)
+		self.code.append('jmp ' + call['function'].label)
 		return True
 
 	def fix_stack(self, stack_position=0):
 		if self.stack_position > stack_position:
-			self.code.append('add esp,' + str(self.stack_position - stack_position))
+			self.code.append(f'add {self.sp},{self.stack_position - stack_position}')
 			self.stack_position = stack_position
 
+	def previous_declaration(self, name):
+		"""Symbol a new declaration of name clashes with, symbols of the runtime can be shadowed."""
+		symbol = self.symbol_table.lookup(name)
+		if symbol is not None and self.runtime_symbols.get(name) is symbol:
+			return None
+		return symbol
+
 	def identifier_name(self):
 		name = self.tokenizer.token_string()
-		identifier = self.symbol_table.lookup(name)
+		identifier = self.previous_declaration(name)
 		if identifier:
 			# TODO: add more descriptive error message
 			# including where the variable is previously declared
@@ -357,7 +1358,15 @@ class Compiler:
 		if not symbol_type or symbol_type.symbol_type != 'Type':
 			return False
 		self.tokenizer.get_token()
+		pointer_level, array_count = self.variable_type_suffix()
+		name = self.identifier_name()
+		variable = Variable(name, symbol_type, variable_type, pointer_level=pointer_level, array_count=array_count)
+		self.current_variable = variable
+		self.symbol_table.declare(variable)
+		self.current_variable = variable
+		return True
 
+	def variable_type_suffix(self):
 		# pointer indirection "*"
 		pointer_level = 0
 		while self.tokenizer.accept('*'):
@@ -370,35 +1379,51 @@ class Compiler:
 			self.tokenizer.get_token()
 			if not self.tokenizer.accept(']'):
 				self.fail('Misisng closing bracket "]" in array variable declaration')
+		return pointer_level, array_count
 
-		name = self.identifier_name()
-		variable = Variable(name, symbol_type, variable_type, pointer_level=pointer_level, array_count=array_count)
-		self.current_variable = variable
-		self.symbol_table.declare(variable)
-		self.current_variable = variable
-		return True
-
-	def variable_declaration(self):
+	def variable_declaration(self, reuse=True):
 		if not self.variable_declaration_sub('Local'):
 			return False
 		
 		variable = self.current_variable
+		scalar = variable.array_count == 0 and variable.variable_type.sub_type != 'struct'
+		reusable = reuse and scalar and (variable.pointer_level > 0 or variable.variable_type.size <= self.word_size)
+		host = self.frame.declare(variable, reusable)
+		if host:
+			# Takes over the slot of a local that is no longer used
+			address = self.variable_address(host)
+			if self.tokenizer.accept('='):
+				self.expression()
+				self.promote()
+				self.frame.initialize(variable, len(self.code))
+				self.code.append(f'mov [{address}],{self.ax}')
+				self.expect_end()
+			else:
+				self.frame.initialize(variable, len(self.code))
+				self.code.append(f'mov {self.target.word_name} [{address}],0')
+			variable.stack_position = host.stack_position
+			return True
 		# assignment
 		if self.tokenizer.accept('='):
-			assert(variable.variable_type.size == self.word_size)  # TODO: remove this for a more generic solution
+			assert(variable.pointer_level > 0 or variable.variable_type.size <= self.word_size)  # TODO: remove this for a more generic solution
 			self.expression()
+			self.promote()
+			self.frame.initialize(variable, len(self.code))
 			self.binary1()
 			self.expect_end()
 		else:
+			self.frame.initialize(variable, len(self.code))
 			# this is a bit of a hack, large stack arrays will have tons of push 0's
 			# a better solution would be to 'sub esp,type.size' then zero the memory using memset
 			size = 0
-			total_size = variable.variable_type.size * max(variable.array_count, 1)
+			# Slots are whole words, which keeps every variable aligned
+			total_size = self.aligned(variable.variable_type.size * max(variable.array_count, 1), self.word_size)
 			while size < total_size:
 				self.code.append('push 0')
 				self.stack_position += self.word_size
 				size += self.word_size
 		variable.stack_position = self.stack_position
+		self.frame.allocate(self.stack_position)
 		return True
 	
 	def stack_allocate(self, size):
@@ -408,126 +1433,117 @@ class Compiler:
 		self.assignment_expression()
 
 	def assignment_expression(self):
-		self.equality_expression()
+		self.binary_expression(0)
 		if self.tokenizer.accept('='):
 			# TODO: assert current_identifier is a variable
 			identifier = self.current_identifier
 			pointer_dereference = self.pointer_dereference
 			self.pointer_dereference = 0
-			if self.array_assignment:
-				self.binary1()
+			access = self.memory_access
+			self.memory_access = None
+			self.current_field = None
+			if access and access['index']:
+				# keep the index while the value is computed
+				self.code.append(f'push {self.ax}')
+				self.stack_position += self.word_size
 			self.expression()
-			if self.array_assignment:
-				# this is duplicate inside assign_to_identifier()
-				self.binary2_pop()
-				print('assignment_expression', identifier)
-				if identifier.variable_type.size == 1:
-					self.code.append('mov [ebx],al')
-				elif identifier.variable_type.size == 2:
-					self.code.append('mov [ebx],ax')
-				elif identifier.variable_type.size == 4:
-					self.code.append('mov [ebx],eax')
-				else:
-					self.fail('variable type size {identifier.variable_type.size} not implemented')
+			self.promote()
+			if access:
+				self.store_memory(access)
 			else:
 				self.assign_to_identifier(identifier, pointer_dereference)
 
 
-	def equality_expression(self):
-		self.relational_expression()
-		if self.tokenizer.accept('=='):
-			self.equality_code('sete')
-		if self.tokenizer.accept('!='):
-			self.equality_code('setne')
+	def binary_expression(self, min_precedence):
+		"""Precedence climbing over the binary_operators table."""
+		self.unary_expression()
+		while True:
+			operator = binary_operators.get(self.tokenizer.token_string())
+			if operator is None or operator[0] < min_precedence:
+				return
+			self.tokenizer.get_token()
+			precedence, emit, operation = operator
+			self.binary1()
+			left_type = self.value_type
+			code_index = len(self.code)
+			# Operators of the same precedence are left associative
+			self.binary_expression(precedence + 1)
+			self.promote()
+			getattr(self, emit)(operation, left_type, code_index)
 
-	def relational_sub(self, operation, target_rule):
-		self.binary1()
-		target_rule()
+	def compare_code(self, operation, left_type, code_index):
 		self.binary2_pop()
-		self.code.append('cmp ebx,eax')
+		if self.unsigned(left_type, self.value_type):
+			operation = unsigned_conditions.get(operation, operation)
+		self.code.append(f'cmp {self.bx},{self.ax}')
 		self.code.append(operation + ' al')
-		self.code.append('movzx eax,al')
-
-	def equality_code(self, operation):
-		self.relational_sub(operation, self.relational_expression)
-
-	def relational_code(self, operation):
-		self.relational_sub(operation, self.additive_expression)
-
-	def relational_expression(self):
-		self.additive_expression()
-		if self.tokenizer.accept('<'):
-			self.relational_code('setl')
-		elif self.tokenizer.accept('<='):
-			self.relational_code('setle')
-		elif self.tokenizer.accept('>'):
-			self.relational_code('setg')
-		elif self.tokenizer.accept('>='):
-			self.relational_code('setge')
+		self.code.append(f'movzx {self.ax},al')
+		self.value_type = None
 
 	def binary1(self):
 		self.promote()
-		self.code.append('push eax')
+		self.code.append(f'push {self.ax}')
 		self.stack_position += self.word_size
 
 	def binary2_pop(self):
-		self.promote()
-		self.code.append('pop ebx')
+		self.code.append(f'pop {self.bx}')
 		self.stack_position -= self.word_size
 
-	def additive_expression(self):
-		self.multiplicative_expression()
-		while True:
-			if self.tokenizer.accept('+'):
-				self.binary1()
-				self.multiplicative_expression()
-				self.binary2_pop()
-				self.code.append('add eax,ebx')
-			elif self.tokenizer.accept('-'):
-				self.binary1()
-				self.multiplicative_expression()
-				self.binary2_pop()
-				self.code.append('sub ebx,eax')
-				self.code.append('mov eax,ebx')
+	def arithmetic_code(self, operation, left_type, code_index):
+		self.binary2_pop()
+		if operation == 'sub':
+			self.code.append(f'sub {self.bx},{self.ax}')
+			self.code.append(f'mov {self.ax},{self.bx}')
+		else:
+			self.code.append(f'{operation} {self.ax},{self.bx}')
+		self.arithmetic_type(left_type)
+
+	def division_code(self, operation, left_type, code_index):
+		remainder = operation == 'mod'
+		unsigned = self.unsigned(left_type, self.value_type)
+		divisor = self.constant_code(code_index)
+		if unsigned and divisor and divisor & (divisor - 1) == 0:
+			# Unsigned division by a power of two is a shift or a mask
+			del self.code[code_index:]
+			self.code.append(f'pop {self.ax}')
+			if remainder:
+				self.constant_operation(self.code, 'and', divisor - 1)
 			else:
-				return
-	
-	def multiplicative_expression(self):
-		self.unary_expression()
-		while True:
-			if self.tokenizer.accept('*'):
-				self.binary1()
-				self.unary_expression()
-				self.binary2_pop()
-				self.code.append('imul eax,ebx')
-			elif self.tokenizer.accept('/'):
-				self.binary1()
-				self.unary_expression()
-				self.code.extend([
-					'mov ebx,eax',
-					'pop eax',
-					'xor edx,edx',
-					'idiv ebx',
-				])
-				self.stack_position -= self.word_size
-			elif self.tokenizer.accept('%'):
-				self.binary1()
-				self.unary_expression()
-				self.code.extend([
-					'mov ebx,eax',
-					'pop eax',
-					'xor edx,edx',
-					'idiv ebx',
-					'mov eax,edx',
-				])
-				self.stack_position -= self.word_size
+				self.code.append(f'shr {self.ax},{divisor.bit_length() - 1}')
+		else:
+			self.code.extend([
+				f'mov {self.bx},{self.ax}',
+				f'pop {self.ax}',
+			])
+			if unsigned:
+				self.code.append(f'xor {self.dx},{self.dx}')
+				self.code.append(f'div {self.bx}')
 			else:
-				return
+				self.code.append(self.target.sign_extend)
+				self.code.append(f'idiv {self.bx}')
+			if remainder:
+				self.code.append(f'mov {self.ax},{self.dx}')
+		self.stack_position -= self.word_size
+		self.arithmetic_type(left_type)
+
+	def unsigned(self, *value_types):
+		"""Word sized unsigned operands make an operation unsigned, smaller ones are promoted to int."""
+		for value_type in value_types:
+			if value_type and not value_type.signed and value_type.size >= self.word_size:
+				return True
+		return False
+
+	def arithmetic_type(self, left_type):
+		"""Sets the type of the result of a binary operation."""
+		if self.unsigned(left_type, self.value_type):
+			self.value_type = self.symbol_table.lookup('uint')
+		else:
+			self.value_type = None
 
 	def unary_expression(self):
 		# TODO: convert these to elif chain?
-		if self.tokenizer.accept('&'):
-			self.address_of = True
+		address_of = self.tokenizer.accept('&')
+		self.address_of = address_of
 		while self.tokenizer.accept('@'):
 			self.pointer_dereference += 1
 		if self.tokenizer.accept('!'):
@@ -535,38 +1551,70 @@ class Compiler:
 			# should it be expression?
 			# c uses cast-expression
 			# gut says expression
-			self.multiplicative_expression()
-			self.code.append('not eax')
+			self.binary_expression(binary_operators['*'][0])
+			self.code.append(f'not {self.ax}')
 			return
 		self.postfix_expression()
+		# The index expression may have reset self.address_of
+		if address_of and self.memory_access:
+			# "&arr[i]" and "&s.x"
+			access = self.memory_access
+			self.memory_access = None
+			self.current_field = None
+			self.pointer_dereference = 0
+			self.load_memory_base(access, self.bx)
+			if access['base'] == 'variable':
+				self.frame.pin(access['identifier'])
+			self.code.append(f'lea {self.ax},' + self.memory_operand(access, self.bx, self.ax))
+			self.value_type = self.pointer_type
 		self.address_of = False
 
+	def load(self, operand, value_type):
+		if value_type.load is None:
+			self.fail(f'load not implemented for type.size=={value_type.size}')
+		self.code.append(value_type.load.format(operand))
+		self.value_type = value_type
+
+	def store(self, operand, value_type):
+		if value_type.store is None:
+			self.fail(f'store not implemented for type.size=={value_type.size}')
+		self.code.append(value_type.store.format(operand))
+
+	def load_memory_base(self, access, register):
+		# Pointers need their value in a register to be used as the base
+		if access['base'] == 'pointer':
+			address = self.variable_address(access['identifier'])
+			self.code.append(f'mov {register},[{address}]')
+
+	def memory_operand(self, access, base_register, index_register):
+		if access['base'] == 'variable':
+			address = self.variable_address(access['identifier'], access['displacement'])
+			operand = address
+		else:
+			operand = base_register
+			if access['displacement']:
+				operand += '+' + str(access['displacement'])
+		if access['index']:
+			operand += '+' + index_register + '*' + str(access['scale'])
+		return '[' + operand + ']'
+
+	def store_memory(self, access):
+		if access['index']:
+			self.code.append(f'pop {self.bx}')
+			self.stack_position -= self.word_size
+		self.load_memory_base(access, self.cx)
+		self.store(self.memory_operand(access, self.cx, self.bx), access['type'])
+
 	def promote(self):
 		if self.pointer_dereference:
-			if self.current_field:
-					stack_position = self.identifier_stack_position(self.current_identifier)
-					stack_position += self.current_field.offset
-					if self.current_field.field_type.size == 1:
-						self.code.append('mov al,[esp+' + str(stack_position) + ']')
-						self.code.append('movzx eax,al')
-					elif self.current_field.field_type.size == 2:
-						self.code.append('mov ax,[esp+' + str(stack_position) + ']')
-						self.code.append('movzx eax,ax')
-					elif self.current_field.field_type.size == 4:
-						self.code.append('mov eax,[esp+' + str(stack_position) + ']')
-					else:
-						self.fail('variable type size {identifier.variable_type.size} not implemented')
+			if self.memory_access:
+				access = self.memory_access
+				self.memory_access = None
+				self.current_field = None
+				self.load_memory_base(access, self.bx)
+				self.load(self.memory_operand(access, self.bx, self.ax), access['type'])
 			else:
-				if self.current_identifier.variable_type.size == 4:
-					self.code.append('mov eax,[eax]')
-				elif self.current_identifier.variable_type.size == 2:
-					self.code.append('mov ax,[eax]')
-					self.code.append('movzx eax,ax')
-				elif self.current_identifier.variable_type.size == 1:
-					self.code.append('mov al,[eax]')
-					self.code.append('movzx eax,al')
-				else:
-					self.fail(f'promote() not implemented pointer dereference for type.size=={self.current_identifier.variable_type.size}')
+				self.load(f'[{self.ax}]', self.current_identifier.variable_type)
 			self.pointer_dereference = 0
 
 	def postfix_expression(self):
@@ -575,51 +1623,171 @@ class Compiler:
 			identifier = self.current_identifier
 			# TODO: make sure last_identifier is callable
 			stack_position = self.stack_position
+			arguments_index = len(self.code)
+			# Values of constant arguments, None for the others
+			constants = []
 			if not self.tokenizer.accept(')'):
 				# this would be nice to have in a repeat..until
-				self.expression()
-				self.binary1()
+				constants.append(self.call_argument(identifier, len(constants)))
 				while self.tokenizer.accept(','):
-					self.expression()
-					self.binary1()
+					constants.append(self.call_argument(identifier, len(constants)))
 				self.tokenizer.expect(')')
-			self.code.append('call ' + identifier.name)
-			self.fix_stack(stack_position)
+			argument_count = len(constants)
+			value = self.evaluate_call(identifier, constants)
+			if value is not None:
+				# The call is replaced by its result
+				del self.code[arguments_index:]
+				self.stack_position = stack_position
+				self.code.append(f'mov {self.ax},{value}')
+				self.last_call = None
+			else:
+				stack_arguments = self.load_argument_registers(identifier, argument_count, stack_position)
+				call_index = len(self.code)
+				call_stack_position = self.stack_position
+				self.code.append('call ' + identifier.label)
+				self.fix_stack(stack_position)
+				if self.current_function and identifier not in self.current_function.callees:
+					self.current_function.callees.append(identifier)
+				self.last_call = {
+					'function': identifier,
+					'index': call_index,
+					'end': len(self.code),
+					'stack_position': call_stack_position,
+					'stack_arguments': stack_arguments,
+				}
+			self.value_type = None
+			if isinstance(identifier.return_type, Type) and identifier.return_type.load:
+				self.value_type = identifier.return_type
 		elif self.tokenizer.accept('['):
 			identifier = self.current_identifier
 			# TODO: make sure identifier is indexable
-			self.binary1()
+			# The base address is folded into the memory operand
+			del self.code[self.identifier_code_index:]
+			index_code_index = len(self.code)
 			self.expression()
+			self.promote()
 
 			# The following is needed because we could have an identifier inside
 			# the postfix expression e.g. arr[i]
 			self.current_identifier = identifier
-			if identifier.variable_type.size > 1:
-				self.code.append('shl eax,' + str(int(log2(identifier.variable_type.size))))
-			self.binary2_pop()
-			self.code.append('add eax,ebx')
-			self.pointer_dereference = 1
-			self.array_assignment = True
+			element_type = self.element_type(identifier)
+			size = element_type.size
+			access = {
+				'identifier': identifier,
+				'base': 'variable' if identifier.array_count > 0 else 'pointer',
+				'index': True,
+				'scale': size,
+				'displacement': 0,
+				'type': element_type,
+			}
+			constant = self.constant_code(index_code_index)
+			if constant is not None:
+				del self.code[index_code_index:]
+				access['index'] = False
+				access['displacement'] = constant * size
+			elif size not in [1, 2, 4, 8]:
+				self.code.append(f'imul {self.ax},{self.ax},{size}')
+				access['scale'] = 1
 			if not self.tokenizer.accept(']'):
 				self.fail('Expected closing "]" for index expression')
+			if self.tokenizer.accept('.'):
+				# arr[i].x
+				field = self.struct_field(identifier)
+				access['displacement'] += field.offset
+				access['type'] = field.field_type
+				self.current_field = field
+			self.memory_access = access
+			self.pointer_dereference = 1
 		elif self.tokenizer.accept('.'):
 			identifier = self.current_identifier
-			# TODO: make sure identifier is dottable
-			if not identifier.variable_type.sub_type == 'struct':
-				self.fail(f'{identifier.name} is not a struct, cannot use "."')
-			name = self.identifier_name()
-			field = None
-			for f in identifier.variable_type.fields:
-				if f.name == name:
-					field = f
-					break
-			if not field:
-				self.fail(f'field "{name}" not found in struct {identifier.name}')
-			# self.field_stack_position = self.identifier_stack_position(identifier) + field.offset
-			# self.code.append(f'lea eax,[esp+{field_stack_position}]')
+			field = self.struct_field(identifier)
+			del self.code[self.identifier_code_index:]
 			self.current_field = field
+			self.memory_access = {
+				'identifier': identifier,
+				'base': 'pointer' if identifier.pointer_level > 0 else 'variable',
+				'index': False,
+				'scale': 1,
+				'displacement': field.offset,
+				'type': field.field_type,
+			}
 			self.pointer_dereference = 1
 
+	def struct_field(self, identifier):
+		# TODO: make sure identifier is dottable
+		if not identifier.variable_type.sub_type == 'struct':
+			self.fail(f'{identifier.name} is not a struct, cannot use "."')
+		name = self.tokenizer.token_string()
+		self.tokenizer.get_token()
+		for field in identifier.variable_type.fields:
+			if field.name == name:
+				return field
+		self.fail(f'field "{name}" not found in struct {identifier.name}')
+
+	def element_type(self, identifier):
+		# Indexing a pointer removes one level of indirection
+		pointer_level = identifier.pointer_level
+		if identifier.array_count == 0:
+			pointer_level -= 1
+		if pointer_level > 0:
+			return self.pointer_type
+		return identifier.variable_type
+
+	def constant_code(self, code_index):
+		"""Returns the value if the code since code_index only loads an int literal."""
+		if len(self.code) != code_index + 1:
+			return None
+		line = self.code[code_index]
+		if not line.startswith(f'mov {self.ax},'):
+			return None
+		try:
+			return int(line[len(f'mov {self.ax},'):])
+		except ValueError:
+			return None
+
+	def call_registers(self, function):
+		if function.calling_convention == 'fastcall':
+			return self.argument_registers
+		return []
+
+	def call_argument(self, function, index):
+		"""Returns the value of a constant argument, None for others."""
+		code_index = len(self.code)
+		self.expression()
+		constant = self.constant_code(code_index)
+		if index == 0 and function.name in self.syscall_stubs and self.target.syscall_numbers:
+			# The i386 numbers of w programs are translated at compile time
+			if constant is None:
+				self.fail(f'{function.name} needs a constant syscall number on {self.target.name}')
+			if constant not in self.target.syscall_numbers:
+				self.fail(f'syscall {constant} is not supported on {self.target.name}')
+			self.code[code_index] = f'mov {self.ax},{self.target.syscall_number(constant)}'
+		registers = self.call_registers(function)
+		# The last argument of a fastcall function that takes
+		# all arguments in registers goes straight into its register
+		if index < len(registers) and index == len(function.arguments) - 1:
+			self.promote()
+			self.code.append(f'mov {registers[index]},{self.ax}')
+		else:
+			self.binary1()
+		return constant
+
+	def load_argument_registers(self, function, argument_count, stack_position):
+		"""Returns the size of the arguments passed on the stack."""
+		registers = self.call_registers(function)[0:argument_count]
+		if argument_count <= len(registers):
+			# Only register arguments, the last one is already in place
+			for register in reversed(registers[0:argument_count-1]):
+				self.code.append('pop ' + register)
+				self.stack_position -= self.word_size
+			return 0
+		# Register arguments were pushed before the stack arguments,
+		# their slots are left behind and cleaned up by the caller
+		for i, register in enumerate(registers):
+			offset = self.stack_position - stack_position - (i + 1) * self.word_size
+			self.code.append(f'mov {register},[{self.sp}+{offset}]')
+		return (argument_count - len(registers)) * self.word_size
+
 	def identifier_stack_position(self, identifier):
 		if identifier.symbol_type == 'Variable':
 			# print(f'identifier: {identifier.name} identifier.stack_position: {identifier.stack_position} self.stack_position: {self.stack_position}')
@@ -634,57 +1802,58 @@ class Compiler:
 				# and then adjust the -word_size in function()
 			return stack_position
 
+	def variable_address(self, identifier, displacement=0):
+		"""Address of a variable's storage, to be used inside "[]"."""
+		if identifier.sub_type == 'Global':
+			if displacement:
+				return identifier.label + '+' + str(displacement)
+			return identifier.label
+		self.frame.use(identifier, len(self.code))
+		stack_position = self.identifier_stack_position(identifier)
+		return f'{self.sp}+{stack_position + displacement}'
+
 	def assign_to_identifier(self, identifier, pointer_dereference):
 		if identifier.symbol_type == 'Variable':
-			stack_position = self.identifier_stack_position(identifier)
-			if identifier.sub_type == 'Local' or identifier.sub_type == 'Argument':
-				if self.current_field:
-					stack_position += self.current_field.offset
-					if self.current_field.field_type.size == 1:
-						self.code.append('mov [esp+' + str(stack_position) + '],al')
-					elif self.current_field.field_type.size == 2:
-						self.code.append('mov [esp+' + str(stack_position) + '],ax')
-					elif self.current_field.field_type.size == 4:
-						self.code.append('mov [esp+' + str(stack_position) + '],eax')
-					else:
-						self.fail('variable type size {identifier.variable_type.size} not implemented')
-				elif pointer_dereference > 0:
-					self.code.append('mov ebx,[esp+' + str(stack_position) + ']')
-					for i in range(pointer_dereference-1):
-						self.code.append('mov ebx,[ebx]')
-					print('assign_to_identifier', identifier)
-					if identifier.variable_type.size == 1:
-						self.code.append('mov [ebx],al')
-					elif identifier.variable_type.size == 2:
-						self.code.append('mov [ebx],ax')
-					elif identifier.variable_type.size == 4:
-						self.code.append('mov [ebx],eax')
-					else:
-						self.fail('variable type size {identifier.variable_type.size} not implemented')
-				else:
-					self.code.append('mov [esp+' + str(stack_position) + '],eax')
+			address = self.variable_address(identifier)
+			if pointer_dereference > 0:
+				self.code.append(f'mov {self.bx},[{address}]')
+				for i in range(pointer_dereference-1):
+					self.code.append(f'mov {self.bx},[{self.bx}]')
+				self.store(f'[{self.bx}]', identifier.variable_type)
+			else:
+				self.code.append(f'mov [{address}],{self.ax}')
 
 	def code_for_identifier(self, identifier):
 		if identifier.symbol_type == 'Function':
 			# self.code.append('mov eax,' + identifier.name)
 			pass
 		elif identifier.symbol_type == 'Variable':
-			if identifier.sub_type == 'Local' or identifier.sub_type == 'Argument':
-				stack_position = self.identifier_stack_position(identifier)
-				if self.address_of or identifier.array_count > 0:
-					self.code.append('lea eax,[esp+' + str(stack_position) + ']')
-				else:
-					self.code.append('mov eax,[esp+' + str(stack_position) + ']')
-			# mov eax,[0x402000]  # global variable
+			self.identifier_code_index = len(self.code)
+			address = self.variable_address(identifier)
+			variable_type = identifier.variable_type
+			if self.address_of or identifier.array_count > 0:
+				self.frame.pin(identifier)
+				self.code.append(f'lea {self.ax},[{address}]')
+				self.value_type = self.pointer_type
+			elif identifier.pointer_level > 0:
+				self.code.append(f'mov {self.ax},[{address}]')
+				self.value_type = self.pointer_type
+			elif variable_type.load and variable_type.size < self.word_size:
+				# Small values are extended from the low bytes of their slot
+				self.load(f'[{address}]', variable_type)
+			else:
+				self.code.append(f'mov {self.ax},[{address}]')
+				self.value_type = variable_type if variable_type.load else None
 		else:
 			self.fail('Unprocesed symbol_type: ' + identifier.symbol_type)
 
 	def primary_expression(self):
+		self.value_type = None
 		if self.int_literal():
 			pass
 
 		elif self.string_literal():
-			pass
+			self.value_type = self.pointer_type
 
 		elif self.identifier():
 			self.code_for_identifier(self.current_identifier)
@@ -738,7 +1907,7 @@ class Compiler:
 		if negative:
 			n = 0 - n
 
-		self.code.append('mov eax,' + str(n))
+		self.code.append(f'mov {self.ax},{n}')
 		return True
 
 	def process_string(self, token):
@@ -750,12 +1919,12 @@ class Compiler:
 			if token[i] == '\\':
 				if token[i+1] == '\\':
 					string.append('\\')
-				elif token[i+1] == 'n':
+				elif token[i+1] in string_escapes:
 					if quote:
 						quote = False
 						string.append('"')
 					string.append(', ')
-					string.append('0ah')
+					string.append(string_escapes[token[i+1]])
 				#elif token[i+1] == 'x':
 				else:
 					self.fail('Unrecognized string escape character "' + token[i+1] + '"')
@@ -779,9 +1948,10 @@ class Compiler:
 		if self.tokenizer.token and self.tokenizer.token[0] == '"':
 			# Process string with \ formatting
 			string, length = self.process_string(self.tokenizer.token_string())
-			self.code.append('call $ + ' + str(length+1+self.word_size))
+			# call over the string to push its address, call rel32 is 5 bytes
+			self.code.append('call $ + ' + str(length+5))
 			self.code.append('db ' + string)
-			self.code.append('pop eax')
+			self.code.append(f'pop {self.ax}')
 			return True
 		return False
 
@@ -800,19 +1970,112 @@ class Compiler:
 		asm = '\n'.join(self.code)
 		f.write(asm)
 		f.close()
+		if self.line_table is not None:
+			self.output_line_table(output_filename[:-len('.asm')] + '.lines')
+
+	def output_line_table(self, filename):
+		"""
+		Sidecar of the executable with one "line <file> <line> <function>"
+		record per entry of w_line_table, files are numbered in order of
+		their "file <path>" records.
+		"""
+		files = {}
+		lines = ['w line table 1']
+		for label, source, line, function in self.line_table:
+			if source not in files:
+				files[source] = len(files)
+				lines.append(f'file {source}')
+		for label, source, line, function in self.line_table:
+			lines.append(f'line {files[source]} {line} {function}')
+		f = open(filename, 'w', encoding='utf8')
+		f.write('\n'.join(lines) + '\n')
+		f.close()
 
 
 def main(argv):
-	if len(argv) < 2:
+	filename = None
+	target = 'x86'
+	runtime = True
+	line_table = False
+	instrument = False
+	watch_mode = False
+	optimize = 0
+	i = 1
+	while i < len(argv):
+		if argv[i] == '--target' and i + 1 < len(argv):
+			i += 1
+			target = argv[i]
+		elif argv[i] == '--no-runtime':
+			runtime = False
+		elif argv[i] == '--line-table':
+			line_table = True
+		elif argv[i] == '--instrument':
+			instrument = True
+		elif argv[i] == '--watch':
+			watch_mode = True
+		elif argv[i] in ['-O0', '-O1', '-O2']:
+			optimize = int(argv[i][2:])
+		else:
+			filename = argv[i]
+		i += 1
+	if not filename:
 		print('Please provide file to compile')
 		print('For example:')
 		print('  $ python w.py w.test')
+		print('  $ python w.py --target x86_64 w.test')
+		print('  $ python w.py --line-table w.test  # for profiling with wprof.py')
+		print('  $ python w.py --instrument w.test  # call counts and cycles on stderr')
+		print('  $ python w.py --watch w.test  # recompile changed functions on save')
+		print('  $ python w.py -O2 w.test  # vectorize and unroll simple array loops')
 		return
-	filename = argv[1]
-	compiler = Compiler(filename)
+	if target not in targets:
+		print('Unknown target "' + target + '", expected one of: ' + ', '.join(targets))
+		return
+	if instrument and not runtime:
+		print('--instrument needs the runtime prelude to write out the counters')
+		return
+	if watch_mode:
+		watch(filename, target, runtime, line_table, instrument, optimize)
+		return
+	compiler = Compiler(filename, target, runtime, line_table, instrument, optimize=optimize)
 	compiler.compile()
 	compiler.output_asm()
 
 
+def watch(filename, target, runtime, line_table, instrument, optimize=0):
+	"""Rebuilds the asm whenever the source or the runtime prelude is saved."""
+	unit_cache = UnitCache()
+	filenames = [filename]
+	if runtime:
+		filenames.append(runtime_filename)
+	modified = None
+	try:
+		while True:
+			try:
+				current = [os.stat(name).st_mtime_ns for name in filenames]
+			except FileNotFoundError:
+				# Editors may replace the file on save
+				current = modified
+			if current != modified:
+				modified = current
+				unit_cache.units = 0
+				unit_cache.recompiled = 0
+				start = time.perf_counter()
+				compiler = Compiler(filename, target, runtime, line_table, instrument, unit_cache, optimize)
+				try:
+					compiler.compile()
+					compiler.output_asm()
+					elapsed = (time.perf_counter() - start) * 1000
+					print(f'Built in {elapsed:.1f} ms, compiled {unit_cache.recompiled} of {unit_cache.units} declarations')
+				except SystemExit:
+					print('Waiting for changes')
+				except Exception as error:
+					print('Compilation failed:', error)
+					print('Waiting for changes')
+			time.sleep(0.2)
+	except KeyboardInterrupt:
+		pass
+
+
 if __name__ == '__main__':
 	main(sys.argv)
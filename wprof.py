@@ -0,0 +1,189 @@
+"""
+Sampling profiler for programs compiled with "w.py --line-table".
+
+	$ python w.py --line-table tests/for3.w
+	$ fasm tests/bin/for3.asm
+	$ python wprof.py tests/bin/for3 [arguments]
+
+The program is started under ptrace and stopped at a fixed interval to read
+its instruction pointer. Samples are mapped to source lines through the
+w_line_table of label addresses in the executable and the "<binary>.lines"
+sidecar written by the compiler.
+"""
+import bisect
+import ctypes
+import os
+import platform
+import signal
+import struct
+import sys
+import time
+from collections import Counter
+
+
+PTRACE_TRACEME = 0
+PTRACE_PEEKUSER = 3
+PTRACE_CONT = 7
+
+# Offset of the instruction pointer in "struct user" of the tracing kernel,
+# 32 bit programs on a 64 bit kernel are traced through the 64 bit layout
+instruction_pointer_offsets = {
+	'x86_64': 16 * 8,
+	'i386': 12 * 4,
+	'i686': 12 * 4,
+}
+
+libc = ctypes.CDLL(None, use_errno=True)
+libc.ptrace.restype = ctypes.c_long
+libc.ptrace.argtypes = [ctypes.c_long, ctypes.c_long, ctypes.c_void_p, ctypes.c_void_p]
+
+
+def ptrace(request, pid, address=0, data=0):
+	ctypes.set_errno(0)
+	result = libc.ptrace(request, pid, address, data)
+	if result == -1 and ctypes.get_errno() != 0:
+		raise OSError(ctypes.get_errno(), 'ptrace: ' + os.strerror(ctypes.get_errno()))
+	return result
+
+
+class LineTable:
+	"""Maps instruction addresses to (file, line, function)."""
+	def __init__(self, binary):
+		self.files = []
+		self.lines = []
+		f = open(binary + '.lines', 'r', encoding='utf8')
+		for record in f.read().splitlines()[1:]:
+			kind, value = record.split(' ', 1)
+			if kind == 'file':
+				self.files.append(value)
+			elif kind == 'line':
+				file_index, line, function = value.split(' ')
+				self.lines.append((self.files[int(file_index)], int(line), function))
+		f.close()
+		self.start, *self.addresses = self.read_addresses(binary)
+		if len(self.addresses) != len(self.lines):
+			raise Exception(f'{binary}.lines does not match the line table of {binary}, recompile both')
+
+	def read_addresses(self, binary):
+		f = open(binary, 'rb')
+		image = f.read()
+		f.close()
+		position = image.rfind(b'WLINES\0\0')
+		if position < 0:
+			raise Exception(f'No line table in {binary}, compile it with "w.py --line-table"')
+		position += 8
+		count, = struct.unpack_from('<I', image, position)
+		# The start of the source code comes before the line labels
+		return list(struct.unpack_from(f'<{count + 1}I', image, position + 4))
+
+	def lookup(self, address):
+		if address < self.start:
+			return ('<startup>', 0, '<startup>')
+		# The code of each line ends at its label
+		index = bisect.bisect_right(self.addresses, address)
+		if index >= len(self.lines):
+			return None
+		return self.lines[index]
+
+
+def sample(argv, interval):
+	"""Runs argv and returns a Counter of sampled instruction pointers."""
+	offset = instruction_pointer_offsets[platform.machine()]
+	pid = os.fork()
+	if pid == 0:
+		try:
+			ptrace(PTRACE_TRACEME, 0)
+			os.execv(argv[0], argv)
+		finally:
+			os._exit(127)
+	samples = Counter()
+	# Stopped at the exec
+	os.waitpid(pid, 0)
+	ptrace(PTRACE_CONT, pid)
+	while True:
+		time.sleep(interval)
+		try:
+			os.kill(pid, signal.SIGSTOP)
+		except ProcessLookupError:
+			break
+		_, status = os.waitpid(pid, 0)
+		if os.WIFEXITED(status) or os.WIFSIGNALED(status):
+			break
+		pending = os.WSTOPSIG(status)
+		if pending == signal.SIGSTOP:
+			samples[ptrace(PTRACE_PEEKUSER, pid, offset) & 0xffffffff] += 1
+			pending = 0
+		# Signals other than our SIGSTOP are delivered to the program
+		ptrace(PTRACE_CONT, pid, 0, pending)
+	return samples
+
+
+def source_line(filename, line, cache={}):
+	if filename not in cache:
+		try:
+			f = open(filename, 'r', encoding='utf8')
+			cache[filename] = f.read().splitlines()
+			f.close()
+		except OSError:
+			cache[filename] = []
+	lines = cache[filename]
+	if 0 < line <= len(lines):
+		return lines[line - 1].strip()
+	return ''
+
+
+def report(samples, line_table, top):
+	total = sum(samples.values())
+	if total == 0:
+		print('No samples, the program exited too quickly')
+		return
+	functions = Counter()
+	lines = Counter()
+	for address, count in samples.items():
+		location = line_table.lookup(address)
+		if location is None:
+			location = ('<unknown>', 0, '<unknown>')
+		functions[location[2]] += count
+		lines[location] += count
+	print(f'{total} samples')
+	print()
+	print('  samples      %  function')
+	for function, count in functions.most_common(top):
+		print(f'{count:9} {100 * count / total:6.2f}  {function}')
+	print()
+	print('  samples      %  line')
+	for (filename, line, function), count in lines.most_common(top):
+		print(f'{count:9} {100 * count / total:6.2f}  {filename}:{line} {function}: {source_line(filename, line)}')
+
+
+def main(argv):
+	interval = 0.001
+	top = 20
+	i = 1
+	while i < len(argv) and argv[i].startswith('--'):
+		if argv[i] == '--interval' and i + 1 < len(argv):
+			i += 1
+			interval = float(argv[i]) / 1000
+		elif argv[i] == '--top' and i + 1 < len(argv):
+			i += 1
+			top = int(argv[i])
+		else:
+			break
+		i += 1
+	if i >= len(argv):
+		print('Please provide a program compiled with "w.py --line-table"')
+		print('For example:')
+		print('  $ python wprof.py tests/bin/for3')
+		print('  $ python wprof.py --interval 0.5 --top 10 tests/bin/for3')
+		return
+	if platform.machine() not in instruction_pointer_offsets:
+		print(f'Sampling is not supported on {platform.machine()}, only on ' + ', '.join(instruction_pointer_offsets))
+		return
+	program = argv[i:]
+	line_table = LineTable(program[0])
+	samples = sample(program, interval)
+	report(samples, line_table, top)
+
+
+if __name__ == '__main__':
+	main(sys.argv)